@@ -0,0 +1,49 @@
+"""create tasks table
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "tasks",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("priority", sa.Integer(), nullable=False),
+        sa.Column("due_date", sa.DateTime(), nullable=True),
+        sa.Column("completed", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("(CURRENT_TIMESTAMP)"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("(CURRENT_TIMESTAMP)"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_tasks_id"), "tasks", ["id"], unique=False)
+    op.create_index(op.f("ix_tasks_title"), "tasks", ["title"], unique=False)
+    op.create_index(op.f("ix_tasks_priority"), "tasks", ["priority"], unique=False)
+    op.create_index(op.f("ix_tasks_due_date"), "tasks", ["due_date"], unique=False)
+    op.create_index(op.f("ix_tasks_completed"), "tasks", ["completed"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_tasks_completed"), table_name="tasks")
+    op.drop_index(op.f("ix_tasks_due_date"), table_name="tasks")
+    op.drop_index(op.f("ix_tasks_priority"), table_name="tasks")
+    op.drop_index(op.f("ix_tasks_title"), table_name="tasks")
+    op.drop_index(op.f("ix_tasks_id"), table_name="tasks")
+    op.drop_table("tasks")
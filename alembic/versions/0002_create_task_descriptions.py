@@ -0,0 +1,47 @@
+"""add a side table for compressed task descriptions
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+import zlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Independent of DESCRIPTION_STORAGE: existing descriptions stay in
+    # tasks.description; split storage moves each one when it is next written.
+    op.create_table(
+        "task_descriptions",
+        sa.Column("task_id", sa.Integer(), nullable=False),
+        sa.Column("codec", sa.String(length=8), nullable=False),
+        sa.Column("body", sa.LargeBinary(), nullable=False),
+        sa.ForeignKeyConstraint(["task_id"], ["tasks.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("task_id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    connection = op.get_bind()
+    rows = connection.execute(sa.text("SELECT task_id, codec, body FROM task_descriptions")).fetchall()
+    for task_id, codec, body in rows:
+        raw = zlib.decompress(body) if codec == "zlib" else bytes(body)
+        connection.execute(
+            sa.text("UPDATE tasks SET description = :description WHERE id = :id"),
+            {"description": raw.decode("utf-8"), "id": task_id}
+        )
+
+    op.drop_table("task_descriptions")
@@ -0,0 +1,58 @@
+"""create tasks archive table
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "tasks_archive",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("description_codec", sa.String(length=8), nullable=True),
+        sa.Column("description_body", sa.LargeBinary(), nullable=True),
+        sa.Column("priority", sa.Integer(), nullable=False),
+        sa.Column("due_date", sa.DateTime(), nullable=True),
+        sa.Column("completed", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("archived_at", sa.DateTime(timezone=True), server_default=sa.text("(CURRENT_TIMESTAMP)"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    # SQLite reuses the highest rowid unless the table is AUTOINCREMENT, which
+    # would hand an archived task's id to a new task.
+    if op.get_bind().dialect.name == "sqlite":
+        with op.batch_alter_table("tasks", recreate="always", table_kwargs={"sqlite_autoincrement": True}):
+            pass
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        "INSERT INTO tasks (id, title, description, priority, due_date, completed, created_at, updated_at) "
+        "SELECT id, title, description, priority, due_date, completed, created_at, updated_at FROM tasks_archive"
+    )
+    op.execute(
+        "INSERT INTO task_descriptions (task_id, codec, body) "
+        "SELECT id, description_codec, description_body FROM tasks_archive WHERE description_codec IS NOT NULL"
+    )
+    op.drop_table("tasks_archive")
+    if op.get_bind().dialect.name == "sqlite":
+        with op.batch_alter_table("tasks", recreate="always"):
+            pass
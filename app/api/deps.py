@@ -1,12 +1,23 @@
-from fastapi import Depends, HTTPException, status
+import secrets
+from typing import Optional, Union
+from fastapi import Depends, Header, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app.database import get_db
-from app.models.task import Task
-from app.crud.task import task as crud_task
+from app.models.task import ArchivedTask, Task
+from app.crud.task import task as crud_task, FACETS
 from app.config import settings
 
 
+def require_admin_token(authorization: Optional[str] = Header(None)) -> None:
+    """Admin routes exist only with `admin_token` set, and then require it as a bearer token."""
+    if not settings.admin_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token.encode(), settings.admin_token.encode()):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or missing admin token")
+
+
 def get_task_or_404(
     task_id: int,
     db: Session = Depends(get_db)
@@ -20,6 +31,22 @@ def get_task_or_404(
     return task_obj
 
 
+def get_readable_task_or_404(
+    task_id: int,
+    include_archived: bool = Query(False, description="Also look the task up in the archive"),
+    db: Session = Depends(get_db)
+) -> Union[Task, ArchivedTask]:
+    task_obj = crud_task.get(db, id=task_id)
+    if not task_obj and include_archived:
+        task_obj = crud_task.get_archived(db, id=task_id)
+    if not task_obj:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Task with id {task_id} not found"
+        )
+    return task_obj
+
+
 def validate_pagination_params(
     page: int = 1,
     size: int = settings.default_page_size,
@@ -34,4 +61,49 @@ def validate_pagination_params(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Size must be between 1 and {settings.max_page_size}"
         )
-    return page, size
\ No newline at end of file
+    return page, size
+
+
+def parse_facets(facets: Optional[str]) -> list[str]:
+    if not facets:
+        return []
+    names = [name.strip() for name in facets.split(",") if name.strip()]
+    unknown = sorted(set(names) - set(FACETS))
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown facets: {', '.join(unknown)}. Allowed: {', '.join(FACETS)}"
+        )
+    return names
+
+
+def parse_tags(tags: Optional[str]) -> list[str]:
+    if not tags:
+        return []
+    names = list(dict.fromkeys(name.strip().lower() for name in tags.split(",") if name.strip()))
+    if len(names) > 20:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At most 20 tags can be filtered on"
+        )
+    return names
+
+
+def parse_id_list(ids: str) -> list[int]:
+    try:
+        parsed = [int(value) for value in ids.split(",") if value.strip()]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be a comma-separated list of integers"
+        )
+    validate_batch_size(parsed)
+    return parsed
+
+
+def validate_batch_size(ids: list[int]) -> None:
+    if not ids or len(ids) > settings.batch_max_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Between 1 and {settings.batch_max_ids} ids are allowed"
+        )
\ No newline at end of file
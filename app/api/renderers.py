@@ -0,0 +1,196 @@
+import importlib.util
+import io
+import json
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+from fastapi import HTTPException, status
+from fastapi.responses import Response, StreamingResponse
+
+from app.models.task import Task
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+TASK_FIELDS = ("id", "title", "description", "priority", "due_date", "completed", "created_at", "updated_at")
+
+# OpenAPI description of the alternative encodings, for `responses=` on routes.
+BINARY_RESPONSES: Dict[Union[int, str], Dict[str, Any]] = {
+    200: {"content": {MSGPACK: {}, ARROW_STREAM: {}}}
+}
+
+# msgpack and pyarrow are optional and only imported when a client asks for them.
+HAS_MSGPACK = importlib.util.find_spec("msgpack") is not None
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+
+def available_media_types() -> List[str]:
+    media_types = [JSON]
+    if HAS_MSGPACK:
+        media_types.append(MSGPACK)
+    if HAS_PYARROW:
+        media_types.append(ARROW_STREAM)
+    return media_types
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """Pick the response media type from an Accept header, defaulting to JSON."""
+    if not accept:
+        return JSON
+
+    entries = []
+    for position, part in enumerate(accept.split(",")):
+        media, _, params = part.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        entries.append((-quality, position, media.strip().lower()))
+
+    available = available_media_types()
+    for negative_quality, _, media in sorted(entries):
+        if negative_quality >= 0:
+            continue
+        if media in ("*/*", "application/*"):
+            return JSON
+        if media in available:
+            return media
+
+    raise HTTPException(
+        status_code=status.HTTP_406_NOT_ACCEPTABLE,
+        detail=f"Supported media types: {', '.join(available)}"
+    )
+
+
+def task_row(task: Task) -> tuple:
+    return tuple(getattr(task, field) for field in TASK_FIELDS)
+
+
+def _encode_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Cannot encode {type(value).__name__}")
+
+
+def _arrow_schema():
+    import pyarrow as pa  # type: ignore[import-untyped]
+
+    return pa.schema([
+        ("id", pa.int64()),
+        ("title", pa.string()),
+        ("description", pa.string()),
+        ("priority", pa.int8()),
+        ("due_date", pa.timestamp("us")),
+        ("completed", pa.bool_()),
+        ("created_at", pa.timestamp("us")),
+        ("updated_at", pa.timestamp("us")),
+    ])
+
+
+def _record_batch(rows: Sequence[Sequence[Any]], schema):
+    import pyarrow as pa  # type: ignore[import-untyped]
+
+    columns = list(zip(*rows)) if rows else [()] * len(schema)
+    return pa.record_batch(
+        [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+        schema=schema
+    )
+
+
+def render_page(
+        media_type: str,
+        rows: Sequence[Sequence[Any]],
+        *,
+        total: int,
+        page: int,
+        size: int,
+        facets: Optional[Dict[str, Dict[str, int]]] = None,
+) -> Response:
+    """Render a page of task rows as MessagePack or an Arrow IPC stream."""
+    pages = (total + size - 1) // size
+    if media_type == MSGPACK:
+        import msgpack  # type: ignore[import-untyped]
+
+        body = msgpack.packb(
+            {
+                "columns": TASK_FIELDS,
+                "rows": [list(row) for row in rows],
+                "total": total,
+                "page": page,
+                "size": size,
+                "pages": pages,
+                "facets": facets,
+            },
+            default=_encode_default
+        )
+        return Response(content=body, media_type=MSGPACK)
+
+    import pyarrow as pa  # type: ignore[import-untyped]
+
+    metadata = {"total": str(total), "page": str(page), "size": str(size), "pages": str(pages)}
+    if facets is not None:
+        metadata["facets"] = json.dumps(facets)
+    schema = _arrow_schema().with_metadata(metadata)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        writer.write_batch(_record_batch(rows, schema))
+    return Response(content=sink.getvalue(), media_type=ARROW_STREAM)
+
+
+def stream_rows(media_type: str, chunks: Iterable[Sequence[Sequence[Any]]]) -> StreamingResponse:
+    """
+    Stream chunks of task rows.
+
+    JSON is a single array of objects, MessagePack a sequence of objects (the
+    column names, then one array per row) and Arrow one record batch per chunk.
+    """
+    if media_type == MSGPACK:
+        return StreamingResponse(_msgpack_chunks(chunks), media_type=MSGPACK)
+    if media_type == ARROW_STREAM:
+        return StreamingResponse(_arrow_chunks(chunks), media_type=ARROW_STREAM)
+    return StreamingResponse(_json_chunks(chunks), media_type=JSON)
+
+
+def _json_chunks(chunks: Iterable[Sequence[Sequence[Any]]]) -> Iterator[bytes]:
+    separator = "["
+    for rows in chunks:
+        encoded = ",".join(
+            json.dumps(dict(zip(TASK_FIELDS, row)), default=_encode_default) for row in rows
+        )
+        if encoded:
+            yield (separator + encoded).encode()
+            separator = ","
+    yield b"[]" if separator == "[" else b"]"
+
+
+def _msgpack_chunks(chunks: Iterable[Sequence[Sequence[Any]]]) -> Iterator[bytes]:
+    import msgpack  # type: ignore[import-untyped]
+
+    packer = msgpack.Packer(default=_encode_default)
+    yield packer.pack(list(TASK_FIELDS))
+    for rows in chunks:
+        yield b"".join(packer.pack(list(row)) for row in rows)
+
+
+def _arrow_chunks(chunks: Iterable[Sequence[Sequence[Any]]]) -> Iterator[bytes]:
+    import pyarrow as pa  # type: ignore[import-untyped]
+
+    schema = _arrow_schema()
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        for rows in chunks:
+            writer.write_batch(_record_batch(rows, schema))
+            yield _drain(sink)
+    yield _drain(sink)
+
+
+def _drain(sink: io.BytesIO) -> bytes:
+    data = sink.getvalue()
+    sink.seek(0)
+    sink.truncate()
+    return data
@@ -1,7 +1,12 @@
-from fastapi import APIRouter
-from app.api.v1.endpoints import tasks, health
+from fastapi import APIRouter, Depends
+from app.api.deps import require_admin_token
+from app.api.v1.endpoints import tasks, health, admin, jobs
 
 api_router = APIRouter()
 
 api_router.include_router(health.router, prefix="/health", tags=["Health"])
-api_router.include_router(tasks.router, prefix="/tasks", tags=["Tasks"])
\ No newline at end of file
+api_router.include_router(tasks.router, prefix="/tasks", tags=["Tasks"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["Jobs"])
+api_router.include_router(
+    admin.router, prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin_token)]
+)
\ No newline at end of file
@@ -0,0 +1,98 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.memory import memory_profiler, object_counts, rss_bytes
+from app.metrics import metrics
+from app.middleware.admission import admission_controller
+from app.schemas.base import (
+    AllocationSite, ArchiveRunResponse, BackupListResponse, BackupResponse, MaintenanceRunResponse,
+    MemoryResponse, MemorySnapshotResponse, MetricsResponse, OutboxRedeliverResponse, OutboxStatsResponse,
+)
+from app.services.archiver import archiver
+from app.services.backup import backups
+from app.services.maintenance import maintenance
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_model=MetricsResponse)
+def get_metrics():
+    """Process-local counters, gauges and admission control state."""
+    return MetricsResponse(
+        metrics=metrics.snapshot(),
+        admission=admission_controller.stats()
+    )
+
+
+@router.post("/archive", response_model=ArchiveRunResponse)
+def run_archive(db: Session = Depends(get_db)):
+    """Run the archiver now, regardless of `archive_enabled`, and report how many tasks moved."""
+    moved = archiver.run_once(db)
+    return ArchiveRunResponse(moved=moved, after_days=archiver.after_days)
+
+@router.post("/maintenance", response_model=MaintenanceRunResponse)
+def run_maintenance():
+    """Run database maintenance now, regardless of `maintenance_enabled`, the window and current traffic."""
+    operations = maintenance.run_once()
+    return MaintenanceRunResponse(operations=operations, duration_seconds=round(maintenance.last_duration, 4))
+
+
+@router.post("/backups", response_model=BackupResponse)
+def create_backup():
+    """Take an online snapshot of every database now, then apply the retention limit."""
+    name = backups.create()
+    return BackupResponse(name=name, size_bytes=backups.size(name), duration_seconds=round(backups.last_duration, 4))
+
+
+@router.get("/backups", response_model=BackupListResponse)
+def list_backups():
+    """Completed snapshots, oldest first. Restore one with `python -m app.services.backup restore <name>`."""
+    return BackupListResponse(backups=backups.snapshots())
+
+
+@router.get("/outbox", response_model=OutboxStatsResponse)
+def get_outbox():
+    """Webhook events waiting for delivery and events dead-lettered after `webhook_max_attempts` failures."""
+    from app.services.webhooks import webhooks
+
+    return OutboxStatsResponse(**webhooks.stats())
+
+
+@router.post("/outbox/redeliver", response_model=OutboxRedeliverResponse)
+def redeliver_outbox():
+    """Queue every dead-lettered webhook event for delivery again."""
+    from app.services.webhooks import webhooks
+
+    return OutboxRedeliverResponse(redelivered=webhooks.redeliver_dead())
+
+
+@router.get("/memory", response_model=MemoryResponse)
+def get_memory(limit: int = Query(20, ge=1, le=200, description="Allocation sites to report")):
+    """
+    RSS and live `Task`/`TaskOut`/session counts; with `memory_profiling_enabled`, also the traced
+    and peak bytes and the top allocation sites, diffed against the last `POST /memory/snapshot`.
+    """
+    if not memory_profiler.tracing:
+        return MemoryResponse(tracing=False, rss_bytes=rss_bytes(), objects=object_counts())
+    traced_bytes, peak_bytes = memory_profiler.traced_memory()
+    return MemoryResponse(
+        tracing=True,
+        rss_bytes=rss_bytes(),
+        traced_bytes=traced_bytes,
+        peak_bytes=peak_bytes,
+        objects=object_counts(),
+        since_snapshot=memory_profiler.baseline is not None,
+        top_sites=[AllocationSite(**site) for site in memory_profiler.top_sites(limit)],
+    )
+
+
+@router.post("/memory/snapshot", response_model=MemorySnapshotResponse)
+def snapshot_memory():
+    """Record the current allocations as the baseline that `GET /memory` diffs against."""
+    if not memory_profiler.tracing:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Memory profiling is disabled; set MEMORY_PROFILING_ENABLED=true"
+        )
+    return MemorySnapshotResponse(traced_bytes=memory_profiler.mark())
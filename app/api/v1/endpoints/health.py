@@ -1,13 +1,11 @@
 import time
 from datetime import datetime
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import text
+from fastapi import APIRouter, Response, status
 
-from app.database import get_db
 from app.schemas.base import HealthResponse, ReadinessCheckResponse
 from app.config import settings
 from app.logging_config import get_logger
+from app.services.health import health_monitor
 
 logger = get_logger("api.health")
 router = APIRouter()
@@ -15,60 +13,43 @@ router = APIRouter()
 # Track startup time for uptime calculation
 startup_time = time.time()
 
+READINESS = {"healthy": "ready", "degraded": "degraded", "unhealthy": "not ready"}
+
 
 @router.get("/", response_model=HealthResponse)
-def health_check(db: Session = Depends(get_db)):
+async def health_check():
     """
-    Health check endpoint that verifies system components.
+    Health check endpoint reporting the health monitor's latest sample.
+
+    Runs on the event loop and only reads the cached report, so it never waits
+    for a threadpool slot or a database connection held by other requests.
 
     Returns:
-        - API status
+        - API status (healthy, degraded or unhealthy)
         - Current timestamp
         - Version information
         - Uptime in seconds
-        - Database connectivity
+        - Per-database round trip, pool use and free disk space, and event loop lag
     """
-    try:
-        # Test database connectivity
-        db.execute(text("SELECT 1"))
-
-        current_time = datetime.now()
-        uptime = time.time() - startup_time
-
-        logger.info("Health check successful", extra={
-            "uptime_seconds": uptime,
-            "timestamp": current_time.isoformat()
-        })
-
-        return HealthResponse(
-            status="healthy",
-            timestamp=current_time,
-            version=settings.version,
-            uptime_seconds=uptime
-        )
-
-    except Exception as e:
-        logger.error(f"Health check failed: {e}")
-        return HealthResponse(
-            status="unhealthy",
-            timestamp=datetime.utcnow(),
-            version=settings.version,
-            uptime_seconds=time.time() - startup_time
-        )
+    report = health_monitor.report()
+    return HealthResponse(
+        timestamp=datetime.now(),
+        version=settings.version,
+        uptime_seconds=time.time() - startup_time,
+        **report
+    )
 
 
 @router.get("/readiness", response_model=ReadinessCheckResponse)
-def readiness_check(db: Session = Depends(get_db)):
-    """Kubernetes-style readiness probe."""
-    try:
-        db.execute(text("SELECT 1"))
-        return {"status": "ready"}
-    except Exception as e:
-        logger.error(f"Readiness check failed: {e}")
-        return {"status": "not ready", "error": str(e)}
+async def readiness_check(response: Response):
+    """Kubernetes-style readiness probe; 503 while degraded or unhealthy."""
+    report = health_monitor.report()
+    if report["status"] != "healthy":
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return ReadinessCheckResponse(status=READINESS[report["status"]], problems=report["problems"])
 
 
 @router.get("/liveness", response_model=ReadinessCheckResponse)
-def liveness_check():
+async def liveness_check():
     """Kubernetes-style liveness probe."""
-    return {"status": "alive"}
\ No newline at end of file
+    return {"status": "alive"}
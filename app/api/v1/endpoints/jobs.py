@@ -0,0 +1,38 @@
+from fastapi import APIRouter, status
+
+from app.exceptions import JobNotFoundError
+from app.logging_config import get_logger
+from app.schemas.job import JobCreate, JobOut
+from app.services.jobs import jobs
+
+logger = get_logger("api.jobs")
+router = APIRouter()
+
+
+@router.post("/", response_model=JobOut, status_code=status.HTTP_202_ACCEPTED)
+def submit_job(job_data: JobCreate):
+    """
+    Queue a bulk operation on every live task matching `filters`.
+
+    The job runs in the background in small committed chunks; poll `GET /jobs/{id}` for its progress.
+    """
+    return jobs.submit(job_data)
+
+
+@router.get("/{job_id}", response_model=JobOut)
+def get_job(job_id: int):
+    """Status and progress of a job."""
+    job = jobs.get(job_id)
+    if job is None:
+        raise JobNotFoundError(job_id)
+    return job
+
+
+@router.post("/{job_id}/cancel", response_model=JobOut)
+def cancel_job(job_id: int):
+    """Cancel a queued job, or stop a running one after its current chunk. Finished jobs are left as they are."""
+    job = jobs.cancel(job_id)
+    if job is None:
+        raise JobNotFoundError(job_id)
+    logger.info(f"Cancellation requested for job {job_id}")
+    return job
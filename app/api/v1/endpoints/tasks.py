@@ -1,13 +1,31 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import List, Literal, Optional, Union
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app.crud.task import task as crud_task
 from app.database import get_db
-from app.models.task import Task
-from app.api.deps import get_task_or_404, validate_pagination_params
+from app.models.task import ArchivedTask, Task
+from app.api.deps import (
+    get_readable_task_or_404,
+    get_task_or_404,
+    validate_pagination_params,
+    parse_facets,
+    parse_tags,
+    parse_id_list,
+    validate_batch_size,
+)
+from app.api.renderers import JSON, BINARY_RESPONSES, negotiate, render_page, stream_rows, task_row
 from app.schemas.base import PaginatedResponse
-from app.schemas.task import TaskOut, TaskCreate, TaskUpdate, TaskSummary
+from app.schemas.query import TaskQuery
+from app.schemas.task import (
+    TaskOut,
+    TaskCreate,
+    TaskUpdate,
+    TaskSummary,
+    TaskAnalytics,
+    TaskBatchRequest,
+    TaskBatchResponse,
+)
 from app.config import settings
 from app.logging_config import get_logger
 
@@ -31,13 +49,18 @@ def create_task(
     return task
 
 
-@router.get("/", response_model=PaginatedResponse)
+@router.get("/", response_model=PaginatedResponse, responses=BINARY_RESPONSES)
 def list_tasks(
         completed: Optional[bool] = Query(None, description="Filter by completion status"),
         priority: Optional[int] = Query(None, ge=1, le=3, description="1=High, 2=Medium, 3=Low"),
         q: Optional[str] = Query(None, description="Search by title/description (case-insensitive)"),
+        tags: Optional[str] = Query(None, description="Comma-separated tags to filter by"),
+        tag_match: Literal["any", "all"] = Query("any", description="Match tasks with any or all of `tags`"),
         page: int = Query(1, ge=1, description="Page number (1-based)"),
         size: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size, description="Items per page"),
+        facets: Optional[str] = Query(None, description="Comma-separated facets to count: priority, completed"),
+        include_archived: bool = Query(False, description="Include archived (old completed) tasks"),
+        accept: Optional[str] = Header(None),
         db: Session = Depends(get_db),
 ):
     """
@@ -46,39 +69,166 @@ def list_tasks(
     - **completed**: Filter by completion status
     - **priority**: Filter by priority (1=High, 2=Medium, 3=Low)
     - **q**: Search in title and description
+    - **tags**: Only tasks carrying any (`tag_match=any`) or all (`tag_match=all`) of these tags
     - **page**: Page number (starts from 1)
     - **size**: Number of items per page (max 1000)
+    - **facets**: Return per-value counts for these fields alongside the page
+    - **include_archived**: Also list tasks moved to the archive
+
+    Send `Accept: application/msgpack` or `Accept: application/vnd.apache.arrow.stream`
+    for compact row-oriented or columnar payloads; JSON is the default.
     """
     page, size = validate_pagination_params(page, size)
+    facet_names = parse_facets(facets)
+    tag_names = parse_tags(tags)
+    media_type = negotiate(accept)
     skip = (page - 1) * size
 
     logger.info(
-        f"Fetching tasks - page: {page}, size: {size}, filters: completed={completed}, priority={priority}, q={q}")
+        f"Fetching tasks - page: {page}, size: {size}, filters: completed={completed}, priority={priority}, q={q}, "
+        f"tags={tag_names} ({tag_match}), include_archived={include_archived}")
 
     tasks = crud_task.get_by_filters(
         db,
         completed=completed,
         priority=priority,
         q=q,
+        tags=tag_names,
+        tag_match=tag_match,
         skip=skip,
-        limit=size
+        limit=size,
+        include_archived=include_archived
     )
 
-    total = crud_task.count_by_filters(
-        db,
-        completed=completed,
-        priority=priority,
-        q=q
-    )
+    facet_counts = None
+    if facet_names:
+        facet_counts, total = crud_task.count_facets(
+            db,
+            facets=facet_names,
+            completed=completed,
+            priority=priority,
+            q=q,
+            tags=tag_names,
+            tag_match=tag_match,
+            include_archived=include_archived
+        )
+    else:
+        total = crud_task.count_by_filters(
+            db,
+            completed=completed,
+            priority=priority,
+            q=q,
+            tags=tag_names,
+            tag_match=tag_match,
+            include_archived=include_archived
+        )
+
+    if media_type != JSON:
+        return render_page(
+            media_type,
+            [task_row(task) for task in tasks],
+            total=total,
+            page=page,
+            size=size,
+            facets=facet_counts
+        )
 
     return PaginatedResponse.create(
         items=[TaskOut.model_validate(task) for task in tasks],
         total=total,
         page=page,
-        size=size
+        size=size,
+        facets=facet_counts
     )
 
 
+@router.get("/export", responses=BINARY_RESPONSES)
+def export_tasks(
+        completed: Optional[bool] = Query(None, description="Filter by completion status"),
+        priority: Optional[int] = Query(None, ge=1, le=3, description="1=High, 2=Medium, 3=Low"),
+        q: Optional[str] = Query(None, description="Search by title/description (case-insensitive)"),
+        accept: Optional[str] = Header(None),
+        db: Session = Depends(get_db),
+):
+    """
+    Stream every task matching the filters, in list order.
+
+    JSON (default) is an array of task objects; `application/msgpack` is a
+    stream of MessagePack values (column names, then one array per task);
+    `application/vnd.apache.arrow.stream` is an Arrow IPC stream with one
+    record batch per chunk of rows.
+    """
+    media_type = negotiate(accept)
+    logger.info(f"Exporting tasks as {media_type} - filters: completed={completed}, priority={priority}, q={q}")
+    # `db` stays open while the body streams: since FastAPI 0.118 dependencies with
+    # `yield` are closed after the response is sent.
+    return stream_rows(
+        media_type,
+        crud_task.iter_rows_by_filters(db, completed=completed, priority=priority, q=q)
+    )
+
+
+@router.post("/query", response_model=PaginatedResponse)
+def query_tasks(
+        spec: TaskQuery,
+        db: Session = Depends(get_db),
+):
+    """
+    Query tasks with a structured filter.
+
+    - **ids** / **priority_in**: IN lists
+    - **completed**: Filter by completion status
+    - **due_date** / **created_at** / **updated_at**: Ranges with inclusive `gte` and exclusive `lt`
+    - **due_date_is_null**: Only tasks with (`true`) or without (`false`) a due date
+    - **q**: Search in title and description
+    - **sort**: `priority`, `due_date`, `-due_date`, `created_at` or `-created_at`
+    - **page** / **size**: Pagination
+    """
+    logger.info(f"Querying tasks: {spec.model_dump(exclude_none=True)}")
+    tasks, total = crud_task.query(db, spec=spec)
+    return PaginatedResponse.create(
+        items=[TaskOut.model_validate(task) for task in tasks],
+        total=total,
+        page=spec.page,
+        size=spec.size
+    )
+
+
+def _get_batch(db: Session, ids: List[int]) -> TaskBatchResponse:
+    tasks = crud_task.get_multi_by_ids(db, ids)
+    found = {task.id for task in tasks}
+    return TaskBatchResponse(
+        items=[TaskOut.model_validate(task) for task in tasks],
+        missing=[task_id for task_id in dict.fromkeys(ids) if task_id not in found]
+    )
+
+
+@router.get("/batch", response_model=TaskBatchResponse)
+def get_tasks_batch(
+        ids: str = Query(..., description="Comma-separated task IDs"),
+        db: Session = Depends(get_db),
+):
+    """
+    Retrieve several tasks by ID in one request.
+
+    Tasks are returned in the order requested; unknown IDs are listed under `missing`.
+    """
+    task_ids = parse_id_list(ids)
+    logger.info(f"Fetching batch of {len(task_ids)} tasks")
+    return _get_batch(db, task_ids)
+
+
+@router.post("/batch", response_model=TaskBatchResponse)
+def post_tasks_batch(
+        batch: TaskBatchRequest,
+        db: Session = Depends(get_db),
+):
+    """Retrieve several tasks by ID, for ID sets too large for a query string."""
+    validate_batch_size(batch.ids)
+    logger.info(f"Fetching batch of {len(batch.ids)} tasks")
+    return _get_batch(db, batch.ids)
+
+
 @router.get("/summary", response_model=TaskSummary)
 def get_task_summary(db: Session = Depends(get_db)):
     """Get task statistics summary."""
@@ -86,9 +236,28 @@ def get_task_summary(db: Session = Depends(get_db)):
     return crud_task.get_summary(db)
 
 
+@router.get("/analytics", response_model=TaskAnalytics)
+def get_task_analytics(
+        interval: Literal["day", "week"] = Query("day", description="Bucket width for time series"),
+        db: Session = Depends(get_db),
+):
+    """
+    Get completion and overdue statistics.
+
+    - **completion_by_priority**: Total, completed and completion rate per priority
+    - **overdue_by_age**: Pending overdue tasks grouped by how long they are overdue
+    - **due_date_histogram**: Tasks per due-date bucket
+    - **throughput**: Tasks created vs completed per bucket
+
+    Results are cached until the next task write.
+    """
+    logger.info(f"Generating task analytics - interval: {interval}")
+    return crud_task.get_analytics(db, interval=interval)
+
+
 @router.get("/{task_id}/", response_model=TaskOut)
-def get_task(task: Task = Depends(get_task_or_404)):
-    """Retrieve a specific task by its ID."""
+def get_task(task: Union[Task, ArchivedTask] = Depends(get_readable_task_or_404)):
+    """Retrieve a specific task by its ID; pass `include_archived=true` to also find archived tasks."""
     logger.info(f"Fetching task with ID: {task.id}")
     return task
 
@@ -0,0 +1,28 @@
+import zlib
+from typing import Optional, Tuple
+
+PLAIN = "plain"
+ZLIB = "zlib"
+
+
+def encode_text(text: str, compression: str = ZLIB, min_bytes: int = 256) -> Tuple[str, bytes]:
+    """
+    Encode `text` for storage, returning the codec used and the stored bytes.
+
+    Values shorter than `min_bytes`, or that zlib does not shrink, are stored
+    as plain UTF-8.
+    """
+    raw = text.encode("utf-8")
+    if compression == ZLIB and len(raw) >= min_bytes:
+        compressed = zlib.compress(raw)
+        if len(compressed) < len(raw):
+            return ZLIB, compressed
+    return PLAIN, raw
+
+
+def decode_text(codec: Optional[str], body: Optional[bytes]) -> Optional[str]:
+    if body is None:
+        return None
+    if codec == ZLIB:
+        body = zlib.decompress(body)
+    return bytes(body).decode("utf-8")
@@ -1,7 +1,8 @@
 import os
 from functools import lru_cache
+from typing import Dict, List, Literal, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import Field
+from pydantic import Field, model_validator
 
 
 DOTENV = os.path.join(os.path.dirname(__file__), "..", ".env")
@@ -19,6 +20,23 @@ class Settings(BaseSettings):
     host: str = Field(default="localhost", description="Host to bind")
     port: int = Field(default=8000, description="Port to bind")
 
+    schema_mode: Literal["create", "verify", "skip"] = Field(
+        default="create",
+        description="Startup schema handling: create missing tables, verify the Alembic head, or skip"
+    )
+    warmup_enabled: bool = Field(default=True, description="Warm the pool, statements and serializers on startup")
+    warmup_connections: int = Field(default=5, description="Pooled connections to open during warm-up")
+
+    reload: bool = Field(default=False, description="Auto-reload on code changes (development only, single process)")
+    workers: int = Field(default=1, description="Worker processes; 0 derives the count from available CPUs")
+    loop: str = Field(default="auto", description="Event loop: auto (uvloop when installed), uvloop or asyncio")
+    http: str = Field(default="auto", description="HTTP parser: auto (httptools when installed), httptools or h11")
+    backlog: int = Field(default=2048, description="Listen socket backlog")
+    keepalive_timeout_seconds: int = Field(default=5, description="Idle keep-alive connection timeout")
+    graceful_timeout_seconds: int = Field(default=30, description="Time allowed for in-flight requests to drain on SIGTERM")
+    max_requests: int = Field(default=0, description="Recycle a worker after this many requests; 0 disables")
+    max_requests_jitter: int = Field(default=0, description="Random extra requests per worker so recycling is staggered")
+
     title: str = Field(default="Saber Task API", description="API title")
     version: str = Field(default="1.0.0", description="API version")
     description: str = Field(
@@ -30,6 +48,192 @@ class Settings(BaseSettings):
     max_page_size: int = Field(default=1, description="Maximum page size")
 
     allowed_hosts_str: str = Field(default="*", description="Allowed hosts (comma-separated)")
+    admin_token: Optional[str] = Field(
+        default=None,
+        description="Bearer token the /admin routes require; while unset they answer 404"
+    )
+
+    admission_enabled: bool = Field(default=True, description="Enable per-route-class admission control")
+    admission_limits: Dict[str, int] = Field(
+        default={"cheap": 64, "expensive": 8, "default": 16},
+        description="Initial concurrency limit per route class"
+    )
+    admission_max_limits: Dict[str, int] = Field(
+        default={"cheap": 128, "expensive": 16, "default": 32},
+        description="Upper bound the adaptive limit may grow to per route class"
+    )
+    admission_queue_sizes: Dict[str, int] = Field(
+        default={"cheap": 128, "expensive": 16, "default": 32},
+        description="Maximum number of requests waiting for a slot per route class"
+    )
+    admission_target_latency_ms: Dict[str, float] = Field(
+        default={"cheap": 50.0, "expensive": 500.0, "default": 200.0},
+        description="Latency above which the adaptive limit of a route class backs off"
+    )
+    admission_queue_timeout_seconds: float = Field(
+        default=2.0,
+        description="Maximum time a request may wait for a slot before being rejected"
+    )
+
+    deadline_enabled: bool = Field(
+        default=True,
+        description="Bound database work per request and cancel it when the client disconnects"
+    )
+    deadline_seconds: Dict[str, float] = Field(
+        default={"cheap": 2.0, "expensive": 10.0, "default": 5.0},
+        description="Request deadline per route class"
+    )
+    deadline_route_overrides: Dict[str, float] = Field(
+        default={"GET /tasks/export": 0.0},
+        description="Deadline per route as '<METHOD> <path below the API prefix>'; 0 disables the deadline"
+    )
+
+    tracing_enabled: bool = Field(default=False, description="Record request traces (spans per stage and SQL statement)")
+    tracing_sample_rate: float = Field(
+        default=1.0, ge=0.0, le=1.0,
+        description="Fraction of new traces to record; incoming traceparent sampling decisions are honoured"
+    )
+    tracing_export_target: str = Field(
+        default="./data/traces.jsonl",
+        description="File to append OTLP/JSON batches to, or an OTLP/HTTP traces URL"
+    )
+    tracing_batch_size: int = Field(default=512, description="Spans per exported batch")
+    tracing_export_interval_seconds: float = Field(default=5.0, description="Maximum delay before buffered spans are exported")
+    tracing_max_queue_size: int = Field(default=2048, description="Buffered spans kept before the oldest are dropped")
+
+    memory_profiling_enabled: bool = Field(
+        default=False,
+        description="Trace Python allocations with tracemalloc: per-request peaks and admin allocation diffs"
+    )
+    memory_trace_frames: int = Field(
+        default=1, ge=1,
+        description="Stack frames stored per traced allocation; more frames cost more memory"
+    )
+
+    description_search: bool = Field(default=True, description="Match `q` searches against descriptions as well as titles")
+    description_storage: Literal["inline", "split"] = Field(
+        default="inline",
+        description=(
+            "Where task descriptions are stored: inline in tasks.description, or split, moving long ones "
+            "zlib-compressed to task_descriptions (requires description_search=false)"
+        )
+    )
+    description_compression_min_bytes: int = Field(
+        default=256,
+        description="With split storage, descriptions shorter than this stay inline and uncompressed"
+    )
+
+    archive_enabled: bool = Field(default=False, description="Periodically move old completed tasks to tasks_archive")
+    archive_after_days: int = Field(default=30, description="Archive tasks completed (last updated) more than this many days ago")
+    archive_batch_size: int = Field(default=500, ge=1, le=500, description="Tasks moved per archive transaction")
+    archive_interval_seconds: float = Field(default=3600.0, description="Time between archive runs")
+    archive_batch_pause_seconds: float = Field(default=0.1, description="Pause between archive batches")
+    archive_lock_path: str = Field(
+        default="./data/archive.lock", description="Lock file held by the one worker running scheduled archive runs"
+    )
+
+    maintenance_enabled: bool = Field(default=False, description="Run database maintenance (ANALYZE, vacuum, WAL checkpoint) in the background")
+    maintenance_interval_seconds: float = Field(default=21600.0, description="Time between maintenance runs")
+    maintenance_window: str = Field(
+        default="",
+        description="Only run scheduled maintenance between these UTC times, e.g. 02:00-05:00 (empty = any time)"
+    )
+    maintenance_max_requests_per_second: float = Field(
+        default=5.0,
+        description="Defer scheduled maintenance while the request rate is above this"
+    )
+    maintenance_retry_seconds: float = Field(default=300.0, description="Wait before retrying a deferred maintenance run")
+    maintenance_vacuum_pages: int = Field(
+        default=2000,
+        ge=0,
+        description="Free pages released per incremental vacuum (0 = all)"
+    )
+    maintenance_full_vacuum: bool = Field(
+        default=False,
+        description="Run a full VACUUM on SQLite databases without incremental auto-vacuum (converts them; blocks writers while it runs)"
+    )
+    maintenance_state_directory: str = Field(
+        default="./data/maintenance",
+        description="Directory shared by the workers for the maintenance lock and their request counts"
+    )
+
+    backup_enabled: bool = Field(default=False, description="Take scheduled online backups of every database")
+    backup_directory: str = Field(default="./data/backups", description="Directory holding backup snapshots")
+    backup_interval_seconds: float = Field(default=86400.0, description="Time between scheduled backups")
+    backup_retention: int = Field(default=7, ge=0, description="Snapshots kept; older ones are deleted (0 = keep all)")
+    backup_pages_per_step: int = Field(default=64, ge=1, description="SQLite pages copied per online backup step")
+    backup_step_pause_seconds: float = Field(default=0.01, description="Pause between online backup steps")
+    backup_max_restarts: int = Field(default=20, ge=0, description="Write-triggered restarts before a backup copies the rest in one step")
+
+    webhook_urls: List[str] = Field(
+        default=[],
+        description="Webhook subscribers receiving task change events (JSON list); empty disables the outbox"
+    )
+    webhook_batch_size: int = Field(default=100, ge=1, description="Events per webhook delivery")
+    webhook_concurrency: int = Field(default=4, ge=1, description="Webhook deliveries in flight at once")
+    webhook_timeout_seconds: float = Field(default=5.0, description="Timeout of one webhook delivery")
+    webhook_max_attempts: int = Field(default=10, ge=1, description="Delivery attempts before an event is dead-lettered")
+    webhook_backoff_seconds: float = Field(default=1.0, description="Delay before the first retry; doubles per attempt")
+    webhook_max_backoff_seconds: float = Field(default=600.0, description="Longest delay between retries")
+    webhook_poll_interval_seconds: float = Field(default=1.0, description="Outbox poll interval when idle")
+    webhook_linger_seconds: float = Field(default=0.1, description="Wait after a change for more changes to batch")
+
+    job_workers: int = Field(
+        default=2, ge=0,
+        description="Bulk jobs run concurrently by this process (0 = only queue them for other processes)"
+    )
+    job_chunk_size: int = Field(default=200, ge=1, le=500, description="Tasks a job changes per transaction")
+    job_max_rows_per_second: float = Field(
+        default=1000.0, ge=0,
+        description="Default throttle of a job (0 = unthrottled)"
+    )
+    job_poll_interval_seconds: float = Field(default=1.0, description="How often idle job workers look for queued jobs")
+
+    health_monitor_enabled: bool = Field(
+        default=True,
+        description="Sample health in the background and serve probes from the cached report"
+    )
+    health_check_interval_seconds: float = Field(default=5.0, gt=0, description="Seconds between health samples")
+    health_max_db_latency_ms: float = Field(default=250.0, description="Degraded above this SELECT 1 round trip")
+    health_max_pool_saturation: float = Field(
+        default=0.9, ge=0.0, le=1.0,
+        description="Degraded at or above this share of a connection pool in use"
+    )
+    health_min_disk_free_mb: int = Field(default=500, description="Degraded below this free space next to SQLite files")
+    health_max_loop_lag_ms: float = Field(default=200.0, description="Degraded above this event loop lag")
+
+    shard_count: int = Field(
+        default=0,
+        ge=0,
+        le=256,
+        description="Spread tasks over this many databases by the shard encoded in their id (0 = unsharded)"
+    )
+    shard_url_template: str = Field(
+        default="sqlite:///./data/shard_{shard}.db",
+        description="Database URL of each shard; {shard} is replaced by the shard number"
+    )
+
+    coalescing_enabled: bool = Field(
+        default=True,
+        description="Share one execution between identical concurrent list/summary reads"
+    )
+
+    query_max_in_items: int = Field(default=500, description="Maximum number of ids in a task query IN list")
+    query_max_offset: int = Field(default=10000, description="Deepest offset a task query may page to")
+
+    batch_max_ids: int = Field(default=1000, description="Maximum number of ids in one batch get")
+
+    read_model_enabled: bool = Field(
+        default=False,
+        description="Serve list filters, ordering and counts from an in-process columnar read model"
+    )
+
+    @model_validator(mode="after")
+    def check_description_storage(self) -> "Settings":
+        # Compressed descriptions cannot be matched by LIKE, so `q` would silently miss them.
+        if self.description_storage == "split" and self.description_search:
+            raise ValueError("description_storage=split requires description_search=false")
+        return self
 
     @property
     def allowed_hosts(self) -> list[str]:
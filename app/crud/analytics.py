@@ -0,0 +1,129 @@
+from datetime import datetime
+from typing import Any, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.crud.read_model import to_datetime64
+from app.models.task import Task
+from app.schemas.task import (
+    CountBucket,
+    DateBucket,
+    PriorityCompletion,
+    TaskAnalytics,
+    ThroughputBucket,
+)
+
+PRIORITIES = (1, 2, 3)
+OVERDUE_AGE_EDGES_DAYS = (1, 7, 30)
+OVERDUE_AGE_LABELS = ("<1d", "1-7d", "7-30d", ">=30d")
+
+
+class TaskColumns:
+    """Analytics columns of the `tasks` table as NumPy arrays."""
+
+    def __init__(
+            self,
+            priority: np.ndarray,
+            completed: np.ndarray,
+            due_date: np.ndarray,
+            created_at: np.ndarray,
+            updated_at: np.ndarray,
+    ):
+        self.priority = priority
+        self.completed = completed
+        self.due_date = due_date
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+    @classmethod
+    def fetch(cls, db: Session) -> "TaskColumns":
+        rows: Sequence[Any] = db.execute(
+            select(Task.priority, Task.completed, Task.due_date, Task.created_at, Task.updated_at)
+        ).all()
+        if not rows:
+            empty = np.array([], dtype="datetime64[us]")
+            return cls(np.array([], dtype=np.int8), np.array([], dtype=bool), empty, empty, empty)
+
+        priority, completed, due_date, created_at, updated_at = zip(*rows)
+        return cls(
+            np.array(priority, dtype=np.int8),
+            np.array(completed, dtype=bool),
+            datetime_column(due_date),
+            datetime_column(created_at),
+            datetime_column(updated_at),
+        )
+
+
+def datetime_column(values: Sequence[Optional[datetime]]) -> np.ndarray:
+    sample = next((value for value in values if value is not None), None)
+    if sample is not None and sample.tzinfo is not None:
+        return np.array([to_datetime64(value) for value in values], dtype="datetime64[us]")
+    return np.array(values, dtype="datetime64[us]")
+
+
+def bucket_starts(values: np.ndarray, interval: str) -> np.ndarray:
+    days = values.astype("datetime64[D]")
+    if interval == "week":
+        # Day 0 of datetime64 is a Thursday; shift back to ISO week Mondays.
+        offset = (days.astype(np.int64) + 3) % 7
+        days = days - offset.astype("timedelta64[D]")
+    return days
+
+
+def histogram(values: np.ndarray, interval: str) -> Tuple[np.ndarray, np.ndarray]:
+    values = values[~np.isnat(values)]
+    return np.unique(bucket_starts(values, interval), return_counts=True)
+
+
+def compute_task_analytics(columns: TaskColumns, now: datetime, interval: str = "day") -> TaskAnalytics:
+    totals = np.bincount(columns.priority, minlength=4)
+    done = np.bincount(columns.priority, weights=columns.completed, minlength=4).astype(np.int64)
+    completion_by_priority = [
+        PriorityCompletion(
+            priority=p,
+            total=int(totals[p]),
+            completed=int(done[p]),
+            completion_rate=round(float(done[p] / totals[p]), 4) if totals[p] else 0.0,
+        )
+        for p in PRIORITIES
+    ]
+
+    now64 = np.datetime64(now.replace(tzinfo=None), "us")
+    overdue = ~columns.completed & ~np.isnat(columns.due_date) & (columns.due_date < now64)
+    age_days = (now64 - columns.due_date[overdue]) / np.timedelta64(1, "D")
+    age_counts = np.bincount(np.digitize(age_days, OVERDUE_AGE_EDGES_DAYS), minlength=len(OVERDUE_AGE_LABELS))
+    overdue_by_age = [
+        CountBucket(label=label, count=int(count))
+        for label, count in zip(OVERDUE_AGE_LABELS, age_counts)
+    ]
+
+    due_starts, due_counts = histogram(columns.due_date, interval)
+    due_date_histogram = [
+        DateBucket(start=start, count=int(count))
+        for start, count in zip(due_starts.astype(object), due_counts)
+    ]
+
+    # Tasks carry no completion timestamp; the last update of a completed task
+    # is the closest available proxy for when it was completed.
+    created_starts, created_counts = histogram(columns.created_at, interval)
+    completed_starts, completed_counts = histogram(columns.updated_at[columns.completed], interval)
+    starts = np.union1d(created_starts, completed_starts)
+    created = np.zeros(len(starts), dtype=np.int64)
+    completed = np.zeros(len(starts), dtype=np.int64)
+    created[np.searchsorted(starts, created_starts)] = created_counts
+    completed[np.searchsorted(starts, completed_starts)] = completed_counts
+    throughput = [
+        ThroughputBucket(start=start, created=int(c), completed=int(d))
+        for start, c, d in zip(starts.astype(object), created, completed)
+    ]
+
+    return TaskAnalytics(
+        generated_at=now,
+        interval=interval,
+        completion_by_priority=completion_by_priority,
+        overdue_by_age=overdue_by_age,
+        due_date_histogram=due_date_histogram,
+        throughput=throughput,
+    )
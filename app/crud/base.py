@@ -1,4 +1,4 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from typing import Any, Callable, Dict, Generic, List, Optional, Tuple, Type, TypeVar, Union
 from sqlalchemy.orm import Session
 from sqlalchemy import select, func
 from pydantic import BaseModel
@@ -8,14 +8,58 @@ ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+# Stay well below SQLite's bound-parameter limit (999 before 3.32).
+IN_CHUNK_SIZE = 500
+
+# Write listeners receive the event name ("create", "update" or "delete") and
+# the affected object once the change has been committed.
+WriteListener = Callable[[str, Any], None]
+
+# Transactional listeners get the session, the event name and the affected
+# object after the change has been flushed but before it is committed, so any
+# rows they add commit or roll back together with it.
+TransactionalListener = Callable[[Session, str, Any], None]
+
 
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    # Loader options applied when fetching several objects, e.g. to batch-load relationships.
+    load_options: Tuple = ()
+
     def __init__(self, model: Type[ModelType]):
         self.model = model
+        self._listeners: List[WriteListener] = []
+        self._transactional_listeners: List[TransactionalListener] = []
+
+    def add_listener(self, listener: WriteListener) -> None:
+        self._listeners.append(listener)
+
+    def add_transactional_listener(self, listener: TransactionalListener) -> None:
+        self._transactional_listeners.append(listener)
+
+    def _stage(self, db: Session, event: str, obj: ModelType) -> None:
+        if self._transactional_listeners:
+            db.flush()
+            for listener in self._transactional_listeners:
+                listener(db, event, obj)
+
+    def _notify(self, event: str, obj: ModelType) -> None:
+        for listener in self._listeners:
+            listener(event, obj)
 
     def get(self, db: Session, id: Any) -> Optional[ModelType]:
         return db.get(self.model, id)
 
+    def get_multi_by_ids(self, db: Session, ids: List[Any]) -> List[ModelType]:
+        """Fetch objects by primary key in input order, skipping missing ids."""
+        found: Dict[Any, ModelType] = {}
+        unique_ids = list(dict.fromkeys(ids))
+        for start in range(0, len(unique_ids), IN_CHUNK_SIZE):
+            chunk = unique_ids[start:start + IN_CHUNK_SIZE]
+            stmt = select(self.model).options(*self.load_options).where(self.model.id.in_(chunk))
+            for obj in db.execute(stmt).scalars():
+                found[obj.id] = obj
+        return [found[id] for id in unique_ids if id in found]
+
     def get_multi(
             self,
             db: Session,
@@ -23,19 +67,21 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             skip: int = 0,
             limit: int = 100
     ) -> List[ModelType]:
-        stmt = select(self.model).offset(skip).limit(limit)
+        stmt = select(self.model).options(*self.load_options).offset(skip).limit(limit)
         return list(db.execute(stmt).scalars().all())
 
     def count(self, db: Session) -> int:
         stmt = select(func.count(self.model.id))
-        return db.execute(stmt).scalar()
+        return db.execute(stmt).scalar_one()
 
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         obj_data = obj_in.model_dump()
         db_obj = self.model(**obj_data)
         db.add(db_obj)
+        self._stage(db, "create", db_obj)
         db.commit()
         db.refresh(db_obj)
+        self._notify("create", db_obj)
         return db_obj
 
     def update(
@@ -54,12 +100,16 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             if hasattr(db_obj, field):
                 setattr(db_obj, field, value)
 
+        self._stage(db, "update", db_obj)
         db.commit()
         db.refresh(db_obj)
+        self._notify("update", db_obj)
         return db_obj
 
     def remove(self, db: Session, *, id: int) -> ModelType:
-        obj = db.get(self.model, id)
+        obj = db.get_one(self.model, id)
+        self._stage(db, "delete", obj)
         db.delete(obj)
         db.commit()
+        self._notify("delete", obj)
         return obj
\ No newline at end of file
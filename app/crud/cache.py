@@ -0,0 +1,38 @@
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from app.schemas.task import TaskAnalytics
+
+
+class AnalyticsCache:
+    """
+    Analytics results keyed by interval and calendar day.
+
+    Registered as a `CRUDBase` write listener, so writes through this process
+    drop it at once. Writes by other workers are caught by the fingerprint
+    each result is stored with (task count and newest `updated_at`, read
+    before computing it): a result is only served while the fingerprint still
+    matches. Keying on the current day keeps the time buckets from going stale
+    on a dataset that stops changing.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._results: Dict[Tuple[str, str], Tuple[TaskAnalytics, Any]] = {}
+        self.generation = 0
+
+    def get(self, key: Tuple[str, str], fingerprint: Any) -> Optional[TaskAnalytics]:
+        with self._lock:
+            value, stored_fingerprint = self._results.get(key, (None, None))
+        return value if stored_fingerprint == fingerprint else None
+
+    def put(self, key: Tuple[str, str], value: TaskAnalytics, generation: int, fingerprint: Any) -> None:
+        # A write that landed while the result was computed makes it stale.
+        with self._lock:
+            if generation == self.generation:
+                self._results[key] = (value, fingerprint)
+
+    def invalidate(self, *_) -> None:
+        with self._lock:
+            self._results.clear()
+            self.generation += 1
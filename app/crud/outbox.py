@@ -0,0 +1,42 @@
+import json
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from sqlalchemy.orm import Session
+
+from app.models.outbox import OutboxEvent
+from app.schemas.task import TaskOut
+
+
+def utcnow() -> datetime:
+    # Stored naive, like the CURRENT_TIMESTAMP defaults.
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class OutboxWriter:
+    """
+    Transactional listener adding one `outbox` row per subscriber for every
+    task change, in the change's own transaction. Delivery happens later, in
+    the background, so writes never wait on a subscriber.
+    """
+
+    def __init__(self, subscribers: List[str]):
+        self.subscribers = subscribers
+
+    def __call__(self, db: Session, event: str, obj: Any) -> None:
+        data: Dict[str, Any] = {"id": obj.id} if event == "delete" else TaskOut.model_validate(obj).model_dump(mode="json")
+        now = utcnow()
+        # Every subscriber gets the same event id, so receivers can drop redeliveries.
+        event_id = uuid.uuid4().hex
+        payload = json.dumps(
+            {"event_id": event_id, "event": event, "occurred_at": now.isoformat() + "Z", "task": data},
+            separators=(",", ":"),
+        )
+        db.add_all(
+            OutboxEvent(
+                event_id=event_id, subscriber=subscriber, event=event, task_id=obj.id,
+                payload=payload, attempts=0, next_attempt_at=now, dead=False,
+            )
+            for subscriber in self.subscribers
+        )
@@ -0,0 +1,168 @@
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.logging_config import get_logger
+from app.models.task import Task
+
+logger = get_logger("crud.read_model")
+
+NAT = np.datetime64("NaT", "us")
+
+
+def to_datetime64(value: Optional[datetime]) -> np.datetime64:
+    if value is None:
+        return NAT
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(value, "us")
+
+
+class TaskReadModel:
+    """
+    In-process columnar copy of the filterable `tasks` columns.
+
+    Rows live in parallel NumPy arrays indexed by position; deletes leave a
+    tombstone that is compacted away once it accounts for a quarter of the
+    rows. The `(priority, -created_at, -id)` permutation is rebuilt lazily on
+    the first read after a write that can change it.
+
+    The model is populated from the database on first use and then kept
+    current by `CRUDBase` write listeners, so it only sees writes made through
+    this process: enable it for single-writer deployments only.
+    """
+
+    _columns = ("ids", "priority", "completed", "due_date", "created_at", "live")
+    _initial_capacity = 1024
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.loaded = False
+        self._size = 0
+        self._dead = 0
+        self._positions: Dict[int, int] = {}
+        self._order: Optional[np.ndarray] = None
+        self._allocate(self._initial_capacity)
+
+    def _allocate(self, capacity: int) -> None:
+        self.ids = np.zeros(capacity, dtype=np.int64)
+        self.priority = np.zeros(capacity, dtype=np.int8)
+        self.completed = np.zeros(capacity, dtype=bool)
+        self.due_date = np.full(capacity, NAT)
+        self.created_at = np.full(capacity, NAT)
+        self.live = np.zeros(capacity, dtype=bool)
+
+    def _grow(self) -> None:
+        capacity = len(self.ids) * 2
+        for name in self._columns:
+            old = getattr(self, name)
+            new = np.full(capacity, NAT) if old.dtype.kind == "M" else np.zeros(capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def load(self, db: Session) -> None:
+        """Replace the model contents with one columnar fetch of the table."""
+        rows: Sequence[Any] = db.execute(
+            select(Task.id, Task.priority, Task.completed, Task.due_date, Task.created_at)
+        ).all()
+        with self._lock:
+            self._allocate(max(self._initial_capacity, len(rows) * 2))
+            n = len(rows)
+            if n:
+                ids, priority, completed, due_date, created_at = zip(*rows)
+                self.ids[:n] = ids
+                self.priority[:n] = priority
+                self.completed[:n] = completed
+                self.due_date[:n] = [to_datetime64(value) for value in due_date]
+                self.created_at[:n] = [to_datetime64(value) for value in created_at]
+                self.live[:n] = True
+            self._size = n
+            self._dead = 0
+            self._positions = {task_id: pos for pos, task_id in enumerate(self.ids[:n].tolist())}
+            self._order = None
+            self.loaded = True
+        logger.info(f"Task read model loaded with {n} rows")
+
+    def ensure_loaded(self, db: Session) -> None:
+        if not self.loaded:
+            self.load(db)
+
+    def apply(self, event: str, obj: Any) -> None:
+        """`CRUDBase` write listener for a `Task`; creates and updates are idempotent upserts."""
+        with self._lock:
+            if not self.loaded:
+                return
+            if event == "delete":
+                pos = self._positions.pop(obj.id, None)
+                if pos is not None:
+                    self.live[pos] = False
+                    self._dead += 1
+                    if self._dead * 4 > self._size:
+                        self._compact()
+                return
+
+            pos = self._positions.get(obj.id)
+            if pos is None:
+                if self._size == len(self.ids):
+                    self._grow()
+                pos = self._size
+                self._size += 1
+                self._positions[obj.id] = pos
+                self.ids[pos] = obj.id
+                self.live[pos] = True
+                self._order = None
+            elif self.priority[pos] != obj.priority:
+                self._order = None
+
+            self.priority[pos] = obj.priority
+            self.completed[pos] = bool(obj.completed)
+            self.due_date[pos] = to_datetime64(obj.due_date)
+            self.created_at[pos] = to_datetime64(obj.created_at)
+
+    def _compact(self) -> None:
+        keep = np.flatnonzero(self.live[:self._size])
+        for name in self._columns:
+            column = getattr(self, name)
+            column[:len(keep)] = column[keep]
+        self.live[len(keep):self._size] = False
+        self._size = len(keep)
+        self._dead = 0
+        self._positions = {task_id: pos for pos, task_id in enumerate(self.ids[:self._size].tolist())}
+        self._order = None
+
+    def _ordered(self) -> np.ndarray:
+        if self._order is None:
+            n = self._size
+            created = self.created_at[:n].view(np.int64)
+            self._order = np.lexsort((-self.ids[:n], -created, self.priority[:n]))
+        return self._order
+
+    def _mask(self, completed: Optional[bool], priority: Optional[int]) -> np.ndarray:
+        n = self._size
+        mask = self.live[:n].copy()
+        if completed is not None:
+            mask &= self.completed[:n] == completed
+        if priority is not None:
+            mask &= self.priority[:n] == priority
+        return mask
+
+    def page_ids(
+            self,
+            *,
+            completed: Optional[bool] = None,
+            priority: Optional[int] = None,
+            skip: int = 0,
+            limit: int = 100,
+    ) -> List[int]:
+        with self._lock:
+            order = self._ordered()
+            selected = order[self._mask(completed, priority)[order]]
+            return self.ids[selected[skip:skip + limit]].tolist()
+
+    def count(self, *, completed: Optional[bool] = None, priority: Optional[int] = None) -> int:
+        with self._lock:
+            return int(np.count_nonzero(self._mask(completed, priority)))
@@ -0,0 +1,253 @@
+import functools
+import heapq
+import itertools
+from collections import Counter
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session
+
+from app.crud.base import IN_CHUNK_SIZE
+from app.crud.statements import LIST_ORDER
+from app.crud.task import CRUDTask, _filter_conditions
+from app.models.task import ArchivedTask, Task
+from app.schemas.query import TaskQuery
+from app.schemas.task import TaskSummary
+from app.sharding import ShardRouter
+
+
+@functools.total_ordering
+class _Descending:
+    """Inverts the ordering of a sort key component."""
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and self.value == other.value
+
+    def __lt__(self, other: "_Descending") -> bool:
+        return other.value < self.value
+
+
+def _list_key(task: Union[Task, ArchivedTask]) -> tuple:
+    return task.priority, _Descending(task.created_at), -task.id
+
+
+# Python equivalents of `QUERY_SORTS`, used to merge the shards' pages.
+QUERY_MERGE_KEYS: Dict[str, Callable[[Task], tuple]] = {
+    "priority": _list_key,
+    "due_date": lambda task: (task.due_date is None, task.due_date, task.id),
+    "-due_date": lambda task: (task.due_date is None, _Descending(task.due_date), -task.id),
+    "created_at": lambda task: (task.created_at, task.id),
+    "-created_at": lambda task: (_Descending(task.created_at), -task.id),
+}
+
+
+def _export_row_key(row: tuple) -> tuple:
+    # `TASK_FIELDS` order: id, title, description, priority, due_date, completed, created_at, updated_at.
+    return row[3], _Descending(row[6]), -row[0]
+
+
+def merge_pages(pages: Iterable[Sequence[Any]], key: Callable[[Any], Any], skip: int, limit: int) -> List[Any]:
+    """K-way merge of per-shard pages that are each sorted by `key`, then cut to the requested page."""
+    return list(itertools.islice(heapq.merge(*pages, key=key), skip, skip + limit))
+
+
+class ShardedCRUDTask(CRUDTask):
+    """
+    `CRUDTask` over tasks spread across the databases of a `ShardRouter`.
+
+    Lookups and writes go through the request session, which routes them by
+    id. List, count, facet, summary and query reads scatter the unsharded
+    implementation to every shard in parallel and gather the results: pages
+    are fetched `skip + limit` deep from each shard and k-way merged in list
+    order, counts are summed. The request session passed to those reads is
+    not used.
+    """
+
+    def __init__(self, model, router: ShardRouter):
+        super().__init__(model)
+        self.router = router
+
+    def get(self, db: Session, id: int) -> Optional[Task]:
+        # The identity token sends the primary key load to the owning shard only.
+        return db.get(self.model, id, identity_token=self.router.shard_for_id(id))
+
+    def get_archived(self, db: Session, id: int) -> Optional[ArchivedTask]:
+        return db.get(ArchivedTask, id, identity_token=self.router.shard_for_id(id))
+
+    def _allocate_id(self, db: Session) -> int:
+        return self.router.allocate_id(db)
+
+    def _bind_arguments(self, task_id: int) -> Dict[str, Any]:
+        # Every shard has its own `tags` rows; a task's tags are those of its shard.
+        return {"shard_id": self.router.shard_for_id(task_id)}
+
+    def _ids_on(self, shard_db: Session, ids: List[int]) -> List[int]:
+        return [id for id in ids if self.router.shard_for_id(id) == shard_db.info["shard_id"]]
+
+    def get_by_filters(
+            self,
+            db: Session,
+            *,
+            completed: Optional[bool] = None,
+            priority: Optional[int] = None,
+            q: Optional[str] = None,
+            tags: Optional[List[str]] = None,
+            tag_match: str = "any",
+            skip: int = 0,
+            limit: int = 100,
+            include_archived: bool = False,
+    ) -> List[Union[Task, ArchivedTask]]:
+        """Merge the shards' sort keys to pick the page, then load only the page's tasks from their shards."""
+        if include_archived:
+            get_page = super().get_by_filters
+            pages = self.router.scatter(lambda shard_db: get_page(
+                shard_db, completed=completed, priority=priority, q=q, tags=tags, tag_match=tag_match,
+                skip=0, limit=skip + limit, include_archived=True
+            ))
+            return merge_pages(pages, _list_key, skip, limit)
+
+        keys: Select = (
+            select(Task.id, Task.priority, Task.created_at)
+            .where(*_filter_conditions(completed, priority, q, tags, tag_match))
+            .order_by(*LIST_ORDER)
+            .limit(skip + limit)
+        )
+        page = [row.id for row in merge_pages(
+            self.router.scatter(lambda shard_db: shard_db.execute(keys).all()), _list_key, skip, limit
+        )]
+        get_multi = super().get_multi_by_ids
+        found = {
+            task.id: task
+            for tasks in self.router.scatter(lambda shard_db: get_multi(shard_db, self._ids_on(shard_db, page)))
+            for task in tasks
+        }
+        return [found[id] for id in page if id in found]
+
+    def count_by_filters(
+            self,
+            db: Session,
+            *,
+            completed: Optional[bool] = None,
+            priority: Optional[int] = None,
+            q: Optional[str] = None,
+            tags: Optional[List[str]] = None,
+            tag_match: str = "any",
+            include_archived: bool = False,
+    ) -> int:
+        count = super().count_by_filters
+        return sum(self.router.scatter(lambda shard_db: count(
+            shard_db, completed=completed, priority=priority, q=q, tags=tags, tag_match=tag_match,
+            include_archived=include_archived
+        )))
+
+    def count_facets(
+            self,
+            db: Session,
+            *,
+            facets: Sequence[str],
+            completed: Optional[bool] = None,
+            priority: Optional[int] = None,
+            q: Optional[str] = None,
+            tags: Optional[List[str]] = None,
+            tag_match: str = "any",
+            include_archived: bool = False,
+    ) -> Tuple[Dict[str, Dict[str, int]], int]:
+        count_facets = super().count_facets
+        results = self.router.scatter(lambda shard_db: count_facets(
+            shard_db, facets=facets, completed=completed, priority=priority, q=q, tags=tags, tag_match=tag_match,
+            include_archived=include_archived
+        ))
+        counts: Dict[str, Dict[str, int]] = {}
+        for shard_counts, _ in results:
+            for facet, values in shard_counts.items():
+                merged = counts.setdefault(facet, dict.fromkeys(values, 0))
+                for value, count in values.items():
+                    merged[value] += count
+        return counts, sum(total for _, total in results)
+
+    def archive_completed(self, db: Session, *, completed_before: datetime, limit: int = IN_CHUNK_SIZE) -> int:
+        """Archive up to `limit` tasks on each shard, in one transaction per shard."""
+        archive = super().archive_completed
+        return sum(self.router.scatter(
+            lambda shard_db: archive(shard_db, completed_before=completed_before, limit=limit)
+        ))
+
+    def next_ids_by_filters(
+            self,
+            db: Session,
+            *,
+            after_id: int,
+            limit: int,
+            completed: Optional[bool] = None,
+            priority: Optional[int] = None,
+            q: Optional[str] = None,
+            tags: Optional[List[str]] = None,
+            tag_match: str = "any",
+    ) -> List[int]:
+        next_ids = super().next_ids_by_filters
+        pages = self.router.scatter(lambda shard_db: next_ids(
+            shard_db, after_id=after_id, limit=limit, completed=completed, priority=priority, q=q, tags=tags,
+            tag_match=tag_match
+        ))
+        return merge_pages(pages, lambda id: id, 0, limit)
+
+    def update_many(self, db: Session, *, ids: List[int], values: Dict[str, Any]) -> int:
+        """Update each shard's share of `ids`, in one transaction per shard."""
+        update_many = super().update_many
+        return sum(self.router.scatter(
+            lambda shard_db: update_many(shard_db, ids=self._ids_on(shard_db, ids), values=values)
+        ))
+
+    def remove_many(self, db: Session, *, ids: List[int]) -> int:
+        """Delete each shard's share of `ids`, in one transaction per shard."""
+        remove_many = super().remove_many
+        return sum(self.router.scatter(lambda shard_db: remove_many(shard_db, ids=self._ids_on(shard_db, ids))))
+
+    def iter_rows_by_filters(
+            self,
+            db: Session,
+            *,
+            completed: Optional[bool] = None,
+            priority: Optional[int] = None,
+            q: Optional[str] = None,
+            chunk_size: int = 1000,
+    ) -> Iterator[List[tuple]]:
+        """Stream every shard at once, merging the rows into list order."""
+        iter_rows = super().iter_rows_by_filters
+        sessions = self.router.sessions()
+        try:
+            merged = heapq.merge(
+                *(
+                    itertools.chain.from_iterable(iter_rows(
+                        shard_db, completed=completed, priority=priority, q=q, chunk_size=chunk_size
+                    ))
+                    for shard_db in sessions
+                ),
+                key=_export_row_key,
+            )
+            while chunk := list(itertools.islice(merged, chunk_size)):
+                yield chunk
+        finally:
+            for shard_db in sessions:
+                shard_db.close()
+
+    def query(self, db: Session, *, spec: TaskQuery) -> Tuple[List[Task], int]:
+        skip = (spec.page - 1) * spec.size
+        shard_spec = spec.model_copy(update={"page": 1, "size": skip + spec.size})
+        run_query = super().query
+        results = self.router.scatter(lambda shard_db: run_query(shard_db, spec=shard_spec))
+        items = merge_pages((page for page, _ in results), QUERY_MERGE_KEYS[spec.sort], skip, spec.size)
+        return items, sum(total for _, total in results)
+
+    def get_summary(self, db: Session) -> TaskSummary:
+        totals: Counter = Counter()
+        tag_counts: Counter = Counter()
+        for summary in self.router.scatter(super().get_summary):
+            totals.update(summary.model_dump(exclude={"tag_counts"}))
+            tag_counts.update(summary.tag_counts)
+        return TaskSummary(**totals, tag_counts=dict(sorted(tag_counts.items())))
@@ -0,0 +1,181 @@
+from itertools import product
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import ColumnElement, CompoundSelect, Integer, Select, bindparam, case, func, or_, select, union_all
+from sqlalchemy.orm import selectinload
+
+from app.config import settings
+from app.models.task import ArchivedTask, Tag, Task, task_tags
+
+TAG_MATCHES = ("any", "all")
+
+# Which of (completed, priority, q) a filter call sets, and how it matches tags (None = no tag filter).
+FilterShape = Tuple[bool, bool, bool, Optional[str]]
+
+FILTER_SHAPES: Tuple[FilterShape, ...] = tuple(
+    (has_completed, has_priority, has_q, tag_match)
+    for has_completed, has_priority, has_q in product((False, True), repeat=3)
+    for tag_match in (None, *TAG_MATCHES)
+)
+
+LIST_ORDER = (Task.priority.asc(), Task.created_at.desc(), Task.id.desc())
+
+
+def text_search(model, pattern) -> ColumnElement:
+    """
+    Case-insensitive LIKE over the titles of `model` (`Task` or `ArchivedTask`)
+    and, with `description_search`, their descriptions. Split storage, whose
+    compressed descriptions LIKE cannot match, requires description search off.
+    """
+    if not settings.description_search:
+        return model.title.ilike(pattern)
+    return or_(model.title.ilike(pattern), model.description_text.ilike(pattern))
+
+
+# Dialects with `INSERT ... ON CONFLICT DO NOTHING`.
+UPSERT_DIALECTS: Tuple[str, ...] = ("sqlite", "postgresql")
+
+
+def insert_ignoring_conflicts(table, dialect_name: str, **kwargs: Any):
+    """
+    `INSERT ... ON CONFLICT DO NOTHING` into `table` for a SQLite or PostgreSQL
+    connection. The dialect module is imported on first use, so deployments
+    never load the one they do not talk to.
+    """
+    if dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        raise ValueError(f"INSERT ... ON CONFLICT is only supported on {', '.join(UPSERT_DIALECTS)}, not {dialect_name}")
+    return insert(table).on_conflict_do_nothing(**kwargs)
+
+
+def tag_filter(id_column, names, match: str, count) -> ColumnElement:
+    """
+    Semi-join keeping tasks that carry any (or all) of the tag `names`. Each
+    name is found through the unique index on `tags.name` and its tasks
+    through `ix_task_tags_tag_id`; "all" keeps ids seen `count` times.
+    """
+    tagged = (
+        select(task_tags.c.task_id)
+        .join(Tag, Tag.id == task_tags.c.tag_id)
+        .where(Tag.name.in_(names))
+    )
+    if match == "all":
+        tagged = tagged.group_by(task_tags.c.task_id).having(func.count() == count)
+    return id_column.in_(tagged)
+
+
+def _shape_conditions(shape: FilterShape) -> list:
+    has_completed, has_priority, has_q, tag_match = shape
+    conditions = []
+    if has_completed:
+        conditions.append(Task.completed == bindparam("completed"))
+    if has_priority:
+        conditions.append(Task.priority == bindparam("priority"))
+    if has_q:
+        search = bindparam("search")
+        conditions.append(text_search(Task, search))
+    if tag_match:
+        conditions.append(tag_filter(
+            Task.id, bindparam("tags", expanding=True), tag_match, bindparam("tag_count", type_=Integer)
+        ))
+    return conditions
+
+
+def _summary(model) -> Select:
+    return select(
+        func.count(model.id).label("total_tasks"),
+        func.count(case((model.completed == True, 1))).label("completed_tasks"),
+        func.count(case((model.priority == 1, 1))).label("high_priority_tasks"),
+        func.count(
+            case(((model.due_date < bindparam("now")) & (model.completed == False), 1))
+        ).label("overdue_tasks"),
+    )
+
+
+class TaskStatements:
+    """
+    Variant table of the list, count and summary statements.
+
+    Every filter combination maps to one statement built at import time with
+    bound parameters for the filter values and the page window. Requests reuse
+    those objects, so they skip statement construction and cache-key
+    generation, and each combination occupies exactly one compiled-cache entry.
+    """
+
+    def __init__(self):
+        self.list: Dict[FilterShape, Select] = {}
+        self.count: Dict[FilterShape, Select] = {}
+        for shape in FILTER_SHAPES:
+            conditions = _shape_conditions(shape)
+            self.list[shape] = (
+                select(Task)
+                .options(selectinload(Task.description_record), selectinload(Task.tag_records))
+                .where(*conditions)
+                .order_by(*LIST_ORDER)
+                .offset(bindparam("offset", type_=Integer))
+                .limit(bindparam("limit", type_=Integer))
+            )
+            self.count[shape] = select(func.count(Task.id)).where(*conditions)
+
+        # One row per tier; `get_summary` adds them up.
+        self.summary: CompoundSelect = union_all(_summary(Task), _summary(ArchivedTask))
+        # Tasks per tag over both tiers, counted on the tag index before the names are joined in.
+        per_tag = select(task_tags.c.tag_id, func.count().label("tasks")).group_by(task_tags.c.tag_id).subquery()
+        self.tag_counts: Select = (
+            select(Tag.name, per_tag.c.tasks).join(per_tag, per_tag.c.tag_id == Tag.id).order_by(Tag.name)
+        )
+
+    @staticmethod
+    def bind(
+            completed: Optional[bool] = None,
+            priority: Optional[int] = None,
+            q: Optional[str] = None,
+            tags: Optional[List[str]] = None,
+            tag_match: str = "any",
+    ) -> Tuple[FilterShape, Dict[str, Any]]:
+        """Map filter arguments to their statement variant and parameter values."""
+        params: Dict[str, Any] = {}
+        if completed is not None:
+            params["completed"] = completed
+        if priority is not None:
+            params["priority"] = priority
+        if q:
+            params["search"] = f"%{q}%"
+        if tags:
+            params["tags"] = tags
+            params["tag_count"] = len(tags)
+        return (completed is not None, priority is not None, bool(q), tag_match if tags else None), params
+
+    def list_tasks(
+            self,
+            *,
+            completed: Optional[bool] = None,
+            priority: Optional[int] = None,
+            q: Optional[str] = None,
+            tags: Optional[List[str]] = None,
+            tag_match: str = "any",
+            skip: int = 0,
+            limit: int = 100,
+    ) -> Tuple[Select, Dict[str, Any]]:
+        shape, params = self.bind(completed, priority, q, tags, tag_match)
+        params["offset"] = skip
+        params["limit"] = limit
+        return self.list[shape], params
+
+    def count_tasks(
+            self,
+            *,
+            completed: Optional[bool] = None,
+            priority: Optional[int] = None,
+            q: Optional[str] = None,
+            tags: Optional[List[str]] = None,
+            tag_match: str = "any",
+    ) -> Tuple[Select, Dict[str, Any]]:
+        shape, params = self.bind(completed, priority, q, tags, tag_match)
+        return self.count[shape], params
+
+
+task_statements = TaskStatements()
\ No newline at end of file
@@ -1,18 +1,164 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import select, or_, func, and_
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import delete, insert, literal, select, func, union_all
 from datetime import datetime
 
-from app.crud.base import CRUDBase
-from app.models.task import Task
-from app.schemas.task import TaskCreate, TaskUpdate, TaskSummary
-from app.exceptions import DatabaseError
+from app.config import settings
+from app.database import shard_router
+from app.crud.base import CRUDBase, IN_CHUNK_SIZE
+from app.crud.cache import AnalyticsCache
+from app.crud.outbox import OutboxWriter
+from app.crud.statements import insert_ignoring_conflicts, tag_filter, task_statements, text_search
+from app.compression import decode_text
+from app.models.task import ArchivedTask, Tag, Task, TaskDescription, task_tags
+from app.schemas.query import TaskQuery
+from app.schemas.task import TaskCreate, TaskUpdate, TaskSummary, TaskAnalytics
+from app.exceptions import BaseAppException, DatabaseError
 from app.logging_config import get_logger
 
+if TYPE_CHECKING:
+    from app.crud.read_model import TaskReadModel
+
 logger = get_logger("crud.task")
 
+FACETS = ("priority", "completed")
+
+QUERY_SORTS = {
+    "priority": (Task.priority.asc(), Task.created_at.desc(), Task.id.desc()),
+    "due_date": (Task.due_date.asc().nulls_last(), Task.id.asc()),
+    "-due_date": (Task.due_date.desc().nulls_last(), Task.id.desc()),
+    "created_at": (Task.created_at.asc(), Task.id.asc()),
+    "-created_at": (Task.created_at.desc(), Task.id.desc()),
+}
+
+RANGE_COLUMNS = {
+    "due_date": Task.due_date,
+    "created_at": Task.created_at,
+    "updated_at": Task.updated_at,
+}
+
+# The description is selected as its plain text and its compressed (codec, body)
+# pair, at most one of which is set, and decoded per row.
+EXPORT_COLUMNS = (
+    Task.id,
+    Task.title,
+    Task.description_text,
+    TaskDescription.codec,
+    TaskDescription.body,
+    Task.priority,
+    Task.due_date,
+    Task.completed,
+    Task.created_at,
+    Task.updated_at,
+)
+
+
+# Target columns of `tasks_archive`, matching `EXPORT_COLUMNS` one to one.
+ARCHIVE_COLUMNS = (
+    "id",
+    "title",
+    "description",
+    "description_codec",
+    "description_body",
+    "priority",
+    "due_date",
+    "completed",
+    "created_at",
+    "updated_at",
+)
+
+
+def _filter_conditions(
+        completed: Optional[bool] = None,
+        priority: Optional[int] = None,
+        q: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        tag_match: str = "any",
+        *,
+        model: Any = Task,
+) -> list:
+    """Filter conditions over `model`: `Task`, or `ArchivedTask` for the `tasks_archive` tier."""
+    conditions = []
+    if completed is not None:
+        conditions.append(model.completed == completed)
+    if priority is not None:
+        conditions.append(model.priority == priority)
+    if q:
+        conditions.append(text_search(model, f"%{q}%"))
+    if tags:
+        conditions.append(tag_filter(model.id, tags, tag_match, len(tags)))
+    return conditions
+
 
 class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
+    load_options = (selectinload(Task.description_record), selectinload(Task.tag_records))
+
+    def __init__(self, model, read_model: Optional["TaskReadModel"] = None):
+        super().__init__(model)
+        self.analytics_cache = AnalyticsCache()
+        self.add_listener(self.analytics_cache.invalidate)
+        self.read_model = read_model
+        if read_model is not None:
+            self.add_listener(read_model.apply)
+
+    def _allocate_id(self, db: Session) -> Optional[int]:
+        """Id for a new task, or None to let the database assign one."""
+        return None
+
+    def _bind_arguments(self, task_id: int) -> Dict[str, Any]:
+        """Session bind arguments reaching the database that holds task `task_id`."""
+        return {}
+
+    def _set_tags(self, db: Session, task_id: int, names: List[str]) -> None:
+        """Replace the tags of a flushed task with `names`, creating missing tags, in `db`'s transaction."""
+        connection = db.connection(bind_arguments=self._bind_arguments(task_id))
+        tag_ids = {}
+        if names:
+            tag_ids = dict(connection.execute(select(Tag.name, Tag.id).where(Tag.name.in_(names))).all())
+            missing = [name for name in names if name not in tag_ids]
+            if missing:
+                # Another request may create the same tag meanwhile; either insert wins.
+                upsert = insert_ignoring_conflicts(Tag, connection.dialect.name, index_elements=["name"])
+                connection.execute(upsert, [{"name": name} for name in missing])
+                tag_ids.update(connection.execute(select(Tag.name, Tag.id).where(Tag.name.in_(missing))).all())
+        connection.execute(delete(task_tags).where(task_tags.c.task_id == task_id))
+        if tag_ids:
+            connection.execute(insert(task_tags), [{"task_id": task_id, "tag_id": id} for id in tag_ids.values()])
+
+    def create(self, db: Session, *, obj_in: TaskCreate) -> Task:
+        db_obj = self.model(id=self._allocate_id(db), **obj_in.model_dump(exclude={"tags"}))
+        db.add(db_obj)
+        if obj_in.tags:
+            db.flush()
+            self._set_tags(db, db_obj.id, obj_in.tags)
+        self._stage(db, "create", db_obj)
+        db.commit()
+        db.refresh(db_obj)
+        self._notify("create", db_obj)
+        return db_obj
+
+    def update(self, db: Session, *, db_obj: Task, obj_in: Union[TaskUpdate, Dict[str, Any]]) -> Task:
+        update_data = dict(obj_in) if isinstance(obj_in, dict) else obj_in.model_dump(exclude_unset=True)
+        tags = update_data.pop("tags", None)
+        if tags is not None and tags != db_obj.tags:
+            self._set_tags(db, db_obj.id, tags)
+            db.expire(db_obj, ["tag_records"])
+            # Tags live in their own table; still count them as a change to the task.
+            db_obj.updated_at = func.now()
+        return super().update(db, db_obj=db_obj, obj_in=update_data)
+
+    def remove(self, db: Session, *, id: int) -> Task:
+        db.connection(bind_arguments=self._bind_arguments(id)).execute(
+            delete(task_tags).where(task_tags.c.task_id == id)
+        )
+        return super().remove(db, id=id)
+
+    def _serves_from_read_model(self, db: Session, q: Optional[str], tags: Optional[List[str]] = None) -> bool:
+        if self.read_model is None or q or tags:
+            return False
+        self.read_model.ensure_loaded(db)
+        return True
+
     def get_by_filters(
             self,
             db: Session,
@@ -20,36 +166,30 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
             completed: Optional[bool] = None,
             priority: Optional[int] = None,
             q: Optional[str] = None,
+            tags: Optional[List[str]] = None,
+            tag_match: str = "any",
             skip: int = 0,
             limit: int = 100,
-    ) -> List[Task]:
+            include_archived: bool = False,
+    ) -> List[Union[Task, ArchivedTask]]:
         try:
-            stmt = select(Task)
-
-            conditions = []
-            if completed is not None:
-                conditions.append(Task.completed == completed)
-            if priority is not None:
-                conditions.append(Task.priority == priority)
-            if q:
-                search_term = f"%{q}%"
-                conditions.append(
-                    or_(
-                        Task.title.ilike(search_term),
-                        Task.description.ilike(search_term)
-                    )
+            if include_archived:
+                return self._get_across_tiers(
+                    db, completed=completed, priority=priority, q=q, tags=tags, tag_match=tag_match,
+                    skip=skip, limit=limit
                 )
 
-            if conditions:
-                stmt = stmt.where(and_(*conditions))
-
-            stmt = stmt.offset(skip).limit(limit)
+            if self._serves_from_read_model(db, q, tags):
+                ids = self.read_model.page_ids(completed=completed, priority=priority, skip=skip, limit=limit)
+                return self.get_multi_by_ids(db, ids)
 
-            stmt = stmt.order_by(Task.priority.asc(), Task.created_at.desc())
-
-            result = db.execute(stmt)
-            return list(result.scalars().all())
+            stmt, params = task_statements.list_tasks(
+                completed=completed, priority=priority, q=q, tags=tags, tag_match=tag_match, skip=skip, limit=limit
+            )
+            return list(db.execute(stmt, params).scalars().all())
 
+        except BaseAppException:
+            raise
         except Exception as e:
             logger.error(f"Error fetching tasks with filters: {e}")
             raise DatabaseError("Failed to fetch tasks")
@@ -61,65 +201,390 @@ class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
             completed: Optional[bool] = None,
             priority: Optional[int] = None,
             q: Optional[str] = None,
+            tags: Optional[List[str]] = None,
+            tag_match: str = "any",
+            include_archived: bool = False,
     ) -> int:
         try:
-            stmt = select(func.count(Task.id))
-
-            conditions = []
-            if completed is not None:
-                conditions.append(Task.completed == completed)
-            if priority is not None:
-                conditions.append(Task.priority == priority)
-            if q:
-                search_term = f"%{q}%"
-                conditions.append(
-                    or_(
-                        Task.title.ilike(search_term),
-                        Task.description.ilike(search_term)
-                    )
-                )
+            archived = 0
+            if include_archived:
+                archived = db.execute(
+                    select(func.count(ArchivedTask.id))
+                    .where(*_filter_conditions(completed, priority, q, tags, tag_match, model=ArchivedTask))
+                ).scalar()
 
-            if conditions:
-                stmt = stmt.where(and_(*conditions))
+            if self._serves_from_read_model(db, q, tags):
+                return self.read_model.count(completed=completed, priority=priority) + archived
 
-            return db.execute(stmt).scalar()
+            stmt, params = task_statements.count_tasks(
+                completed=completed, priority=priority, q=q, tags=tags, tag_match=tag_match
+            )
+            return db.execute(stmt, params).scalar() + archived
 
+        except BaseAppException:
+            raise
         except Exception as e:
             logger.error(f"Error counting tasks with filters: {e}")
             raise DatabaseError("Failed to count tasks")
 
+    def count_facets(
+            self,
+            db: Session,
+            *,
+            facets: Sequence[str],
+            completed: Optional[bool] = None,
+            priority: Optional[int] = None,
+            q: Optional[str] = None,
+            tags: Optional[List[str]] = None,
+            tag_match: str = "any",
+            include_archived: bool = False,
+    ) -> Tuple[Dict[str, Dict[str, int]], int]:
+        """
+        Count tasks per facet value together with the filtered total.
+
+        Runs a single `GROUP BY priority, completed` under the search term and
+        tags and marginalises it in Python (the archive tier adds its own cells). Each facet is counted under every filter
+        except its own, so the UI can show how many tasks switching that
+        filter value would return.
+        """
+        try:
+            stmt = (
+                select(Task.priority, Task.completed, func.count(Task.id))
+                .where(*_filter_conditions(q=q, tags=tags, tag_match=tag_match))
+                .group_by(Task.priority, Task.completed)
+            )
+            cells = db.execute(stmt).all()
+            if include_archived:
+                cells += db.execute(
+                    select(ArchivedTask.priority, ArchivedTask.completed, func.count(ArchivedTask.id))
+                    .where(*_filter_conditions(q=q, tags=tags, tag_match=tag_match, model=ArchivedTask))
+                    .group_by(ArchivedTask.priority, ArchivedTask.completed)
+                ).all()
+
+        except BaseAppException:
+            raise
+        except Exception as e:
+            logger.error(f"Error counting task facets: {e}")
+            raise DatabaseError("Failed to count task facets")
+
+        counts: Dict[str, Dict[str, int]] = {}
+        if "priority" in facets:
+            counts["priority"] = {str(p): 0 for p in (1, 2, 3)}
+            for cell_priority, cell_completed, count in cells:
+                if completed is None or cell_completed == completed:
+                    counts["priority"][str(cell_priority)] += count
+        if "completed" in facets:
+            counts["completed"] = {"true": 0, "false": 0}
+            for cell_priority, cell_completed, count in cells:
+                if priority is None or cell_priority == priority:
+                    counts["completed"]["true" if cell_completed else "false"] += count
+
+        total = sum(
+            count for cell_priority, cell_completed, count in cells
+            if (completed is None or cell_completed == completed)
+            and (priority is None or cell_priority == priority)
+        )
+        return counts, total
+
+    def _get_across_tiers(
+            self,
+            db: Session,
+            *,
+            completed: Optional[bool],
+            priority: Optional[int],
+            q: Optional[str],
+            tags: Optional[List[str]],
+            tag_match: str,
+            skip: int,
+            limit: int,
+    ) -> List[Union[Task, ArchivedTask]]:
+        """Page over hot and archived tasks in list order: pick the page's keys first, then load its rows."""
+        keys = union_all(
+            select(Task.id, Task.priority, Task.created_at, literal(False).label("archived"))
+            .where(*_filter_conditions(completed, priority, q, tags, tag_match)),
+            select(ArchivedTask.id, ArchivedTask.priority, ArchivedTask.created_at, literal(True).label("archived"))
+            .where(*_filter_conditions(completed, priority, q, tags, tag_match, model=ArchivedTask)),
+        ).subquery()
+        page = db.execute(
+            select(keys.c.id, keys.c.archived)
+            .order_by(keys.c.priority.asc(), keys.c.created_at.desc(), keys.c.id.desc())
+            .offset(skip)
+            .limit(limit)
+        ).all()
+
+        hot = {task.id: task for task in self.get_multi_by_ids(db, [id for id, archived in page if not archived])}
+        archived_ids = [id for id, archived in page if archived]
+        cold = {
+            task.id: task
+            for task in db.execute(
+                select(ArchivedTask).options(selectinload(ArchivedTask.tag_records)).where(ArchivedTask.id.in_(archived_ids))
+            ).scalars()
+        } if archived_ids else {}
+        # A row archived or deleted since the keys were read is left out of the page.
+        tiers = {False: hot, True: cold}
+        return [tiers[archived][id] for id, archived in page if id in tiers[archived]]
+
+    def get_archived(self, db: Session, id: int) -> Optional[ArchivedTask]:
+        return db.get(ArchivedTask, id)
+
+    def archive_completed(self, db: Session, *, completed_before: datetime, limit: int = IN_CHUNK_SIZE) -> int:
+        """
+        Move up to `limit` tasks completed before `completed_before` (by their
+        last update) to `tasks_archive`, in one transaction. Returns how many
+        moved; write listeners see each as a delete.
+        """
+        try:
+            ids = list(db.execute(
+                select(Task.id)
+                .where(Task.completed == True, Task.updated_at < completed_before)
+                .order_by(Task.id)
+                .limit(min(limit, IN_CHUNK_SIZE))
+            ).scalars())
+            if not ids:
+                return 0
+
+            db.execute(
+                insert(ArchivedTask).from_select(
+                    ARCHIVE_COLUMNS,
+                    select(*EXPORT_COLUMNS).outerjoin(Task.description_record).where(Task.id.in_(ids))
+                )
+            )
+            db.execute(delete(TaskDescription).where(TaskDescription.task_id.in_(ids)))
+            # Rows deleted meanwhile were neither copied nor are they deleted here: report only these.
+            ids = list(db.execute(delete(Task).where(Task.id.in_(ids)).returning(Task.id)).scalars())
+            for id in ids:
+                self._stage(db, "delete", Task(id=id))
+            db.commit()
+
+        except BaseAppException:
+            db.rollback()
+            raise
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error archiving tasks: {e}")
+            raise DatabaseError("Failed to archive tasks")
+
+        for id in ids:
+            self._notify("delete", Task(id=id))
+        return len(ids)
+
+    def next_ids_by_filters(
+            self,
+            db: Session,
+            *,
+            after_id: int,
+            limit: int,
+            completed: Optional[bool] = None,
+            priority: Optional[int] = None,
+            q: Optional[str] = None,
+            tags: Optional[List[str]] = None,
+            tag_match: str = "any",
+    ) -> List[int]:
+        """Ids of the next `limit` live tasks matching the filters after `after_id`, in id order."""
+        try:
+            return list(db.execute(
+                select(Task.id)
+                .where(Task.id > after_id, *_filter_conditions(completed, priority, q, tags, tag_match))
+                .order_by(Task.id)
+                .limit(limit)
+            ).scalars())
+        except Exception as e:
+            logger.error(f"Error fetching task ids with filters: {e}")
+            raise DatabaseError("Failed to fetch tasks")
+
+    def update_many(self, db: Session, *, ids: List[int], values: Dict[str, Any]) -> int:
+        """
+        Set `values` on the tasks with these ids (at most `IN_CHUNK_SIZE`), in
+        one transaction. Returns how many were updated; write listeners see
+        each as an update.
+        """
+        try:
+            tasks = self.get_multi_by_ids(db, ids)
+            ids = [task.id for task in tasks]
+            for task in tasks:
+                for field, value in values.items():
+                    setattr(task, field, value)
+                self._stage(db, "update", task)
+            db.commit()
+
+        except BaseAppException:
+            db.rollback()
+            raise
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error updating tasks: {e}")
+            raise DatabaseError("Failed to update tasks")
+
+        # One query reloads the expired tasks instead of a refresh per task.
+        for task in self.get_multi_by_ids(db, ids):
+            self._notify("update", task)
+        return len(ids)
+
+    def remove_many(self, db: Session, *, ids: List[int]) -> int:
+        """Delete the tasks with these ids (at most `IN_CHUNK_SIZE`), in one transaction. Returns how many."""
+        try:
+            ids = list(db.execute(select(Task.id).where(Task.id.in_(ids)).order_by(Task.id)).scalars())
+            if not ids:
+                return 0
+
+            db.execute(delete(task_tags).where(task_tags.c.task_id.in_(ids)))
+            db.execute(delete(TaskDescription).where(TaskDescription.task_id.in_(ids)))
+            # Rows deleted meanwhile were neither copied nor are they deleted here: report only these.
+            ids = list(db.execute(delete(Task).where(Task.id.in_(ids)).returning(Task.id)).scalars())
+            for id in ids:
+                self._stage(db, "delete", Task(id=id))
+            db.commit()
+
+        except BaseAppException:
+            db.rollback()
+            raise
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error deleting tasks: {e}")
+            raise DatabaseError("Failed to delete tasks")
+
+        for id in ids:
+            self._notify("delete", Task(id=id))
+        return len(ids)
+
+    def iter_rows_by_filters(
+            self,
+            db: Session,
+            *,
+            completed: Optional[bool] = None,
+            priority: Optional[int] = None,
+            q: Optional[str] = None,
+            chunk_size: int = 1000,
+    ) -> Iterator[List[tuple]]:
+        """Stream task rows (`TASK_FIELDS` order) in list order, `chunk_size` rows at a time, without ORM objects."""
+        stmt = (
+            select(*EXPORT_COLUMNS)
+            .outerjoin(Task.description_record)
+            .where(*_filter_conditions(completed, priority, q))
+            .order_by(Task.priority.asc(), Task.created_at.desc(), Task.id.desc())
+            .execution_options(yield_per=chunk_size)
+        )
+        try:
+            for rows in db.execute(stmt).partitions():
+                yield [
+                    (task_id, title, text if text is not None else decode_text(codec, body), *rest)
+                    for task_id, title, text, codec, body, *rest in rows
+                ]
+        except BaseAppException:
+            raise
+        except Exception as e:
+            logger.error(f"Error exporting tasks: {e}")
+            raise DatabaseError("Failed to export tasks")
+
+    def query(self, db: Session, *, spec: TaskQuery) -> Tuple[List[Task], int]:
+        """Run a `TaskQuery`, returning the requested page and the total match count."""
+        conditions = []
+        if spec.ids is not None:
+            conditions.append(Task.id.in_(spec.ids))
+        if spec.priority_in is not None:
+            conditions.append(Task.priority.in_(spec.priority_in))
+        if spec.completed is not None:
+            conditions.append(Task.completed == spec.completed)
+        if spec.due_date_is_null is not None:
+            conditions.append(Task.due_date.is_(None) if spec.due_date_is_null else Task.due_date.is_not(None))
+        for field, column in RANGE_COLUMNS.items():
+            bounds = getattr(spec, field)
+            if bounds is None:
+                continue
+            if bounds.gte is not None:
+                conditions.append(column >= bounds.gte)
+            if bounds.lt is not None:
+                conditions.append(column < bounds.lt)
+        conditions.extend(_filter_conditions(q=spec.q))
+
+        try:
+            stmt = (
+                select(Task)
+                .options(selectinload(Task.description_record))
+                .where(*conditions)
+                .order_by(*QUERY_SORTS[spec.sort])
+                .offset((spec.page - 1) * spec.size)
+                .limit(spec.size)
+            )
+            items = list(db.execute(stmt).scalars().all())
+            total = db.execute(select(func.count(Task.id)).where(*conditions)).scalar()
+            return items, total
+
+        except BaseAppException:
+            raise
+        except Exception as e:
+            logger.error(f"Error running task query: {e}")
+            raise DatabaseError("Failed to query tasks")
+
     def get_summary(self, db: Session) -> TaskSummary:
         try:
-            total_tasks = db.execute(select(func.count(Task.id))).scalar()
-            completed_tasks = db.execute(
-                select(func.count(Task.id)).where(Task.completed == True)
-            ).scalar()
+            tiers = db.execute(task_statements.summary, {"now": datetime.now()}).all()
+            total_tasks, completed_tasks, high_priority_tasks, overdue_tasks = (sum(column) for column in zip(*tiers))
             pending_tasks = total_tasks - completed_tasks
-            high_priority_tasks = db.execute(
-                select(func.count(Task.id)).where(Task.priority == 1)
-            ).scalar()
-
-            now = datetime.now()
-            overdue_tasks = db.execute(
-                select(func.count(Task.id)).where(
-                    and_(
-                        Task.due_date < now,
-                        Task.completed == False
-                    )
-                )
-            ).scalar()
 
             return TaskSummary(
                 total_tasks=total_tasks,
                 completed_tasks=completed_tasks,
                 pending_tasks=pending_tasks,
                 high_priority_tasks=high_priority_tasks,
-                overdue_tasks=overdue_tasks
+                overdue_tasks=overdue_tasks,
+                tag_counts=dict(db.execute(task_statements.tag_counts).all()),
             )
 
+        except BaseAppException:
+            raise
         except Exception as e:
             logger.error(f"Error generating task summary: {e}")
             raise DatabaseError("Failed to generate task summary")
 
+    def get_analytics(self, db: Session, *, interval: str = "day") -> TaskAnalytics:
+        now = datetime.now()
+        key = (interval, now.date().isoformat())
+
+        # NumPy is only imported once analytics are first requested.
+        from app.crud.analytics import TaskColumns, compute_task_analytics
+
+        try:
+            generation = self.analytics_cache.generation
+            # Changes when any worker creates, updates, deletes or archives a task.
+            count, newest, db_now = db.execute(
+                select(func.count(Task.id), func.max(Task.updated_at), func.now())
+            ).one()
+            cached = self.analytics_cache.get(key, (count, newest))
+            if cached is not None:
+                return cached
+            result = compute_task_analytics(TaskColumns.fetch(db), now, interval)
+        except BaseAppException:
+            raise
+        except Exception as e:
+            logger.error(f"Error generating task analytics: {e}")
+            raise DatabaseError("Failed to generate task analytics")
+
+        # A write in the same tick of the database clock (a second on SQLite) as the newest
+        # one would leave the fingerprint unchanged, so such a result is not kept.
+        if newest is None or newest < db_now:
+            self.analytics_cache.put(key, result, generation, (count, newest))
+        return result
+
+
+def _build_read_model() -> Optional["TaskReadModel"]:
+    if not settings.read_model_enabled:
+        return None
+    from app.crud.read_model import TaskReadModel
+
+    return TaskReadModel()
+
+
+def _build_task_crud() -> CRUDTask:
+    if shard_router is not None:
+        from app.crud.sharded import ShardedCRUDTask
+
+        crud = ShardedCRUDTask(Task, router=shard_router)
+    else:
+        crud = CRUDTask(Task, read_model=_build_read_model())
+    if settings.webhook_urls:
+        crud.add_transactional_listener(OutboxWriter(settings.webhook_urls))
+    return crud
+
 
-task = CRUDTask(Task)
\ No newline at end of file
+task: CRUDTask = _build_task_crud()
\ No newline at end of file
@@ -1,20 +1,197 @@
-from sqlalchemy import create_engine
+import ast
+import os
+from typing import TYPE_CHECKING, Optional
+
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.config import settings
+from app.deadline import install_deadline_hooks
+from app.logging_config import get_logger
+from app.metrics import metrics
+
+if TYPE_CHECKING:
+    from app.sharding import ShardRouter
+
+logger = get_logger("database")
+
+
+def make_engine(url: str) -> Engine:
+    target = create_engine(
+        url,
+        connect_args={"check_same_thread": False} if "sqlite" in url else {},
+        echo=settings.debug,
+    )
+    if target.dialect.name == "sqlite":
+        event.listen(target, "connect", _enable_incremental_vacuum)
+    install_deadline_hooks(target)
+    return target
+
+
+def _enable_incremental_vacuum(dbapi_connection, connection_record):
+    # Takes effect for new database files (and existing ones after their next full VACUUM),
+    # letting maintenance return free pages a batch at a time.
+    dbapi_connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
+
+engine = make_engine(settings.database_url)
+
+def _build_shard_router() -> Optional["ShardRouter"]:
+    # With SHARD_COUNT set, tasks live in the shard databases instead of DATABASE_URL.
+    if not settings.shard_count:
+        return None
+    from app.sharding import ShardRouter, shard_urls
+
+    return ShardRouter([make_engine(url) for url in shard_urls(settings.shard_url_template, settings.shard_count)])
+
+
+shard_router = _build_shard_router()
+
+
+def install_statement_cache_metrics(target: Engine) -> None:
+    """Count compiled-cache hits and misses of `target` and expose the hit rate and cache size."""
+
+    @event.listens_for(target, "after_cursor_execute")
+    def _count_cache_hit(conn, cursor, statement, parameters, context, executemany):
+        cache_hit = getattr(context, "cache_hit", None)
+        if cache_hit is CACHE_HIT:
+            metrics.inc("sql.compiled_cache.hits")
+        elif cache_hit is CACHE_MISS:
+            metrics.inc("sql.compiled_cache.misses")
+
+    def hit_rate() -> float:
+        hits = metrics.value("sql.compiled_cache.hits")
+        total = hits + metrics.value("sql.compiled_cache.misses")
+        return round(hits / total, 4) if total else 0.0
+
+    metrics.register_gauge("sql.compiled_cache.hit_rate", hit_rate)
+    metrics.register_gauge("sql.compiled_cache.size", lambda: len(target._compiled_cache or ()))
+
 
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {},
-    echo=settings.debug,
-)
+install_statement_cache_metrics(engine)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def all_engines() -> list[Engine]:
+    """The main database engine followed by every shard's."""
+    return [engine, *(shard_router.engines if shard_router is not None else ())]
+
+
+SessionLocal: sessionmaker
+if shard_router is not None:
+    SessionLocal = shard_router.sessionmaker
+else:
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
 
+ALEMBIC_INI = os.path.join(os.path.dirname(__file__), "..", "alembic.ini")
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), "..", "alembic", "versions")
+
+# Revision whose schema `create_all` built before the project had migrations.
+UNVERSIONED_REVISION = "0001"
+
+
+def is_unversioned(target: Engine) -> bool:
+    """
+    Whether `target` was created by `create_all` before the project had
+    migrations: it has a `tasks` table, no `alembic_version` and none of the
+    tables added by later revisions.
+    """
+    tables = set(inspect(target).get_table_names())
+    return "tasks" in tables and not tables & {"alembic_version", "task_descriptions"}
+
+
+def upgrade_unversioned_database() -> None:
+    """Stamp the main database with `UNVERSIONED_REVISION` and run every later migration."""
+    from alembic import command
+    from alembic.config import Config
+
+    # Without the ini file, so that Alembic leaves the app's logging configuration alone.
+    config = Config()
+    config.set_main_option("script_location", os.path.dirname(MIGRATIONS_DIR))
+    command.stamp(config, UNVERSIONED_REVISION)
+    command.upgrade(config, "head")
+
+
+def stamp(target: Engine, revisions: set[str]) -> None:
+    """Record `revisions` in `alembic_version`, as `alembic stamp` does, for tables built by `create_all`."""
+    with target.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL, "
+            "CONSTRAINT alembic_version_pkc PRIMARY KEY (version_num))"
+        )
+        connection.execute(
+            text("INSERT INTO alembic_version (version_num) VALUES (:revision)"),
+            [{"revision": revision} for revision in revisions],
+        )
+
+
 def create_tables():
+    """
+    `SCHEMA_MODE=create`: create missing tables and stamp new databases with
+    the migration head. A database from before migrations is migrated instead,
+    since `create_all` only adds tables and would move none of its data.
+    """
+    if is_unversioned(engine):
+        logger.warning("Database has no migration history; upgrading it from revision 0001")
+        upgrade_unversioned_database()
+    new = [target for target in all_engines() if not inspect(target).get_table_names()]
     Base.metadata.create_all(bind=engine)
+    if shard_router is not None:
+        shard_router.create_all(Base.metadata)
+    heads = migration_heads()
+    for target in new:
+        stamp(target, heads)
+
+
+def migration_heads() -> set[str]:
+    """
+    Head revisions of the migration scripts.
+
+    Reads the `revision`/`down_revision` assignments with `ast` instead of
+    loading Alembic, which alone costs more than `create_all` on a small schema.
+    """
+    revisions, parents = set(), set()
+    for name in os.listdir(MIGRATIONS_DIR):
+        if not name.endswith(".py"):
+            continue
+        with open(os.path.join(MIGRATIONS_DIR, name)) as f:
+            tree = ast.parse(f.read())
+        values = {}
+        for node in tree.body:
+            if isinstance(node, ast.Assign):
+                target, value = node.targets[0], node.value
+            elif isinstance(node, ast.AnnAssign) and node.value is not None:
+                target, value = node.target, node.value
+            else:
+                continue
+            if isinstance(target, ast.Name) and target.id in ("revision", "down_revision"):
+                values[target.id] = ast.literal_eval(value)
+        revisions.add(values["revision"])
+        down_revision = values.get("down_revision")
+        if isinstance(down_revision, str):
+            parents.add(down_revision)
+        elif down_revision:
+            parents.update(down_revision)
+    return revisions - parents
+
+
+def schema_is_current() -> bool:
+    """Check the Alembic revision of the database (and every shard) against the migration head without issuing DDL."""
+    heads = migration_heads()
+    for target in all_engines():
+        with target.connect() as connection:
+            try:
+                current = {row[0] for row in connection.exec_driver_sql("SELECT version_num FROM alembic_version")}
+            except DBAPIError:
+                return False
+        if current != heads:
+            return False
+    return True
 
 
 def get_db():
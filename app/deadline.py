@@ -0,0 +1,99 @@
+import time
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.exceptions import DeadlineExceededError, RequestCancelledError
+from app.metrics import metrics
+
+# SQLite VM instructions between deadline checks.
+SQLITE_PROGRESS_STEPS = 10000
+
+
+class Deadline:
+    """Time budget of one request, shared with the database layer through `current_deadline`."""
+
+    def __init__(self, seconds: float, route: str = ""):
+        self.seconds = seconds
+        self.route = route
+        self.expires_at = time.monotonic() + seconds
+        self.cancelled = False
+        self._connection: Any = None
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def should_abort(self) -> bool:
+        return self.cancelled or self.expired()
+
+    def cancel(self) -> None:
+        """Mark the request as abandoned and interrupt the statement currently running, if any."""
+        self.cancelled = True
+        connection = self._connection
+        if connection is None:
+            return
+        # sqlite3 exposes interrupt(), psycopg cancel(); both are safe from another thread.
+        interrupt = getattr(connection, "interrupt", None) or getattr(connection, "cancel", None)
+        if interrupt is not None:
+            try:
+                interrupt()
+            except Exception:
+                pass
+
+    def error(self):
+        if self.cancelled:
+            return RequestCancelledError()
+        return DeadlineExceededError(self.seconds, self.route)
+
+
+current_deadline: ContextVar[Optional[Deadline]] = ContextVar("current_deadline", default=None)
+
+
+def install_deadline_hooks(engine: Engine) -> None:
+    """
+    Enforce the active request deadline on every statement run through `engine`.
+
+    SQLite gets a progress handler that aborts the statement (including the
+    row fetches that follow it) once the deadline passes or the client goes
+    away; PostgreSQL gets a per-transaction `statement_timeout` of the
+    remaining budget. The handler stays until the connection returns to the
+    pool. Connections used outside a request deadline run untouched.
+    """
+    dialect = engine.dialect.name
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _apply_deadline(conn, cursor, statement, parameters, context, executemany):
+        deadline = current_deadline.get()
+        if deadline is None:
+            return
+        if dialect == "postgresql":
+            timeout_ms = max(1, int(deadline.remaining() * 1000))
+            cursor.execute(f"SET LOCAL statement_timeout = {timeout_ms}")
+        if conn.info.get("deadline") is deadline:
+            return
+        dbapi_connection = conn.connection.dbapi_connection
+        conn.info["deadline"] = deadline
+        deadline._connection = dbapi_connection
+        if dialect == "sqlite":
+            dbapi_connection.set_progress_handler(deadline.should_abort, SQLITE_PROGRESS_STEPS)
+
+    @event.listens_for(engine, "checkin")
+    def _release_deadline(dbapi_connection, connection_record):
+        deadline = connection_record.info.pop("deadline", None)
+        if deadline is None:
+            return
+        deadline._connection = None
+        if dialect == "sqlite":
+            dbapi_connection.set_progress_handler(None, 0)
+
+    @event.listens_for(engine, "handle_error")
+    def _translate_deadline_error(context):
+        deadline = current_deadline.get()
+        if deadline is not None and deadline.should_abort():
+            metrics.inc("deadline.cancelled" if deadline.cancelled else "deadline.exceeded")
+            raise deadline.error() from context.original_exception
@@ -24,6 +24,15 @@ class TaskNotFoundError(BaseAppException):
         )
 
 
+class JobNotFoundError(BaseAppException):
+    def __init__(self, job_id: int):
+        super().__init__(
+            message=f"Job with id {job_id} not found",
+            status_code=status.HTTP_404_NOT_FOUND,
+            details={"job_id": job_id}
+        )
+
+
 class TaskValidationError(BaseAppException):
     def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
         super().__init__(
@@ -41,6 +50,33 @@ class DatabaseError(BaseAppException):
         )
 
 
+class ServiceOverloadedError(BaseAppException):
+    def __init__(self, route_class: str, retry_after: int):
+        super().__init__(
+            message="Service is overloaded, please retry later",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            details={"route_class": route_class, "retry_after": retry_after}
+        )
+        self.retry_after = retry_after
+
+
+
+class DeadlineExceededError(BaseAppException):
+    def __init__(self, seconds: float, route: str = ""):
+        super().__init__(
+            message="Request deadline exceeded",
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            details={"deadline_seconds": seconds, "route": route}
+        )
+
+
+class RequestCancelledError(BaseAppException):
+    def __init__(self):
+        super().__init__(
+            message="Request cancelled by client disconnect",
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+
 def create_http_exception_from_app_exception(exc: BaseAppException) -> HTTPException:
     return HTTPException(
         status_code=exc.status_code,
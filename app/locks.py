@@ -0,0 +1,56 @@
+import os
+from typing import IO, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+
+from app.logging_config import get_logger
+
+logger = get_logger("locks")
+
+
+class ProcessLock:
+    """
+    Exclusive lock on a file, held by at most one process at a time.
+
+    Used to run a scheduled job in one worker of a multi-worker server: every
+    worker tries `acquire()` each round and only the holder does the work.
+    The operating system releases the lock when its holder exits, so another
+    worker takes over on its next round. Without `fcntl` (Windows) the lock
+    is always granted.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file: Optional[IO[str]] = None
+
+    @property
+    def held(self) -> bool:
+        return self._file is not None
+
+    def acquire(self) -> bool:
+        """Take the lock unless another process holds it. Returns whether this process holds it."""
+        if self._file is not None:
+            return True
+        if fcntl is None:
+            self._file = open(os.devnull, "w")
+            return True
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        file = open(self.path, "a")
+        try:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            file.close()
+            return False
+        self._file = file
+        logger.info(f"Acquired {self.path} (pid {os.getpid()})")
+        return True
+
+    def release(self) -> None:
+        if self._file is not None:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
@@ -1,16 +1,31 @@
+import asyncio
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import time
 
 from app.config import settings
-from app.database import create_tables
+from app.database import create_tables, engine, get_db, schema_is_current, shard_router
 from app.logging_config import setup_logging, get_logger
+from app.memory import memory_profiler
+from app.metrics import metrics
+from app.api.deps import get_task_or_404
 from app.api.v1.api import api_router
 from app.exceptions import BaseAppException, create_http_exception_from_app_exception
+from app.middleware.admission import AdmissionControlMiddleware
+from app.middleware.coalescing import SingleFlightMiddleware
+from app.middleware.deadline import DeadlineMiddleware
 from app.schemas.base import RootResponse
+from app.services.archiver import archiver
+from app.services.backup import backups
+from app.services.health import health_monitor
+from app.services.jobs import jobs
+from app.services.maintenance import maintenance
+from app.tracing import install_tracing, traced_route, tracer
+from app.warmup import warm_up
 
 setup_logging()
 logger = get_logger("main")
@@ -19,10 +34,55 @@ logger = get_logger("main")
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     logger.info("Starting up Saber Task API...")
-    create_tables()
-    logger.info("Database tables created/verified")
+    if settings.schema_mode == "create":
+        create_tables()
+        logger.info("Database tables created/verified")
+    elif settings.schema_mode == "verify":
+        if not schema_is_current():
+            raise RuntimeError("Database schema is not at the Alembic head; run `alembic upgrade head`")
+        logger.info("Database schema is at the Alembic head")
+    if settings.warmup_enabled:
+        await asyncio.to_thread(warm_up)
+    # Health probes only read the cached report: take the first sample before serving.
+    await asyncio.to_thread(health_monitor.sample)
+    if settings.health_monitor_enabled:
+        health_monitor.start()
+    if settings.memory_profiling_enabled:
+        memory_profiler.start()
+    if settings.tracing_enabled:
+        tracer.exporter.start()
+    if settings.archive_enabled:
+        archiver.start()
+    if settings.maintenance_enabled:
+        maintenance.start()
+    if settings.backup_enabled:
+        backups.start()
+    if settings.webhook_urls:
+        # Only deployments with subscribers pay for importing the HTTP client.
+        from app.services.webhooks import webhooks
+
+        webhooks.start()
+    jobs.start()
     yield
     logger.info("Shutting down Saber Task API...")
+    await jobs.stop()
+    if settings.webhook_urls:
+        await webhooks.stop()
+    if settings.backup_enabled:
+        await backups.stop()
+    if settings.maintenance_enabled:
+        await maintenance.stop()
+    if settings.archive_enabled:
+        await archiver.stop()
+    if settings.tracing_enabled:
+        tracer.exporter.shutdown()
+    if settings.health_monitor_enabled:
+        await health_monitor.stop()
+    if settings.memory_profiling_enabled:
+        memory_profiler.stop()
+    engine.dispose()
+    if shard_router is not None:
+        shard_router.dispose()
 
 
 app = FastAPI(
@@ -43,6 +103,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.deadline_enabled:
+    app.add_middleware(DeadlineMiddleware)
+
+if settings.admission_enabled:
+    app.add_middleware(AdmissionControlMiddleware)
+
+if settings.coalescing_enabled:
+    app.add_middleware(SingleFlightMiddleware)
+
 
 @app.exception_handler(BaseAppException)
 async def app_exception_handler(request: Request, exc: BaseAppException):
@@ -61,7 +130,7 @@ async def validation_exception_handler(_: Request, exc: RequestValidationError):
         status_code=422,
         content={
             "message": "Validation error",
-            "details": exc.errors()
+            "details": jsonable_encoder(exc.errors())
         }
     )
 
@@ -81,21 +150,35 @@ async def http_exception_handler(_: Request, exc: HTTPException):
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     start_time = time.time()
+    metrics.inc("http.requests")
 
     logger.info(f"Request: {request.method} {request.url}")
+    traced_at_start = memory_profiler.begin_request()
 
-    response = await call_next(request)
+    try:
+        response = await call_next(request)
+    finally:
+        peak_memory = memory_profiler.end_request(traced_at_start)
 
     process_time = time.time() - start_time
-    logger.info(
-        f"Response: {response.status_code} - {process_time:.4f}s",
-        extra={"duration": process_time, "status_code": response.status_code}
-    )
+    extra = {"duration": process_time, "status_code": response.status_code}
+    message = f"Response: {response.status_code} - {process_time:.4f}s"
+    if peak_memory is not None:
+        extra["peak_memory_bytes"] = peak_memory
+        message += f" - peak {peak_memory / 1024:.1f} KiB"
+    logger.info(message, extra=extra)
 
     return response
 
 
-app.include_router(api_router, prefix=settings.api_v1_str)
+app.include_router(
+    api_router,
+    prefix=settings.api_v1_str,
+    dependencies=[Depends(traced_route(tracer))] if settings.tracing_enabled else [],
+)
+
+if settings.tracing_enabled:
+    install_tracing(app, engine, dependencies=[get_db, get_task_or_404])
 
 
 @app.get("/", response_model=RootResponse, tags=["Root"])
@@ -0,0 +1,156 @@
+import gc
+import os
+import threading
+import tracemalloc
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.logging_config import get_logger
+from app.metrics import metrics
+from app.models.task import ArchivedTask, Task
+from app.schemas.task import TaskOut
+
+logger = get_logger("memory")
+
+# Live instances of these are counted by `object_counts`.
+COUNTED_TYPES: Dict[str, type] = {
+    "Task": Task,
+    "ArchivedTask": ArchivedTask,
+    "TaskOut": TaskOut,
+    "Session": Session,
+}
+
+# Allocations made by tracemalloc itself and by imports are noise in a diff.
+SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def rss_bytes() -> Optional[int]:
+    """Resident set size of this process, where /proc is available."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def object_counts() -> Dict[str, int]:
+    """Live instances of `COUNTED_TYPES`, plus the objects held by the identity maps of live sessions."""
+    counts = dict.fromkeys(COUNTED_TYPES, 0)
+    counts["identity_map_objects"] = 0
+    types = tuple(COUNTED_TYPES.items())
+    for obj in gc.get_objects():
+        for name, cls in types:
+            if isinstance(obj, cls):
+                counts[name] += 1
+                if isinstance(obj, Session):
+                    counts["identity_map_objects"] += len(obj.identity_map)
+                break
+    return counts
+
+
+class MemoryProfiler:
+    """
+    Opt-in allocation tracing with tracemalloc.
+
+    `mark` stores a baseline snapshot and `top_sites` reports the allocation
+    sites that grew most since it (or the largest ones without a baseline),
+    grouped by the innermost `frames` frames. `begin_request`/`end_request`
+    measure the peak traced memory of a request above what was traced when it
+    started. The peak is process wide, so it is only reported for requests
+    that had the process to themselves from start to finish.
+    """
+
+    def __init__(self, frames: int = 1):
+        self.frames = frames
+        self.baseline: Optional[tracemalloc.Snapshot] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        # Set once two requests overlap; cleared by the next request to start alone.
+        self._overlapped = False
+
+    @classmethod
+    def from_settings(cls) -> "MemoryProfiler":
+        return cls(frames=settings.memory_trace_frames)
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self) -> None:
+        if not self.tracing:
+            tracemalloc.start(self.frames)
+            logger.info(f"Memory profiling started: {self.frames} frames per allocation")
+
+    def stop(self) -> None:
+        if self.tracing:
+            tracemalloc.stop()
+        self.baseline = None
+
+    def traced_memory(self) -> Tuple[int, int]:
+        """Bytes traced now and at the peak since the last reset."""
+        return tracemalloc.get_traced_memory()
+
+    def snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+
+    def mark(self) -> int:
+        """Store the current allocations as the baseline of `top_sites`. Returns the bytes traced."""
+        self.baseline = self.snapshot()
+        return sum(trace.size for trace in self.baseline.traces)
+
+    def top_sites(self, limit: int = 20, group_by: str = "lineno") -> List[Dict[str, Any]]:
+        current = self.snapshot()
+        stats: Sequence[Union[tracemalloc.Statistic, tracemalloc.StatisticDiff]]
+        if self.baseline is not None:
+            stats = current.compare_to(self.baseline, group_by)
+        else:
+            stats = current.statistics(group_by)
+        sites = []
+        for stat in stats[:limit]:
+            frame = stat.traceback[0]
+            sites.append({
+                "site": f"{frame.filename}:{frame.lineno}",
+                "size_bytes": stat.size,
+                "size_diff_bytes": getattr(stat, "size_diff", stat.size),
+                "count": stat.count,
+                "count_diff": getattr(stat, "count_diff", stat.count),
+            })
+        return sites
+
+    def begin_request(self) -> Optional[int]:
+        """Start measuring a request. Returns the bytes traced now, or None when not tracing."""
+        if not self.tracing:
+            return None
+        with self._lock:
+            self._in_flight += 1
+            if self._in_flight == 1:
+                self._overlapped = False
+                tracemalloc.reset_peak()
+            else:
+                self._overlapped = True
+            return tracemalloc.get_traced_memory()[0]
+
+    def end_request(self, traced_at_start: Optional[int]) -> Optional[int]:
+        """
+        Finish measuring a request. Returns its peak allocation in bytes, or
+        None when it overlapped another request and the peak is not its own.
+        """
+        if traced_at_start is None:
+            return None
+        with self._lock:
+            self._in_flight -= 1
+            if not self.tracing or self._overlapped:
+                return None
+            return max(0, tracemalloc.get_traced_memory()[1] - traced_at_start)
+
+
+memory_profiler = MemoryProfiler.from_settings()
+metrics.register_gauge("memory.traced_bytes", lambda: memory_profiler.traced_memory()[0])
+metrics.register_gauge("memory.rss_bytes", rss_bytes)
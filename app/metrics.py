@@ -0,0 +1,37 @@
+import threading
+from collections import defaultdict
+from typing import Any, Callable, Dict
+
+
+class MetricsRegistry:
+    """Process-local counters and gauges exposed through the admin API."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._gauges: Dict[str, Callable[[], Any]] = {}
+
+    def inc(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self._counters[name] += value
+
+    def value(self, name: str) -> float:
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def register_gauge(self, name: str, fn: Callable[[], Any]) -> None:
+        self._gauges[name] = fn
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            data: Dict[str, Any] = dict(self._counters)
+        for name, fn in self._gauges.items():
+            data[name] = fn()
+        return data
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+
+
+metrics = MetricsRegistry()
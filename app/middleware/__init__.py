@@ -0,0 +1,5 @@
+from .admission import AdmissionControlMiddleware, admission_controller
+from .coalescing import SingleFlightMiddleware
+from .deadline import DeadlineMiddleware
+
+__all__ = ["AdmissionControlMiddleware", "DeadlineMiddleware", "SingleFlightMiddleware", "admission_controller"]
\ No newline at end of file
@@ -0,0 +1,231 @@
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+from urllib.parse import parse_qs
+
+from fastapi.responses import JSONResponse
+
+from app.config import settings
+from app.exceptions import ServiceOverloadedError, create_http_exception_from_app_exception
+from app.logging_config import get_logger
+from app.metrics import metrics
+
+logger = get_logger("middleware.admission")
+
+CHEAP = "cheap"
+EXPENSIVE = "expensive"
+DEFAULT = "default"
+
+# Summary-style routes under /tasks that always scan the table.
+EXPENSIVE_TASK_ROUTES = {"summary", "analytics", "export"}
+
+
+def classify_request(method: str, path: str, query_string: bytes) -> Optional[str]:
+    """
+    Map a request to its route class.
+
+    Returns None for routes that bypass admission control entirely (health
+    probes, the root endpoint and the admin API, which requires `admin_token`),
+    so they are never starved by application traffic.
+    """
+    prefix = settings.api_v1_str
+    if path == "/" or path.startswith(f"{prefix}/health") or path.startswith(f"{prefix}/admin"):
+        return None
+
+    tasks_prefix = f"{prefix}/tasks"
+    if method == "GET" and path.startswith(tasks_prefix):
+        remainder = path[len(tasks_prefix):].strip("/")
+        if remainder in EXPENSIVE_TASK_ROUTES:
+            return EXPENSIVE
+        if remainder == "":
+            query = parse_qs(query_string.decode("latin-1"))
+            searched = query.get("q", [""])[0]
+            archived = query.get("include_archived", [""])[0].lower() in ("true", "1")
+            return EXPENSIVE if searched or archived else CHEAP
+        return CHEAP
+
+    if method == "POST" and path.rstrip("/") == f"{tasks_prefix}/query":
+        return EXPENSIVE
+    if method == "POST" and path.rstrip("/") == f"{tasks_prefix}/batch":
+        return CHEAP
+
+    return DEFAULT
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limiter with a bounded FIFO wait queue and an AIMD limit.
+
+    Each completion faster than the target latency grows the limit by roughly
+    one slot per window of `limit` completions; a completion slower than the
+    target shrinks it multiplicatively, at most once per target interval so a
+    burst of slow responses does not collapse the limit to its floor.
+    """
+
+    def __init__(
+            self,
+            name: str,
+            *,
+            limit: int,
+            max_limit: int,
+            queue_size: int,
+            target_latency: float,
+            queue_timeout: float,
+            min_limit: int = 1,
+            backoff: float = 0.9,
+    ):
+        self.name = name
+        self.limit = float(limit)
+        self.min_limit = min_limit
+        self.max_limit = max(max_limit, limit)
+        self.queue_size = queue_size
+        self.target_latency = target_latency
+        self.queue_timeout = queue_timeout
+        self.backoff = backoff
+
+        self.in_flight = 0
+        self.latency_ewma = 0.0
+        self._last_decrease = 0.0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def current_limit(self) -> int:
+        return max(self.min_limit, int(self.limit))
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        """Estimate seconds until the current queue drains."""
+        per_request = self.latency_ewma or self.target_latency
+        return max(1, math.ceil((self.queued + 1) * per_request / self.current_limit))
+
+    async def acquire(self) -> None:
+        if self.in_flight < self.current_limit and not self._waiters:
+            self.in_flight += 1
+            return
+
+        if len(self._waiters) >= self.queue_size:
+            metrics.inc(f"admission.{self.name}.rejected_queue_full")
+            raise ServiceOverloadedError(self.name, self.retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            metrics.inc(f"admission.{self.name}.rejected_timeout")
+            raise ServiceOverloadedError(self.name, self.retry_after())
+        except asyncio.CancelledError:
+            # The slot may have been handed over just before cancellation.
+            if waiter.done() and not waiter.cancelled():
+                self.release(None)
+            raise
+        finally:
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                pass
+
+    def release(self, latency: Optional[float]) -> None:
+        self.in_flight -= 1
+        if latency is not None:
+            self._observe(latency)
+        self._wake_waiters()
+
+    def _observe(self, latency: float) -> None:
+        self.latency_ewma = latency if not self.latency_ewma else 0.8 * self.latency_ewma + 0.2 * latency
+        if latency > self.target_latency:
+            now = time.monotonic()
+            if now - self._last_decrease >= self.target_latency:
+                self.limit = max(float(self.min_limit), self.limit * self.backoff)
+                self._last_decrease = now
+                metrics.inc(f"admission.{self.name}.limit_decreased")
+        else:
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self.in_flight < self.current_limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "limit": self.current_limit,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "latency_ewma_ms": round(self.latency_ewma * 1000, 3),
+        }
+
+
+class AdmissionController:
+    def __init__(self, limiters: Dict[str, AdaptiveLimiter]):
+        self.limiters = limiters
+
+    @classmethod
+    def from_settings(cls) -> "AdmissionController":
+        limiters = {}
+        for name in (CHEAP, EXPENSIVE, DEFAULT):
+            limit = settings.admission_limits.get(name, settings.admission_limits[DEFAULT])
+            limiters[name] = AdaptiveLimiter(
+                name,
+                limit=limit,
+                max_limit=settings.admission_max_limits.get(name, limit),
+                queue_size=settings.admission_queue_sizes.get(name, limit),
+                target_latency=settings.admission_target_latency_ms.get(name, 200.0) / 1000,
+                queue_timeout=settings.admission_queue_timeout_seconds,
+            )
+        return cls(limiters)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {name: limiter.stats() for name, limiter in self.limiters.items()}
+
+
+admission_controller = AdmissionController.from_settings()
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware that sheds load before it reaches the threadpool and the
+    database pool, replying 503 with a Retry-After header once the wait queue
+    of a route class is full or a queued request has waited too long.
+    """
+
+    def __init__(self, app, controller: AdmissionController = admission_controller):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route_class = classify_request(scope["method"], scope["path"], scope.get("query_string", b""))
+        limiter = self.controller.limiters.get(route_class) if route_class else None
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await limiter.acquire()
+        except ServiceOverloadedError as exc:
+            logger.warning(f"Rejecting {scope['method']} {scope['path']}: {route_class} queue saturated")
+            http_exc = create_http_exception_from_app_exception(exc)
+            response = JSONResponse(
+                status_code=http_exc.status_code,
+                content=http_exc.detail,
+                headers={"Retry-After": str(exc.retry_after)}
+            )
+            await response(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release(time.perf_counter() - start_time)
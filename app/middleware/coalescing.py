@@ -0,0 +1,82 @@
+import asyncio
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from app.config import settings
+from app.logging_config import get_logger
+from app.metrics import metrics
+from app.middleware.deadline import CANCELLED_SCOPE_KEY
+
+logger = get_logger("middleware.coalescing")
+
+# Request headers that change the rendered response and so must be part of the key.
+VARY_HEADERS = (b"accept", b"origin")
+
+
+def coalesced_paths() -> FrozenSet[str]:
+    prefix = settings.api_v1_str
+    return frozenset({f"{prefix}/tasks/", f"{prefix}/tasks/summary", f"{prefix}/tasks/analytics"})
+
+
+def request_key(scope) -> Tuple:
+    query = tuple(sorted(parse_qsl(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True)))
+    headers = dict(scope.get("headers") or [])
+    return (scope["path"], query) + tuple(headers.get(name, b"") for name in VARY_HEADERS)
+
+
+class _Flight:
+    def __init__(self):
+        self.done = asyncio.Event()
+        self.messages: Optional[List[dict]] = None
+
+
+class SingleFlightMiddleware:
+    """
+    ASGI middleware that deduplicates identical concurrent GET requests.
+
+    The first request for a key runs normally while its response messages are
+    recorded; requests with the same key arriving before it finishes wait and
+    replay that exact response. The entry is dropped as soon as the leader
+    completes, so nothing is served beyond the in-flight window. If the leader
+    fails without producing a response, waiters run the request themselves.
+    """
+
+    def __init__(self, app, paths: Optional[FrozenSet[str]] = None):
+        self.app = app
+        self.paths = paths if paths is not None else coalesced_paths()
+        self._flights: Dict[Tuple, _Flight] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        key = request_key(scope)
+        flight = self._flights.get(key)
+        if flight is not None:
+            await flight.done.wait()
+            if flight.messages is not None:
+                metrics.inc("coalescing.followers")
+                for message in flight.messages:
+                    await send(message)
+                return
+            await self.app(scope, receive, send)
+            return
+
+        flight = _Flight()
+        self._flights[key] = flight
+        metrics.inc("coalescing.leaders")
+        messages: List[dict] = []
+
+        async def capture(message):
+            messages.append(message)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, capture)
+            # A response aborted by the leader's own disconnect is not shared.
+            if not scope.get(CANCELLED_SCOPE_KEY):
+                flight.messages = messages
+        finally:
+            del self._flights[key]
+            flight.done.set()
@@ -0,0 +1,97 @@
+import asyncio
+from typing import Optional
+
+from app.config import settings
+from app.deadline import Deadline, current_deadline
+from app.logging_config import get_logger
+from app.metrics import metrics
+from app.middleware.admission import classify_request
+
+logger = get_logger("middleware.deadline")
+
+# Set on the ASGI scope once the client has gone away, so outer middleware
+# (request coalescing) never shares the aborted response.
+CANCELLED_SCOPE_KEY = "app.request_cancelled"
+
+
+def deadline_for(method: str, path: str, query_string: bytes) -> Optional[float]:
+    """
+    Resolve the deadline of a request in seconds, or None for no deadline.
+
+    A per-route override (`deadline_route_overrides`, keyed by method and the
+    path below the API prefix) wins over the route class budget; routes that
+    bypass admission control (health, admin, root) get no deadline.
+    """
+    prefix = settings.api_v1_str
+    if path.startswith(prefix):
+        override = settings.deadline_route_overrides.get(f"{method} {path[len(prefix):].rstrip('/')}")
+        if override is not None:
+            return override if override > 0 else None
+
+    route_class = classify_request(method, path, query_string)
+    if route_class is None:
+        return None
+    seconds = settings.deadline_seconds.get(route_class)
+    return seconds if seconds and seconds > 0 else None
+
+
+class DeadlineMiddleware:
+    """
+    ASGI middleware that gives each request a time budget for its database work.
+
+    The deadline is published through `current_deadline`, where the engine
+    hooks in `app.deadline` pick it up. The client connection is watched while
+    the request runs: on disconnect before the response is complete the running
+    statement is interrupted so it stops holding a pool connection (and, on
+    SQLite, the database lock).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        seconds = deadline_for(scope["method"], scope["path"], scope.get("query_string", b""))
+        if seconds is None:
+            await self.app(scope, receive, send)
+            return
+
+        deadline = Deadline(seconds, f"{scope['method']} {scope['path']}")
+        messages: asyncio.Queue = asyncio.Queue()
+        finished = False
+        responded = False
+
+        async def send_response(message):
+            nonlocal responded
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                # From here on a disconnect is the client closing a complete response, not an abort.
+                responded = True
+            await send(message)
+
+        async def watch_client():
+            try:
+                while True:
+                    message = await receive()
+                    await messages.put(message)
+                    if message["type"] == "http.disconnect":
+                        break
+            except Exception:
+                await messages.put({"type": "http.disconnect"})
+                return
+            if not finished and not responded:
+                logger.info(f"Client disconnected, cancelling {deadline.route}")
+                metrics.inc("deadline.disconnects")
+                scope[CANCELLED_SCOPE_KEY] = True
+                deadline.cancel()
+
+        watcher = asyncio.create_task(watch_client())
+        token = current_deadline.set(deadline)
+        try:
+            await self.app(scope, messages.get, send_response)
+        finally:
+            finished = True
+            current_deadline.reset(token)
+            watcher.cancel()
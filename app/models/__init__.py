@@ -1,3 +1,5 @@
-from .task import Task
+from .job import Job
+from .outbox import OutboxEvent
+from .task import ArchivedTask, Tag, Task, TaskDescription, task_tags
 
-__all__ = ["Task"]
\ No newline at end of file
+__all__ = ["ArchivedTask", "Job", "OutboxEvent", "Tag", "Task", "TaskDescription", "task_tags"]
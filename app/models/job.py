@@ -0,0 +1,34 @@
+from sqlalchemy import Boolean, Column, DateTime, Float, Index, Integer, String, Text
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class Job(Base):
+    """
+    A bulk operation on the tasks matching a filter, run in the background by
+    `app.services.jobs`. Jobs live in the main database, also under sharding.
+    `cursor` is the last task id processed: a job resumes after it.
+    """
+    __tablename__ = "jobs"
+    __table_args__ = (Index("ix_jobs_status", "status", "id"),)
+
+    id = Column(Integer, primary_key=True)
+    operation = Column(String(16), nullable=False)
+    filters = Column(Text, nullable=False)
+    priority = Column(Integer, nullable=True)
+    status = Column(String(16), nullable=False, default="queued")
+    chunk_size = Column(Integer, nullable=False)
+    max_rows_per_second = Column(Float, nullable=False)
+    total = Column(Integer, nullable=True)
+    processed = Column(Integer, nullable=False, default=0)
+    cursor = Column(Integer, nullable=False, default=0)
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+    error = Column(String(500), nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<Job(id={self.id}, operation='{self.operation}', status='{self.status}')>"
@@ -0,0 +1,34 @@
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, String, Text
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class OutboxEvent(Base):
+    """
+    A task change waiting to be delivered to one webhook subscriber.
+
+    Rows are written in the transaction of the change itself (see
+    `app.crud.outbox`), so an event exists exactly when its change was
+    committed. The dispatcher (`app.services.webhooks`) deletes a row once
+    delivered; after `WEBHOOK_MAX_ATTEMPTS` failures it is dead-lettered.
+    """
+    __tablename__ = "outbox"
+    __table_args__ = (Index("ix_outbox_due", "dead", "next_attempt_at"),)
+    # Under sharding an event lives on the shard of its task, in the same transaction.
+    shard_key = "task_id"
+
+    id = Column(Integer, primary_key=True)
+    event_id = Column(String(32), nullable=False)
+    subscriber = Column(String(2048), nullable=False)
+    event = Column(String(16), nullable=False)
+    task_id = Column(Integer, nullable=False)
+    payload = Column(Text, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime, nullable=False)
+    dead = Column(Boolean, nullable=False, default=False)
+    last_error = Column(String(500), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<OutboxEvent(id={self.id}, event='{self.event}', task_id={self.task_id})>"
@@ -1,17 +1,67 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime
+from typing import List, Optional
+
+from sqlalchemy import Column, ForeignKey, Index, Integer, LargeBinary, String, Text, Boolean, DateTime, Table
+from sqlalchemy.orm import Mapped, foreign, mapped_column, relationship
 from sqlalchemy.sql import func
+from app.compression import PLAIN, ZLIB, decode_text, encode_text
+from app.config import settings
 from app.database import Base
 
 
+class TaskDescription(Base):
+    """
+    Long task description stored compressed (see `app.compression`) out of
+    `tasks`, so scans over the task columns read dense pages. Only written with
+    `description_storage = "split"`; other descriptions stay in `tasks.description`.
+    """
+    __tablename__ = "task_descriptions"
+
+    task_id: Mapped[int] = mapped_column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
+    codec: Mapped[str] = mapped_column(String(8), nullable=False)
+    body: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+    @property
+    def text(self) -> Optional[str]:
+        return decode_text(self.codec, self.body)
+
+
+class Tag(Base):
+    __tablename__ = "tags"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50), nullable=False, unique=True)
+
+    def __repr__(self) -> str:
+        return f"<Tag(id={self.id}, name='{self.name}')>"
+
+
+# Keyed by task id without a foreign key to `tasks`: archived tasks keep their
+# tags (ids are never reused). The primary key serves task -> tags lookups,
+# `ix_task_tags_tag_id` the tag filters and per-tag counts.
+task_tags = Table(
+    "task_tags",
+    Base.metadata,
+    Column("task_id", Integer, primary_key=True),
+    Column("tag_id", Integer, ForeignKey("tags.id"), primary_key=True),
+    Index("ix_task_tags_tag_id", "tag_id", "task_id"),
+)
+
+
 class Task(Base):
     __tablename__ = "tasks"
+    # Never reuse ids: archived tasks keep theirs in `tasks_archive`.
+    __table_args__ = {"sqlite_autoincrement": True}
+    # Fetch the server-set timestamps with RETURNING on flush, so change
+    # listeners serialising flushed tasks don't reload each one.
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False, index=True)
-    description = Column(Text, nullable=True)
     priority = Column(Integer, nullable=False, index=True)  # 1=High, 2=Medium, 3=Low
     due_date = Column(DateTime, nullable=True, index=True)
     completed = Column(Boolean, nullable=False, default=False, index=True)
+    # Plain descriptions, matched by searches; compressed ones are in `description_record`.
+    description_text: Mapped[Optional[str]] = mapped_column("description", Text, nullable=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(
@@ -21,5 +71,101 @@ class Task(Base):
         nullable=False
     )
 
+    # Loaded on first access of a compressed `description`; list queries batch it with selectinload.
+    description_record: Mapped[Optional[TaskDescription]] = relationship(
+        TaskDescription, uselist=False, lazy="select", cascade="all, delete-orphan"
+    )
+
+    # Loaded on first access of `tags`; list queries batch it with selectinload.
+    # Read-only: `CRUDTask` writes `task_tags` rows itself, on the task's shard.
+    tag_records = relationship(
+        Tag,
+        secondary=task_tags,
+        primaryjoin=lambda: Task.id == foreign(task_tags.c.task_id),
+        secondaryjoin=lambda: Tag.id == foreign(task_tags.c.tag_id),
+        order_by=Tag.name,
+        lazy="select",
+        viewonly=True,
+    )
+
+    @property
+    def description(self) -> Optional[str]:
+        if self.description_text is not None:
+            return self.description_text
+        record = self.description_record
+        return record.text if record is not None else None
+
+    @description.setter
+    def description(self, value: Optional[str]) -> None:
+        if value == self.description:
+            return
+        codec, body = PLAIN, b""
+        if value is not None and settings.description_storage == "split":
+            codec, body = encode_text(value, ZLIB, settings.description_compression_min_bytes)
+        if codec == ZLIB:
+            self.description_text = None
+            if self.description_record is None:
+                self.description_record = TaskDescription(codec=codec, body=body)
+            else:
+                self.description_record.codec = codec
+                self.description_record.body = body
+            # The compressed description lives in its own table; still count it as a change to the task.
+            if self.id is not None:
+                self.updated_at = func.now()  # type: ignore[assignment]
+        else:
+            # At most one of the two holds the description, so a plain one never has a record to drop.
+            if self.description_text is None and self.description_record is not None:
+                self.description_record = None
+            self.description_text = value
+
+    @property
+    def tags(self) -> List[str]:
+        return [tag.name for tag in self.tag_records]
+
+    def __repr__(self) -> str:
+        return f"<Task(id={self.id}, title='{self.title}', completed={self.completed})>"
+
+
+class ArchivedTask(Base):
+    """
+    Cold tier: completed tasks moved out of `tasks` by the archiver
+    (`app.services.archiver`). Rows keep their task id; a compressed
+    description is kept inline in its encoded form since archived tasks are
+    rarely read.
+    """
+    __tablename__ = "tasks_archive"
+
+    id = Column(Integer, primary_key=True)
+    title = Column(String(255), nullable=False)
+    description_text: Mapped[Optional[str]] = mapped_column("description", Text, nullable=True)
+    description_codec: Mapped[Optional[str]] = mapped_column(String(8), nullable=True)
+    description_body: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
+    priority = Column(Integer, nullable=False)
+    due_date = Column(DateTime, nullable=True)
+    completed = Column(Boolean, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+    archived_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    tag_records = relationship(
+        Tag,
+        secondary=task_tags,
+        primaryjoin=lambda: ArchivedTask.id == foreign(task_tags.c.task_id),
+        secondaryjoin=lambda: Tag.id == foreign(task_tags.c.tag_id),
+        order_by=Tag.name,
+        lazy="select",
+        viewonly=True,
+    )
+
+    @property
+    def description(self) -> Optional[str]:
+        if self.description_text is not None:
+            return self.description_text
+        return decode_text(self.description_codec, self.description_body)
+
+    @property
+    def tags(self) -> List[str]:
+        return [tag.name for tag in self.tag_records]
+
     def __repr__(self) -> str:
-        return f"<Task(id={self.id}, title='{self.title}', completed={self.completed})>"
\ No newline at end of file
+        return f"<ArchivedTask(id={self.id}, title='{self.title}')>"
\ No newline at end of file
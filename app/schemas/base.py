@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, ConfigDict
 
 
@@ -18,27 +18,49 @@ class PaginatedResponse(BaseModel):
     page: int
     size: int
     pages: int
+    facets: Optional[Dict[str, Dict[str, int]]] = None
 
     @classmethod
-    def create(cls, items: list, total: int, page: int, size: int):
+    def create(
+            cls,
+            items: list,
+            total: int,
+            page: int,
+            size: int,
+            facets: Optional[Dict[str, Dict[str, int]]] = None,
+    ):
         pages = (total + size - 1) // size
         return cls(
             items=items,
             total=total,
             page=page,
             size=size,
-            pages=pages
+            pages=pages,
+            facets=facets
         )
 
 
+class DatabaseHealth(BaseModel):
+    latency_ms: Optional[float] = None
+    pool_in_use: Optional[int] = None
+    pool_saturation: Optional[float] = None
+    disk_free_bytes: Optional[int] = None
+    error: Optional[str] = None
+
+
 class HealthResponse(BaseModel):
     status: str
     timestamp: datetime
     version: str
     uptime_seconds: Optional[float] = None
+    checked_at: Optional[datetime] = None
+    databases: Dict[str, DatabaseHealth] = {}
+    loop_lag_ms: Optional[float] = None
+    problems: List[str] = []
 
 class ReadinessCheckResponse(BaseModel):
     status: str
+    problems: List[str] = []
 
 class RootResponse(BaseModel):
     name: str
@@ -46,4 +68,58 @@ class RootResponse(BaseModel):
     status: str
     docs_url: str
     redoc_url: str
-    api_prefix: str
\ No newline at end of file
+    api_prefix: str
+
+class MetricsResponse(BaseModel):
+    metrics: Dict[str, Any]
+    admission: Dict[str, Dict[str, float]]
+
+
+class ArchiveRunResponse(BaseModel):
+    moved: int
+    after_days: int
+
+class MaintenanceRunResponse(BaseModel):
+    operations: List[str]
+    duration_seconds: float
+
+
+class BackupResponse(BaseModel):
+    name: str
+    size_bytes: int
+    duration_seconds: float
+
+
+class BackupListResponse(BaseModel):
+    backups: List[str]
+
+
+class OutboxStatsResponse(BaseModel):
+    pending: int
+    dead_lettered: int
+
+
+class OutboxRedeliverResponse(BaseModel):
+    redelivered: int
+
+
+class AllocationSite(BaseModel):
+    site: str
+    size_bytes: int
+    size_diff_bytes: int
+    count: int
+    count_diff: int
+
+
+class MemoryResponse(BaseModel):
+    tracing: bool
+    rss_bytes: Optional[int] = None
+    traced_bytes: Optional[int] = None
+    peak_bytes: Optional[int] = None
+    objects: Dict[str, int]
+    since_snapshot: bool = False
+    top_sites: List[AllocationSite] = []
+
+
+class MemorySnapshotResponse(BaseModel):
+    traced_bytes: int
@@ -0,0 +1,59 @@
+from datetime import datetime
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from app.crud.base import IN_CHUNK_SIZE
+from app.schemas.task import TaskBase
+
+JobOperation = Literal["complete", "reopen", "set_priority", "delete"]
+
+JobStatus = Literal["queued", "running", "succeeded", "failed", "cancelled"]
+
+
+class JobFilters(BaseModel):
+    """The tasks a job applies to, as in `GET /tasks/`. Archived tasks are never touched."""
+    completed: Optional[bool] = None
+    priority: Optional[int] = Field(default=None, ge=1, le=3, description="1=High, 2=Medium, 3=Low")
+    q: Optional[str] = Field(default=None, min_length=1, max_length=255, description="Search in title and description")
+    tags: Optional[List[str]] = Field(default=None, max_length=20, description="Tasks with any (or all) of these tags")
+    tag_match: Literal["any", "all"] = "any"
+
+    @field_validator("tags")
+    @classmethod
+    def validate_tags(cls, v: Optional[List[str]]) -> Optional[List[str]]:
+        return TaskBase.validate_tags(v)
+
+
+class JobCreate(BaseModel):
+    operation: JobOperation = Field(..., description="complete, reopen, set_priority or delete")
+    filters: JobFilters = Field(default_factory=JobFilters)
+    priority: Optional[int] = Field(None, ge=1, le=3, description="New priority, for set_priority")
+    chunk_size: Optional[int] = Field(
+        None, ge=1, le=IN_CHUNK_SIZE, description="Tasks changed per transaction (default JOB_CHUNK_SIZE)"
+    )
+    max_rows_per_second: Optional[float] = Field(
+        None, ge=0, description="Throttle; 0 runs unthrottled (default JOB_MAX_ROWS_PER_SECOND)"
+    )
+
+    @model_validator(mode="after")
+    def validate_priority(self) -> "JobCreate":
+        if (self.operation == "set_priority") != (self.priority is not None):
+            raise ValueError("'priority' is required for set_priority and only allowed there")
+        return self
+
+
+class JobOut(BaseModel):
+    id: int
+    operation: JobOperation
+    filters: JobFilters
+    priority: Optional[int] = None
+    status: JobStatus
+    chunk_size: int
+    max_rows_per_second: float
+    total: Optional[int] = Field(None, description="Matching tasks when the job started")
+    processed: int
+    cancel_requested: bool
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -0,0 +1,74 @@
+from datetime import datetime, timezone
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from app.config import settings
+
+TaskSort = Literal[
+    "priority",
+    "due_date",
+    "-due_date",
+    "created_at",
+    "-created_at",
+]
+
+
+class DateRange(BaseModel):
+    gte: Optional[datetime] = Field(None, description="Inclusive lower bound")
+    lt: Optional[datetime] = Field(None, description="Exclusive upper bound")
+
+    @field_validator("gte", "lt")
+    @classmethod
+    def to_naive_utc(cls, v: Optional[datetime]) -> Optional[datetime]:
+        # Task timestamps are stored naive (UTC); aware bounds are converted so both compare.
+        if v is not None and v.tzinfo is not None:
+            v = v.astimezone(timezone.utc).replace(tzinfo=None)
+        return v
+
+    @model_validator(mode="after")
+    def validate_bounds(self) -> "DateRange":
+        if self.gte is None and self.lt is None:
+            raise ValueError("A range needs at least one of 'gte' or 'lt'")
+        if self.gte is not None and self.lt is not None and self.gte >= self.lt:
+            raise ValueError("'gte' must be before 'lt'")
+        return self
+
+
+class TaskQuery(BaseModel):
+    ids: Optional[List[int]] = Field(None, min_length=1, description="Only tasks with these IDs")
+    priority_in: Optional[List[int]] = Field(None, min_length=1, max_length=3, description="Allowed priorities")
+    completed: Optional[bool] = None
+    q: Optional[str] = Field(None, min_length=1, max_length=255, description="Search in title and description")
+    due_date: Optional[DateRange] = None
+    due_date_is_null: Optional[bool] = Field(None, description="Only tasks with (true) or without (false) a due date")
+    created_at: Optional[DateRange] = None
+    updated_at: Optional[DateRange] = None
+    sort: TaskSort = Field("priority", description="'priority' orders by priority then newest first")
+    page: int = Field(1, ge=1)
+    size: int = Field(settings.default_page_size, ge=1, le=settings.max_page_size)
+
+    @field_validator("ids")
+    @classmethod
+    def validate_ids(cls, v: Optional[List[int]]) -> Optional[List[int]]:
+        if v is not None and len(v) > settings.query_max_in_items:
+            raise ValueError(f"At most {settings.query_max_in_items} ids are allowed")
+        return v
+
+    @field_validator("priority_in")
+    @classmethod
+    def validate_priority_in(cls, v: Optional[List[int]]) -> Optional[List[int]]:
+        if v is not None and any(p not in (1, 2, 3) for p in v):
+            raise ValueError("Priorities must be 1 (High), 2 (Medium), or 3 (Low)")
+        return v
+
+    @model_validator(mode="after")
+    def validate_due_date_filters(self) -> "TaskQuery":
+        if self.due_date is not None and self.due_date_is_null:
+            raise ValueError("'due_date' range cannot be combined with 'due_date_is_null: true'")
+        return self
+
+    @model_validator(mode="after")
+    def validate_offset(self) -> "TaskQuery":
+        if (self.page - 1) * self.size > settings.query_max_offset:
+            raise ValueError(f"Cannot page past the first {settings.query_max_offset} results")
+        return self
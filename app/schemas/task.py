@@ -1,5 +1,5 @@
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field, field_validator
 from app.schemas.base import BaseResponse, TimestampMixin
 
@@ -9,6 +9,7 @@ class TaskBase(BaseModel):
     description: Optional[str] = Field(None, max_length=2000)
     priority: Optional[int] = Field(None, ge=1, le=3, description="1=High, 2=Medium, 3=Low")
     due_date: Optional[datetime] = None
+    tags: Optional[List[str]] = Field(None, max_length=20, description="Labels, stored lower-case")
 
     @field_validator('priority')
     @classmethod
@@ -27,9 +28,25 @@ class TaskBase(BaseModel):
         return v
 
 
+    @field_validator('tags')
+    @classmethod
+    def validate_tags(cls, v: Optional[List[str]]) -> Optional[List[str]]:
+        if v is None:
+            return v
+        tags = []
+        for tag in v:
+            tag = tag.strip().lower()
+            if not 1 <= len(tag) <= 50:
+                raise ValueError('Tags must be 1 to 50 characters long')
+            if tag not in tags:
+                tags.append(tag)
+        return tags
+
+
 class TaskCreate(TaskBase):
     title: str = Field(..., min_length=1, max_length=255)
     priority: int = Field(..., ge=1, le=3, description="1=High, 2=Medium, 3=Low")
+    tags: List[str] = Field(default_factory=list, max_length=20, description="Labels, stored lower-case")
 
 
 class TaskUpdate(TaskBase):
@@ -43,6 +60,16 @@ class TaskOut(BaseResponse, TimestampMixin):
     priority: int
     due_date: Optional[datetime] = None
     completed: bool
+    tags: List[str] = []
+
+
+class TaskBatchRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1, description="Task IDs to fetch")
+
+
+class TaskBatchResponse(BaseModel):
+    items: List[TaskOut]
+    missing: List[int]
 
 
 class TaskSummary(BaseModel):
@@ -50,4 +77,37 @@ class TaskSummary(BaseModel):
     completed_tasks: int
     pending_tasks: int
     high_priority_tasks: int
-    overdue_tasks: int
\ No newline at end of file
+    overdue_tasks: int
+    tag_counts: Dict[str, int] = Field(default_factory=dict, description="Tasks per tag, archived ones included")
+
+
+class PriorityCompletion(BaseModel):
+    priority: int
+    total: int
+    completed: int
+    completion_rate: float
+
+
+class CountBucket(BaseModel):
+    label: str
+    count: int
+
+
+class DateBucket(BaseModel):
+    start: date
+    count: int
+
+
+class ThroughputBucket(BaseModel):
+    start: date
+    created: int
+    completed: int
+
+
+class TaskAnalytics(BaseModel):
+    generated_at: datetime
+    interval: str
+    completion_by_priority: List[PriorityCompletion]
+    overdue_by_age: List[CountBucket]
+    due_date_histogram: List[DateBucket]
+    throughput: List[ThroughputBucket]
\ No newline at end of file
@@ -0,0 +1,83 @@
+import importlib.util
+import inspect
+import os
+from typing import Any, Dict
+
+import uvicorn
+
+from app.config import settings
+from app.logging_config import get_logger, setup_logging
+
+logger = get_logger("server")
+
+
+def available_cpus() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def resolve_workers() -> int:
+    if settings.reload:
+        return 1
+    return settings.workers if settings.workers > 0 else available_cpus()
+
+
+def resolve_loop() -> str:
+    if settings.loop == "auto":
+        return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    return settings.loop
+
+
+def resolve_http() -> str:
+    if settings.http == "auto":
+        return "httptools" if importlib.util.find_spec("httptools") else "h11"
+    return settings.http
+
+
+def build_uvicorn_options() -> Dict[str, Any]:
+    """
+    Translate `Settings` into uvicorn options.
+
+    With more than one worker uvicorn runs a pre-fork supervisor: the parent
+    binds the listening socket once, workers inherit it and are restarted if
+    they die, and SIGTERM is forwarded so each worker stops accepting new
+    connections and drains in-flight requests for up to
+    `graceful_timeout_seconds`.
+    """
+    workers = resolve_workers()
+    options: Dict[str, Any] = {
+        "host": settings.host,
+        "port": settings.port,
+        "reload": settings.reload,
+        "workers": workers,
+        "loop": resolve_loop(),
+        "http": resolve_http(),
+        "backlog": settings.backlog,
+        "timeout_keep_alive": settings.keepalive_timeout_seconds,
+        "timeout_graceful_shutdown": settings.graceful_timeout_seconds,
+        "log_level": settings.log_level.lower(),
+    }
+    if settings.max_requests > 0:
+        options["limit_max_requests"] = settings.max_requests
+        # Only recent uvicorn releases can stagger recycling across workers.
+        if settings.max_requests_jitter and "limit_max_requests_jitter" in inspect.signature(uvicorn.Config).parameters:
+            options["limit_max_requests_jitter"] = settings.max_requests_jitter
+
+    if workers > 1 and settings.read_model_enabled:
+        # Each worker's read model would only see its own writes. Workers are
+        # spawned and read their settings from the environment they inherit.
+        logger.warning("read_model_enabled ignored with multiple workers: each would only see its own writes")
+        os.environ["READ_MODEL_ENABLED"] = "false"
+        settings.read_model_enabled = False
+    return options
+
+
+def run() -> None:
+    setup_logging()
+    options = build_uvicorn_options()
+    logger.info(
+        f"Starting server on {options['host']}:{options['port']} with {options['workers']} worker(s), "
+        f"loop={options['loop']}, http={options['http']}"
+    )
+    uvicorn.run("app.main:app", **options)
@@ -0,0 +1,3 @@
+from .archiver import TaskArchiver, archiver
+
+__all__ = ["TaskArchiver", "archiver"]
\ No newline at end of file
@@ -0,0 +1,121 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.crud.base import IN_CHUNK_SIZE
+from app.crud.task import CRUDTask, task as crud_task
+from app.database import SessionLocal
+from app.exceptions import DatabaseError
+from app.locks import ProcessLock
+from app.logging_config import get_logger
+from app.metrics import metrics
+
+logger = get_logger("services.archiver")
+
+
+class TaskArchiver:
+    """
+    Background job moving tasks completed more than `after_days` ago from
+    `tasks` to `tasks_archive`.
+
+    Each batch is its own short transaction, with a pause in between, so the
+    job never holds the SQLite write lock for long while requests are served.
+    With several workers, only the holder of the lock file at `lock_path` runs.
+    """
+
+    def __init__(
+            self,
+            *,
+            after_days: int,
+            batch_size: int,
+            interval: float,
+            batch_pause: float = 0.0,
+            lock_path: str = "./data/archive.lock",
+            session_factory: Callable[[], Session] = SessionLocal,
+            crud: CRUDTask = crud_task,
+    ):
+        self.after_days = after_days
+        self.batch_size = batch_size
+        self.interval = interval
+        self.batch_pause = batch_pause
+        self.lock_path = lock_path
+        self.session_factory = session_factory
+        self.crud = crud
+        self._task: Optional[asyncio.Task] = None
+        self._lock: Optional[ProcessLock] = None
+
+    @classmethod
+    def from_settings(cls) -> "TaskArchiver":
+        return cls(
+            after_days=settings.archive_after_days,
+            batch_size=settings.archive_batch_size,
+            interval=settings.archive_interval_seconds,
+            batch_pause=settings.archive_batch_pause_seconds,
+            lock_path=settings.archive_lock_path,
+        )
+
+    def run_once(self, db: Optional[Session] = None, now: Optional[datetime] = None) -> int:
+        """Archive every eligible task, batch by batch. Returns the number moved."""
+        # Timestamps are written by the database (CURRENT_TIMESTAMP), which is UTC.
+        now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+        cutoff = now - timedelta(days=self.after_days)
+        moved = 0
+        own_session = db is None
+        db = db or self.session_factory()
+        try:
+            while True:
+                count = self.crud.archive_completed(db, completed_before=cutoff, limit=self.batch_size)
+                moved += count
+                metrics.inc("archive.tasks_moved", count)
+                # `archive_completed` moves at most IN_CHUNK_SIZE tasks per call.
+                if count < min(self.batch_size, IN_CHUNK_SIZE):
+                    break
+                if self.batch_pause:
+                    time.sleep(self.batch_pause)
+        finally:
+            if own_session:
+                db.close()
+        if moved:
+            logger.info(f"Archived {moved} tasks completed before {cutoff.isoformat()}")
+        return moved
+
+    async def _run_forever(self, lock: ProcessLock) -> None:
+        while True:
+            try:
+                # Only one worker archives; the others would race it for the same rows.
+                if lock.acquire():
+                    await asyncio.to_thread(self.run_once)
+            except OSError as e:
+                metrics.inc("archive.failures")
+                logger.error(f"Archive lock unavailable: {e}")
+            except DatabaseError:
+                # Logged by the CRUD layer; retried next round.
+                metrics.inc("archive.failures")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._lock = ProcessLock(self.lock_path)
+            self._task = asyncio.create_task(self._run_forever(self._lock))
+            logger.info(
+                f"Archiver started: tasks completed more than {self.after_days} days ago, every {self.interval}s"
+            )
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._lock is not None:
+            self._lock.release()
+            self._lock = None
+
+
+archiver = TaskArchiver.from_settings()
\ No newline at end of file
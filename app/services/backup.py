@@ -0,0 +1,284 @@
+"""
+Online database backups.
+
+SQLite databases are copied with the online backup API `pages_per_step`
+pages at a time, sleeping `step_pause` between steps, so the copy never
+holds the database for long and request threads keep running (the copy
+runs off the event loop and releases the GIL while a step runs). Writes
+restart a stepped copy; after `max_restarts` it finishes in one step.
+PostgreSQL databases are streamed with `pg_dump`. Each snapshot is a
+directory named after its UTC start time holding one file per database
+(the main database and every shard); the newest `retention` are kept.
+With several workers, scheduled backups run in whichever one holds the
+lock file in the backup directory.
+
+Restore with the API stopped:
+
+    python -m app.services.backup list
+    python -m app.services.backup create
+    python -m app.services.backup restore 20261019T020000.000000Z
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import sqlite3
+import subprocess
+import time
+from datetime import datetime, timezone
+from typing import Callable, List, Optional
+
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.database import all_engines
+from app.exceptions import DatabaseError
+from app.locks import ProcessLock
+from app.logging_config import get_logger
+from app.metrics import metrics
+
+logger = get_logger("services.backup")
+
+SNAPSHOT_FORMAT = "%Y%m%dT%H%M%S.%fZ"
+
+# Lock file, in the backup directory, held by the one process taking scheduled backups.
+SCHEDULER_LOCK = ".scheduler.lock"
+
+
+def sqlite_path(engine: Engine) -> str:
+    path = engine.url.database
+    if not path or path == ":memory:":
+        raise OSError("In-memory SQLite databases cannot be backed up")
+    return path
+
+
+def backup_file_name(engine: Engine) -> str:
+    if engine.dialect.name == "sqlite":
+        return os.path.basename(sqlite_path(engine))
+    return f"{engine.url.database}.dump"
+
+
+class _TooManyRestarts(Exception):
+    pass
+
+
+def copy_sqlite(
+        source_path: str,
+        target_path: str,
+        pages_per_step: int = -1,
+        step_pause: float = 0.0,
+        max_restarts: Optional[int] = None,
+) -> int:
+    """
+    Copy a live SQLite database with the online backup API. Returns the number of restarts:
+    a write from another connection restarts the copy at its next step. After `max_restarts`
+    the rest is copied in a single step, which in WAL mode only holds a read snapshot.
+    """
+    restarts = 0
+    remaining_before = None
+
+    def progress(status: int, remaining: int, total: int) -> None:
+        nonlocal restarts, remaining_before
+        if remaining_before is not None and remaining > remaining_before:
+            restarts += 1
+            if max_restarts is not None and restarts > max_restarts:
+                raise _TooManyRestarts()
+        remaining_before = remaining
+        if step_pause and remaining:
+            time.sleep(step_pause)
+
+    source = sqlite3.connect(source_path)
+    target = sqlite3.connect(target_path)
+    try:
+        try:
+            source.backup(target, pages=pages_per_step, progress=progress)
+        except _TooManyRestarts:
+            logger.warning(f"Backup of {source_path} restarted {restarts} times; copying it in one step")
+            source.backup(target)
+    finally:
+        target.close()
+        source.close()
+    return restarts
+
+
+class BackupManager:
+    """Creates, lists, prunes and restores snapshots of every database."""
+
+    def __init__(
+            self,
+            *,
+            directory: str,
+            retention: int,
+            interval: float,
+            pages_per_step: int = 64,
+            step_pause: float = 0.01,
+            max_restarts: Optional[int] = 20,
+            engines: Callable[[], List[Engine]] = all_engines,
+    ):
+        self.directory = directory
+        self.retention = retention
+        self.interval = interval
+        self.pages_per_step = pages_per_step
+        self.step_pause = step_pause
+        self.max_restarts = max_restarts
+        self.engines = engines
+        self.last_duration = 0.0
+        self._lock: Optional[ProcessLock] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_settings(cls) -> "BackupManager":
+        return cls(
+            directory=settings.backup_directory,
+            retention=settings.backup_retention,
+            interval=settings.backup_interval_seconds,
+            pages_per_step=settings.backup_pages_per_step,
+            step_pause=settings.backup_step_pause_seconds,
+            max_restarts=settings.backup_max_restarts,
+        )
+
+    def snapshots(self) -> List[str]:
+        """Completed snapshot names, oldest first."""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(
+            name for name in os.listdir(self.directory)
+            if not name.endswith(".partial") and os.path.isdir(os.path.join(self.directory, name))
+        )
+
+    def create(self) -> str:
+        """Take a snapshot of every database now and prune old ones. Returns the snapshot name."""
+        started = time.perf_counter()
+        name = datetime.now(timezone.utc).strftime(SNAPSHOT_FORMAT)
+        final_dir = os.path.join(self.directory, name)
+        # Written under a temporary name so a crash never leaves a snapshot that looks complete.
+        partial_dir = final_dir + ".partial"
+        try:
+            os.makedirs(partial_dir, exist_ok=True)
+            for engine in self.engines():
+                self._backup_engine(engine, os.path.join(partial_dir, backup_file_name(engine)))
+            os.replace(partial_dir, final_dir)
+        except (OSError, sqlite3.Error, subprocess.CalledProcessError) as e:
+            shutil.rmtree(partial_dir, ignore_errors=True)
+            metrics.inc("backup.failures")
+            logger.error(f"Backup {name} failed: {e}")
+            raise DatabaseError("Backup failed")
+
+        self.last_duration = time.perf_counter() - started
+        metrics.inc("backup.runs")
+        logger.info(f"Backup {name} written in {self.last_duration:.2f}s")
+        try:
+            metrics.inc("backup.bytes", self.size(name))
+            self.prune()
+        except OSError as e:
+            # The snapshot itself is complete; pruning is retried after the next one.
+            metrics.inc("backup.failures")
+            logger.error(f"Pruning backups after {name} failed: {e}")
+        return name
+
+    def _backup_engine(self, engine: Engine, target_path: str) -> None:
+        if engine.dialect.name == "sqlite":
+            restarts = copy_sqlite(
+                sqlite_path(engine), target_path, self.pages_per_step, self.step_pause, self.max_restarts
+            )
+            metrics.inc("backup.restarts", restarts)
+        else:
+            # pg_dump reads a consistent snapshot without blocking writers.
+            url = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+            with open(target_path, "wb") as target:
+                subprocess.run(["pg_dump", "--format=custom", f"--dbname={url}"], stdout=target, check=True)
+
+    def size(self, name: str) -> int:
+        path = os.path.join(self.directory, name)
+        return sum(os.path.getsize(os.path.join(path, file)) for file in os.listdir(path))
+
+    def prune(self) -> List[str]:
+        """Delete all but the newest `retention` snapshots. Returns the deleted names."""
+        expired = self.snapshots()[:-self.retention] if self.retention else []
+        for name in expired:
+            shutil.rmtree(os.path.join(self.directory, name))
+            logger.info(f"Deleted backup {name}")
+        return expired
+
+    def restore(self, name: str) -> List[str]:
+        """Copy snapshot `name` back over every database. Only run this with the API stopped."""
+        path = os.path.join(self.directory, name)
+        if name not in self.snapshots():
+            raise FileNotFoundError(f"No backup named {name} in {self.directory}")
+        # Checked up front: restoring some databases and not others leaves them inconsistent,
+        # and copying from a missing SQLite file would create an empty one and wipe the database.
+        sources = [(engine, os.path.join(path, backup_file_name(engine))) for engine in self.engines()]
+        missing = [os.path.basename(source_path) for _, source_path in sources if not os.path.isfile(source_path)]
+        if missing:
+            raise FileNotFoundError(f"Backup {name} has no {', '.join(missing)}; nothing was restored")
+        restored = []
+        for engine, source_path in sources:
+            engine.dispose()
+            if engine.dialect.name == "sqlite":
+                copy_sqlite(source_path, sqlite_path(engine))
+            else:
+                url = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+                subprocess.run(
+                    ["pg_restore", "--clean", "--if-exists", f"--dbname={url}", source_path], check=True
+                )
+            restored.append(backup_file_name(engine))
+        return restored
+
+    async def _run_forever(self, lock: ProcessLock) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                if not lock.acquire():
+                    # Another worker takes the scheduled backups.
+                    continue
+                await asyncio.to_thread(self.create)
+            except OSError as e:
+                metrics.inc("backup.failures")
+                logger.error(f"Scheduled backup failed: {e}")
+            except DatabaseError:
+                # Logged and counted; the next round tries again.
+                pass
+
+    def start(self) -> None:
+        if self._task is None:
+            self._lock = ProcessLock(os.path.join(self.directory, SCHEDULER_LOCK))
+            self._task = asyncio.create_task(self._run_forever(self._lock))
+            logger.info(f"Backups scheduled every {self.interval}s into {self.directory}")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._lock is not None:
+            self._lock.release()
+            self._lock = None
+
+
+backups = BackupManager.from_settings()
+metrics.register_gauge("backup.last_duration_seconds", lambda: round(backups.last_duration, 4))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="List snapshots, oldest first")
+    commands.add_parser("create", help="Take a snapshot now")
+    restore = commands.add_parser("restore", help="Restore a snapshot over every database")
+    restore.add_argument("name")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for name in backups.snapshots():
+            print(f"{name}  {backups.size(name) / 2 ** 20:10.1f} MiB")
+    elif args.command == "create":
+        print(backups.create())
+    else:
+        print(f"Restored {', '.join(backups.restore(args.name))} from {args.name}")
+
+
+if __name__ == "__main__":
+    main()
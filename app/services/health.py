@@ -0,0 +1,192 @@
+import asyncio
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import QueuePool
+
+from app.config import settings
+from app.database import all_engines
+from app.logging_config import get_logger
+from app.metrics import metrics
+
+logger = get_logger("services.health")
+
+# A report older than this many intervals means the monitor itself is stuck.
+STALE_INTERVALS = 3
+
+
+def pool_usage(engine: Engine) -> Dict[str, Optional[float]]:
+    """Connections checked out of `engine`'s pool and their share of its capacity, where the pool has one."""
+    pool = engine.pool
+    if not isinstance(pool, QueuePool):
+        return {"pool_in_use": None, "pool_saturation": None}
+    in_use = pool.checkedout()
+    max_overflow = getattr(pool, "_max_overflow", 0)
+    capacity = pool.size() + max_overflow if max_overflow >= 0 else 0
+    return {"pool_in_use": in_use, "pool_saturation": round(in_use / capacity, 4) if capacity else None}
+
+
+def disk_free_bytes(engine: Engine) -> Optional[int]:
+    """Free space on the filesystem of a SQLite database file."""
+    path = engine.url.database
+    if engine.dialect.name != "sqlite" or not path or path == ":memory:":
+        return None
+    try:
+        return shutil.disk_usage(os.path.dirname(os.path.abspath(path))).free
+    except OSError:
+        return None
+
+
+class HealthMonitor:
+    """
+    Background job sampling what the health probes report.
+
+    Every `interval` seconds it measures the `SELECT 1` round trip and pool
+    use of every database, the free disk space of SQLite files and the lag of
+    the event loop (how late its own sleep wakes up). Probes read the cached
+    report instead of checking out a connection each. A failed round trip
+    makes the report unhealthy; a breached threshold, or a report older than
+    `STALE_INTERVALS` intervals, makes it degraded.
+    """
+
+    def __init__(
+            self,
+            *,
+            interval: float = 5.0,
+            max_db_latency_ms: float = 250.0,
+            max_pool_saturation: float = 0.9,
+            min_disk_free_bytes: int = 500 * 2 ** 20,
+            max_loop_lag_ms: float = 200.0,
+            engines: Callable[[], List[Engine]] = all_engines,
+    ):
+        self.interval = interval
+        self.max_db_latency_ms = max_db_latency_ms
+        self.max_pool_saturation = max_pool_saturation
+        self.min_disk_free_bytes = min_disk_free_bytes
+        self.max_loop_lag_ms = max_loop_lag_ms
+        self.engines = engines
+        self.loop_lag_ms: Optional[float] = None
+        self.latest: Optional[Dict[str, Any]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_settings(cls) -> "HealthMonitor":
+        return cls(
+            interval=settings.health_check_interval_seconds,
+            max_db_latency_ms=settings.health_max_db_latency_ms,
+            max_pool_saturation=settings.health_max_pool_saturation,
+            min_disk_free_bytes=settings.health_min_disk_free_mb * 2 ** 20,
+            max_loop_lag_ms=settings.health_max_loop_lag_ms,
+        )
+
+    def _check_database(self, engine: Engine) -> Dict[str, Any]:
+        # Pool use is read before the probe's own checkout.
+        check: Dict[str, Any] = {**pool_usage(engine), "disk_free_bytes": disk_free_bytes(engine)}
+        started = time.perf_counter()
+        try:
+            with engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+            check["latency_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        except SQLAlchemyError as e:
+            check["error"] = f"{type(e).__name__}: {e}"
+        return check
+
+    def sample(self) -> Dict[str, Any]:
+        """Check every database now and cache the report. Returns it."""
+        databases = {
+            engine.url.database or str(engine.url): self._check_database(engine) for engine in self.engines()
+        }
+        unhealthy, problems = False, []
+        for name, check in databases.items():
+            if "error" in check:
+                unhealthy = True
+                problems.append(f"{name}: unreachable")
+                continue
+            if check["latency_ms"] > self.max_db_latency_ms:
+                problems.append(f"{name}: round trip {check['latency_ms']:.1f}ms")
+            if check["pool_saturation"] is not None and check["pool_saturation"] >= self.max_pool_saturation:
+                problems.append(f"{name}: pool {check['pool_saturation']:.0%} in use")
+            if check["disk_free_bytes"] is not None and check["disk_free_bytes"] < self.min_disk_free_bytes:
+                problems.append(f"{name}: {check['disk_free_bytes'] / 2 ** 20:.0f} MiB disk free")
+        if self.loop_lag_ms is not None and self.loop_lag_ms > self.max_loop_lag_ms:
+            problems.append(f"event loop lag {self.loop_lag_ms:.1f}ms")
+
+        self.latest = {
+            "status": "unhealthy" if unhealthy else "degraded" if problems else "healthy",
+            "checked_at": datetime.now(timezone.utc),
+            "databases": databases,
+            "loop_lag_ms": self.loop_lag_ms,
+            "problems": problems,
+        }
+        metrics.inc("health.samples")
+        if problems:
+            logger.warning(f"Health {self.latest['status']}: {', '.join(problems)}")
+        return self.latest
+
+    def report(self) -> Dict[str, Any]:
+        """
+        The cached report, without touching a database. The application takes
+        the first sample at start-up; staleness only applies while the monitor
+        is running.
+        """
+        report = self.latest
+        if report is None:
+            return {
+                "status": "unhealthy",
+                "checked_at": None,
+                "databases": {},
+                "loop_lag_ms": None,
+                "problems": ["no health sample taken yet"],
+            }
+        age = (datetime.now(timezone.utc) - report["checked_at"]).total_seconds()
+        if self._task is not None and age > STALE_INTERVALS * self.interval:
+            return {
+                **report,
+                "status": "unhealthy" if report["status"] == "unhealthy" else "degraded",
+                "problems": [*report["problems"], f"health report {age:.0f}s old"],
+            }
+        return report
+
+    async def _run_forever(self) -> None:
+        # The application samples once before serving; the next sample is due an interval later.
+        loop = asyncio.get_running_loop()
+        while True:
+            before = loop.time()
+            await asyncio.sleep(self.interval)
+            self.loop_lag_ms = round(max(0.0, loop.time() - before - self.interval) * 1000, 3)
+            try:
+                await asyncio.to_thread(self.sample)
+            except Exception as e:
+                logger.error(f"Health sample failed: {e}")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_forever())
+            logger.info(f"Health monitor started: every {self.interval}s")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+health_monitor = HealthMonitor.from_settings()
+
+
+def _latency_ms() -> Optional[float]:
+    latencies = [check.get("latency_ms") for check in (health_monitor.latest or {}).get("databases", {}).values()]
+    return max((latency for latency in latencies if latency is not None), default=None)
+
+
+metrics.register_gauge("health.db_latency_ms", _latency_ms)
+metrics.register_gauge("health.loop_lag_ms", lambda: health_monitor.loop_lag_ms)
@@ -0,0 +1,308 @@
+import asyncio
+import json
+import time
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.crud.outbox import utcnow
+from app.crud.task import CRUDTask, task as crud_task
+from app.database import SessionLocal, engine as main_engine
+from app.exceptions import BaseAppException, DatabaseError
+from app.logging_config import get_logger
+from app.metrics import metrics
+from app.models.job import Job
+from app.schemas.job import JobCreate
+
+logger = get_logger("services.jobs")
+
+jobs_table = Job.__table__
+
+T = TypeVar("T")
+
+# A running job whose heartbeat is older than this is assumed to have lost its
+# process and is picked up again, from its cursor, by any worker.
+LEASE_SECONDS = 60.0
+
+# Values set by the update operations; "delete" removes the tasks instead.
+OPERATION_VALUES: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    "complete": lambda job: {"completed": True},
+    "reopen": lambda job: {"completed": False},
+    "set_priority": lambda job: {"priority": job["priority"]},
+}
+
+
+class JobRunner:
+    """
+    Runs bulk task operations submitted through `POST /jobs` on `workers`
+    concurrent workers.
+
+    Jobs are rows of the main database's `jobs` table. A job walks the
+    matching tasks in id order, `chunk_size` at a time: each chunk is changed
+    through `crud.task` in its own short transaction (so write listeners,
+    webhooks and shards see ordinary writes), then the job's cursor and
+    progress are saved. Between chunks a job sleeps to stay under its
+    `max_rows_per_second` and checks whether it was cancelled. A job whose
+    process died resumes from its cursor once its heartbeat is older than
+    `LEASE_SECONDS`; its last chunk may be applied twice, which every
+    operation tolerates.
+    """
+
+    def __init__(
+            self,
+            *,
+            workers: int = 2,
+            chunk_size: int = 200,
+            max_rows_per_second: float = 1000.0,
+            poll_interval: float = 1.0,
+            engine: Engine = main_engine,
+            session_factory: Callable[[], Session] = SessionLocal,
+            crud: CRUDTask = crud_task,
+    ):
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.max_rows_per_second = max_rows_per_second
+        self.poll_interval = poll_interval
+        self.engine = engine
+        self.session_factory = session_factory
+        self.crud = crud
+        self.running = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+
+    @classmethod
+    def from_settings(cls) -> "JobRunner":
+        return cls(
+            workers=settings.job_workers,
+            chunk_size=settings.job_chunk_size,
+            max_rows_per_second=settings.job_max_rows_per_second,
+            poll_interval=settings.job_poll_interval_seconds,
+        )
+
+    def _run_in_transaction(self, fn: Callable[[Connection], T]) -> T:
+        try:
+            with self.engine.begin() as connection:
+                return fn(connection)
+        except SQLAlchemyError as e:
+            logger.error(f"Job table access failed: {e}")
+            raise DatabaseError("Job table access failed")
+
+    @staticmethod
+    def _row(connection: Connection, job_id: int) -> Optional[Dict[str, Any]]:
+        row = connection.execute(select(jobs_table).where(jobs_table.c.id == job_id)).mappings().first()
+        if row is None:
+            return None
+        return {**row, "filters": json.loads(row["filters"])}
+
+    def submit(self, spec: JobCreate) -> Dict[str, Any]:
+        """Queue a job. Returns it."""
+        def insert_job(connection: Connection) -> Optional[Dict[str, Any]]:
+            job_id = connection.execute(jobs_table.insert().values(
+                operation=spec.operation,
+                filters=spec.filters.model_dump_json(exclude_defaults=True),
+                priority=spec.priority,
+                status="queued",
+                chunk_size=spec.chunk_size or self.chunk_size,
+                max_rows_per_second=(
+                    self.max_rows_per_second if spec.max_rows_per_second is None else spec.max_rows_per_second
+                ),
+                processed=0,
+                cursor=0,
+                cancel_requested=False,
+            ).returning(jobs_table.c.id)).scalar_one()
+            return self._row(connection, job_id)
+
+        job = self._run_in_transaction(insert_job)
+        if job is None:
+            raise DatabaseError("Failed to queue job")
+        metrics.inc("jobs.submitted")
+        logger.info(f"Job {job['id']} queued: {spec.operation} where {job['filters']}")
+        if self._loop is not None and self._wake is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+        return job
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        return self._run_in_transaction(lambda connection: self._row(connection, job_id))
+
+    def cancel(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """Cancel a queued job now, or ask a running one to stop after its current chunk. Returns it."""
+        def cancel_job(connection: Connection) -> Optional[Dict[str, Any]]:
+            connection.execute(
+                update(jobs_table)
+                .where(jobs_table.c.id == job_id, jobs_table.c.status == "queued")
+                .values(status="cancelled", cancel_requested=True, finished_at=utcnow())
+            )
+            connection.execute(
+                update(jobs_table)
+                .where(jobs_table.c.id == job_id, jobs_table.c.status == "running")
+                .values(cancel_requested=True)
+            )
+            return self._row(connection, job_id)
+
+        return self._run_in_transaction(cancel_job)
+
+    def _claim(self, connection: Connection) -> Optional[Dict[str, Any]]:
+        now = utcnow()
+        claimable = or_(
+            jobs_table.c.status == "queued",
+            (jobs_table.c.status == "running") & (jobs_table.c.heartbeat_at < now - timedelta(seconds=LEASE_SECONDS)),
+        )
+        job_id = connection.execute(
+            select(jobs_table.c.id).where(claimable).order_by(jobs_table.c.id).limit(1)
+            .with_for_update(skip_locked=True)
+        ).scalar()
+        if job_id is None:
+            return None
+        # Guarded again, for databases without row locks: only one worker wins the update.
+        claimed = connection.execute(
+            update(jobs_table)
+            .where(jobs_table.c.id == job_id, claimable)
+            .values(status="running", heartbeat_at=now)
+        ).rowcount
+        if not claimed:
+            return None
+        connection.execute(
+            update(jobs_table).where(jobs_table.c.id == job_id, jobs_table.c.started_at == None).values(started_at=now)
+        )
+        return self._row(connection, job_id)
+
+    def _checkpoint(self, job_id: int, **values: Any) -> bool:
+        """Save progress and renew the job's lease. Returns whether it was asked to cancel."""
+        def save(connection: Connection) -> bool:
+            connection.execute(
+                update(jobs_table).where(jobs_table.c.id == job_id).values(heartbeat_at=utcnow(), **values)
+            )
+            return bool(connection.execute(
+                select(jobs_table.c.cancel_requested).where(jobs_table.c.id == job_id)
+            ).scalar())
+
+        return self._run_in_transaction(save)
+
+    def _finish(self, job_id: int, status: str, error: Optional[str] = None) -> None:
+        self._run_in_transaction(lambda connection: connection.execute(
+            update(jobs_table).where(jobs_table.c.id == job_id).values(
+                status=status, error=error[:500] if error else None, finished_at=utcnow()
+            )
+        ))
+        metrics.inc(f"jobs.{status}")
+
+    def _count(self, job: Dict[str, Any]) -> int:
+        with self.session_factory() as db:
+            return self.crud.count_by_filters(db, **job["filters"])
+
+    def _run_chunk(self, job: Dict[str, Any], cursor: int) -> Tuple[int, Optional[int]]:
+        """Apply the job to the next chunk after `cursor`. Returns how many tasks changed and the new cursor."""
+        with self.session_factory() as db:
+            ids = self.crud.next_ids_by_filters(db, after_id=cursor, limit=job["chunk_size"], **job["filters"])
+            if not ids:
+                return 0, None
+            if job["operation"] == "delete":
+                changed = self.crud.remove_many(db, ids=ids)
+            else:
+                changed = self.crud.update_many(db, ids=ids, values=OPERATION_VALUES[job["operation"]](job))
+        return changed, ids[-1]
+
+    async def _pause(self, job_id: int, seconds: float) -> bool:
+        """Sleep for `seconds`, renewing the lease. Returns early with True if the job was cancelled."""
+        deadline = time.monotonic() + seconds
+        while (remaining := deadline - time.monotonic()) > 0:
+            await asyncio.sleep(min(remaining, self.poll_interval))
+            if await asyncio.to_thread(self._checkpoint, job_id):
+                return True
+        return False
+
+    async def run_job(self, job: Dict[str, Any]) -> str:
+        """Run a claimed job to the end. Returns its final status."""
+        job_id, cursor, processed = job["id"], job["cursor"], job["processed"]
+        self.running += 1
+        try:
+            if job["total"] is None:
+                total = await asyncio.to_thread(self._count, job)
+                await asyncio.to_thread(self._checkpoint, job_id, total=total)
+            while True:
+                if await asyncio.to_thread(self._checkpoint, job_id):
+                    status = "cancelled"
+                    break
+                started = time.monotonic()
+                changed, next_cursor = await asyncio.to_thread(self._run_chunk, job, cursor)
+                if next_cursor is None:
+                    status = "succeeded"
+                    break
+                cursor, processed = next_cursor, processed + changed
+                metrics.inc("jobs.rows_processed", changed)
+                cancelled = await asyncio.to_thread(self._checkpoint, job_id, cursor=cursor, processed=processed)
+                if not cancelled and job["max_rows_per_second"]:
+                    cancelled = await self._pause(
+                        job_id, changed / job["max_rows_per_second"] - (time.monotonic() - started)
+                    )
+                if cancelled:
+                    status = "cancelled"
+                    break
+        except asyncio.CancelledError:
+            # Shutting down: hand the job back so that a worker resumes it from its cursor
+            # right away instead of after its lease.
+            self._run_in_transaction(lambda connection: connection.execute(
+                update(jobs_table).where(jobs_table.c.id == job_id, jobs_table.c.status == "running")
+                .values(status="queued")
+            ))
+            raise
+        except Exception as e:
+            error = e.message if isinstance(e, BaseAppException) else f"{type(e).__name__}: {e}"
+            logger.error(f"Job {job_id} failed after {processed} tasks: {error}")
+            await asyncio.to_thread(self._finish, job_id, "failed", error)
+            return "failed"
+        finally:
+            self.running -= 1
+
+        await asyncio.to_thread(self._finish, job_id, status)
+        logger.info(f"Job {job_id} {status}: {job['operation']} on {processed} tasks")
+        return status
+
+    async def run_next(self) -> Optional[int]:
+        """Claim the oldest runnable job and run it. Returns its id, or None when there was none."""
+        job = await asyncio.to_thread(self._run_in_transaction, self._claim)
+        if job is None:
+            return None
+        await self.run_job(job)
+        return job["id"]
+
+    async def _work_forever(self, wake: asyncio.Event) -> None:
+        while True:
+            try:
+                job_id = await self.run_next()
+            except DatabaseError:
+                job_id = None
+            if job_id is None:
+                try:
+                    await asyncio.wait_for(wake.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                wake.clear()
+
+    def start(self) -> None:
+        if not self._tasks and self.workers:
+            self._loop = asyncio.get_running_loop()
+            self._wake = asyncio.Event()
+            self._tasks = [asyncio.create_task(self._work_forever(self._wake)) for _ in range(self.workers)]
+            logger.info(f"Job runner started: {self.workers} workers")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        self._loop = None
+
+
+jobs = JobRunner.from_settings()
+metrics.register_gauge("jobs.running", lambda: jobs.running)
@@ -0,0 +1,257 @@
+import asyncio
+import os
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config import settings
+from app.database import all_engines
+from app.exceptions import DatabaseError
+from app.locks import ProcessLock
+from app.logging_config import get_logger
+from app.metrics import metrics
+
+logger = get_logger("services.maintenance")
+
+# SQLite `PRAGMA auto_vacuum` value of INCREMENTAL.
+AUTO_VACUUM_INCREMENTAL = 2
+
+# How long the request rate is sampled before a scheduled run.
+RATE_SAMPLE_SECONDS = 10.0
+
+# How often each worker publishes its request count for the rate sample.
+PUBLISH_INTERVAL = 1.0
+
+# Lock file, in the state directory, held by the one worker running scheduled maintenance.
+SCHEDULER_LOCK = ".scheduler.lock"
+
+
+def parse_window(value: str) -> Optional[Tuple[int, int]]:
+    """Parse "HH:MM-HH:MM" into minutes after midnight; the window may wrap past midnight."""
+    if not value:
+        return None
+    try:
+        start, end = (datetime.strptime(part.strip(), "%H:%M") for part in value.split("-"))
+    except ValueError:
+        raise ValueError(f"Invalid maintenance window {value!r}, expected HH:MM-HH:MM")
+    return start.hour * 60 + start.minute, end.hour * 60 + end.minute
+
+
+class MaintenanceScheduler:
+    """
+    Background job keeping the databases healthy under delete-heavy load.
+
+    SQLite gets fresh planner statistics (`ANALYZE` once, `PRAGMA optimize`
+    afterwards), an incremental vacuum returning up to `vacuum_pages` free
+    pages and a WAL checkpoint; PostgreSQL gets `VACUUM (ANALYZE)`. Scheduled
+    runs only start inside `window` (UTC) and once the request rate sampled
+    over `RATE_SAMPLE_SECONDS` is at most `max_requests_per_second`;
+    otherwise they retry after `retry_interval`.
+
+    With several workers, scheduled runs happen in whichever one holds the
+    lock file in `state_directory`. Every worker writes its request count to
+    a file there each `PUBLISH_INTERVAL`, so the rate is sampled over all of
+    them.
+    """
+
+    def __init__(
+            self,
+            *,
+            interval: float,
+            window: Optional[Tuple[int, int]] = None,
+            max_requests_per_second: float = 5.0,
+            retry_interval: float = 300.0,
+            vacuum_pages: int = 2000,
+            full_vacuum: bool = False,
+            state_directory: str = "./data/maintenance",
+            engines: Callable[[], List[Engine]] = all_engines,
+    ):
+        self.interval = interval
+        self.window = window
+        self.max_requests_per_second = max_requests_per_second
+        self.retry_interval = retry_interval
+        self.vacuum_pages = vacuum_pages
+        self.full_vacuum = full_vacuum
+        self.state_directory = state_directory
+        self.engines = engines
+        self.last_duration = 0.0
+        self.free_pages: Dict[str, int] = {}
+        self._lock: Optional[ProcessLock] = None
+        self._task: Optional[asyncio.Task] = None
+        self._publisher: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_settings(cls) -> "MaintenanceScheduler":
+        return cls(
+            interval=settings.maintenance_interval_seconds,
+            window=parse_window(settings.maintenance_window),
+            max_requests_per_second=settings.maintenance_max_requests_per_second,
+            retry_interval=settings.maintenance_retry_seconds,
+            vacuum_pages=settings.maintenance_vacuum_pages,
+            full_vacuum=settings.maintenance_full_vacuum,
+            state_directory=settings.maintenance_state_directory,
+        )
+
+    def in_window(self, now: Optional[datetime] = None) -> bool:
+        if self.window is None:
+            return True
+        now = now or datetime.now(timezone.utc)
+        minute = now.hour * 60 + now.minute
+        start, end = self.window
+        return start <= minute < end if start <= end else minute >= start or minute < end
+
+    def _counts_path(self, pid: int) -> str:
+        return os.path.join(self.state_directory, f"requests-{pid}")
+
+    def publish_requests(self) -> None:
+        """Write this process's request count where the worker sampling the rate reads it."""
+        os.makedirs(self.state_directory, exist_ok=True)
+        path = self._counts_path(os.getpid())
+        with open(path + ".tmp", "w") as f:
+            f.write(str(int(metrics.value("http.requests"))))
+        os.replace(path + ".tmp", path)
+
+    def worker_requests(self) -> Dict[str, int]:
+        """Request counts last published by every worker, by file name."""
+        counts: Dict[str, int] = {}
+        if not os.path.isdir(self.state_directory):
+            return counts
+        for name in os.listdir(self.state_directory):
+            if not name.startswith("requests-") or name.endswith(".tmp"):
+                continue
+            try:
+                with open(os.path.join(self.state_directory, name)) as f:
+                    counts[name] = int(f.read())
+            except (OSError, ValueError):
+                continue
+        return counts
+
+    async def request_rate(self, seconds: float = RATE_SAMPLE_SECONDS) -> float:
+        """Requests per second served by all workers over the next `seconds`."""
+        self.publish_requests()
+        seen = self.worker_requests()
+        await asyncio.sleep(seconds)
+        self.publish_requests()
+        # A worker started meanwhile counts from zero; one recycled meanwhile adds nothing.
+        served = sum(count - seen.get(name, 0) for name, count in self.worker_requests().items())
+        return max(served, 0) / seconds
+
+    async def wait_for_quiet(self, sample_seconds: float = RATE_SAMPLE_SECONDS) -> None:
+        while not (self.in_window() and await self.request_rate(sample_seconds) <= self.max_requests_per_second):
+            metrics.inc("maintenance.deferred")
+            await asyncio.sleep(self.retry_interval)
+
+    def run_once(self) -> List[str]:
+        """Maintain every database now. Returns the operations run, as "<database>: <operation>"."""
+        started = time.perf_counter()
+        operations: List[str] = []
+        for engine in self.engines():
+            name = engine.url.database or str(engine.url)
+            try:
+                # Maintenance commands must run outside a transaction (VACUUM refuses to).
+                with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+                    if engine.dialect.name == "sqlite":
+                        done = self._maintain_sqlite(connection)
+                        self.free_pages[name] = connection.exec_driver_sql("PRAGMA freelist_count").scalar_one()
+                    else:
+                        connection.exec_driver_sql("VACUUM (ANALYZE)")
+                        done = ["vacuum analyze"]
+            except SQLAlchemyError as e:
+                metrics.inc("maintenance.failures")
+                logger.error(f"Database maintenance of {name} failed: {e}")
+                raise DatabaseError("Database maintenance failed")
+            operations.extend(f"{name}: {operation}" for operation in done)
+
+        self.last_duration = time.perf_counter() - started
+        metrics.inc("maintenance.runs")
+        logger.info(f"Database maintenance finished in {self.last_duration:.2f}s: {', '.join(operations)}")
+        return operations
+
+    def _maintain_sqlite(self, connection: Connection) -> List[str]:
+        done = []
+        analyzed = connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+        ).first()
+        # PRAGMA optimize only re-analyzes tables whose statistics drifted; it needs a first ANALYZE.
+        connection.exec_driver_sql("PRAGMA optimize" if analyzed else "ANALYZE")
+        done.append("optimize" if analyzed else "analyze")
+
+        free_pages = connection.exec_driver_sql("PRAGMA freelist_count").scalar()
+        if free_pages:
+            if connection.exec_driver_sql("PRAGMA auto_vacuum").scalar() == AUTO_VACUUM_INCREMENTAL:
+                # Each step of the pragma frees one page and the sqlite3 module only runs the first
+                # step of a statement that returns no rows; executescript() runs it to completion.
+                driver_connection = connection.connection.driver_connection
+                if driver_connection is not None:
+                    driver_connection.executescript(f"PRAGMA incremental_vacuum({self.vacuum_pages})")
+                freed = free_pages - connection.exec_driver_sql("PRAGMA freelist_count").scalar_one()
+                done.append(f"incremental vacuum ({freed} pages)")
+            elif self.full_vacuum:
+                connection.exec_driver_sql("VACUUM")
+                freed = free_pages
+                done.append(f"vacuum ({freed} pages)")
+            else:
+                freed = 0
+            metrics.inc("maintenance.pages_freed", freed)
+
+        if connection.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal":
+            busy, _, _ = connection.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)").one()
+            done.append("wal checkpoint" + (" (busy)" if busy else ""))
+        return done
+
+    async def _publish_forever(self) -> None:
+        while True:
+            try:
+                self.publish_requests()
+            except OSError as e:
+                logger.warning(f"Publishing the request count failed: {e}")
+            await asyncio.sleep(PUBLISH_INTERVAL)
+
+    async def _run_forever(self, lock: ProcessLock) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                if not lock.acquire():
+                    # Another worker runs the scheduled maintenance.
+                    continue
+                await self.wait_for_quiet()
+                await asyncio.to_thread(self.run_once)
+            except DatabaseError:
+                # Logged and counted; a busy database is retried on the next round.
+                pass
+            except Exception as e:
+                # E.g. the state directory (lock, request counts) is unwritable: keep scheduling.
+                metrics.inc("maintenance.failures")
+                logger.error(f"Scheduled maintenance failed: {e}")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._lock = ProcessLock(os.path.join(self.state_directory, SCHEDULER_LOCK))
+            self._publisher = asyncio.create_task(self._publish_forever())
+            self._task = asyncio.create_task(self._run_forever(self._lock))
+            logger.info(f"Maintenance scheduler started: every {self.interval}s")
+
+    async def stop(self) -> None:
+        for task in (self._task, self._publisher):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = self._publisher = None
+        if self._lock is not None:
+            self._lock.release()
+            self._lock = None
+        try:
+            os.remove(self._counts_path(os.getpid()))
+        except OSError:
+            pass
+
+
+maintenance = MaintenanceScheduler.from_settings()
+metrics.register_gauge("maintenance.last_duration_seconds", lambda: round(maintenance.last_duration, 4))
+metrics.register_gauge("maintenance.freelist_pages", lambda: sum(maintenance.free_pages.values()))
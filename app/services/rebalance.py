@@ -0,0 +1,138 @@
+"""
+Move tasks between databases when the shard count changes.
+
+Ids never change: a task's slot (`id % SHARD_SLOTS`) decides its shard for
+any shard count, so rebalancing copies every row whose slot now belongs to
+another database there, in batches, and deletes it from its old database
+once the copy is committed. Re-running after an interruption is safe.
+Afterwards each shard's id sequence is moved past the ids it now holds.
+
+Run it with the API stopped, then start the API with the new SHARD_COUNT:
+
+    python -m app.services.rebalance --from-count 0 --to-count 4   # split DATABASE_URL into 4 shards
+    python -m app.services.rebalance --from-count 4 --to-count 8
+"""
+import argparse
+from typing import Dict, List
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.crud.statements import UPSERT_DIALECTS, insert_ignoring_conflicts
+from app.database import Base, make_engine
+from app.logging_config import get_logger
+from app.models.task import ArchivedTask, Tag, Task, TaskDescription, task_tags
+from app.sharding import SHARD_SLOTS, advance_sequence, sequence_metadata, shard_urls
+
+logger = get_logger("services.rebalance")
+
+
+def _copy_rows(source, target, table, column, ids: List[int]) -> None:
+    rows = [dict(row) for row in source.execute(select(table).where(column.in_(ids))).mappings()]
+    if rows:
+        # Rows left behind by an interrupted run are already there.
+        target.execute(insert_ignoring_conflicts(table, target.dialect.name), rows)
+
+
+def _copy_tags(source, target, ids: List[int]) -> None:
+    # Tag ids differ between databases: carry tags over by name.
+    rows = source.execute(
+        select(task_tags.c.task_id, Tag.name).join(Tag, Tag.id == task_tags.c.tag_id).where(task_tags.c.task_id.in_(ids))
+    ).all()
+    if not rows:
+        return
+    names = sorted({name for _, name in rows})
+    target.execute(insert_ignoring_conflicts(Tag, target.dialect.name), [{"name": name} for name in names])
+    tag_ids = dict(target.execute(select(Tag.name, Tag.id).where(Tag.name.in_(names))).all())
+    target.execute(
+        insert_ignoring_conflicts(task_tags, target.dialect.name),
+        [{"task_id": task_id, "tag_id": tag_ids[name]} for task_id, name in rows],
+    )
+
+
+def _move_batch(source: Engine, target: Engine, model, ids: List[int]) -> None:
+    with target.begin() as target_conn, source.connect() as source_conn:
+        _copy_rows(source_conn, target_conn, model.__table__, model.id, ids)
+        if model is Task:
+            _copy_rows(source_conn, target_conn, TaskDescription.__table__, TaskDescription.task_id, ids)
+        _copy_tags(source_conn, target_conn, ids)
+    with source.begin() as source_conn:
+        source_conn.execute(task_tags.delete().where(task_tags.c.task_id.in_(ids)))
+        if model is Task:
+            source_conn.execute(TaskDescription.__table__.delete().where(TaskDescription.task_id.in_(ids)))
+        source_conn.execute(model.__table__.delete().where(model.id.in_(ids)))
+
+
+def rebalance(sources: List[Engine], targets: List[Engine], batch_size: int = 500) -> Dict[str, int]:
+    """
+    Redistribute the tasks (and archived tasks) of `sources` over `targets`.
+
+    Source and target lists may share databases (same URL), as when growing
+    from 2 to 4 shards. Returns the number of rows moved per table.
+    """
+    # Copies skip rows an interrupted run already moved: check every target supports that before moving any.
+    for engine in targets:
+        if engine.dialect.name not in UPSERT_DIALECTS:
+            raise ValueError(f"Cannot rebalance into {engine.dialect.name} databases; use {' or '.join(UPSERT_DIALECTS)}")
+    urls = [str(engine.url) for engine in targets]
+    for engine in targets:
+        Base.metadata.create_all(bind=engine)
+        sequence_metadata.create_all(bind=engine)
+
+    moved = {Task.__tablename__: 0, ArchivedTask.__tablename__: 0}
+    for source in sources:
+        for model in (Task, ArchivedTask):
+            for shard, target in enumerate(targets):
+                if urls[shard] == str(source.url):
+                    continue
+                id_column = model.__table__.c.id
+                belongs_here = id_column % SHARD_SLOTS % len(targets) == shard
+                while True:
+                    with source.connect() as connection:
+                        ids: List[int] = list(connection.execute(
+                            select(id_column).where(belongs_here).order_by(id_column).limit(batch_size)
+                        ).scalars())
+                    if not ids:
+                        break
+                    _move_batch(source, target, model, ids)
+                    moved[model.__tablename__] += len(ids)
+                    logger.info(f"Moved {len(ids)} {model.__tablename__} rows to shard {shard}")
+
+    for target in targets:
+        with target.begin() as connection:
+            highest = max(
+                connection.execute(select(func.max(model.id))).scalar() or 0 for model in (Task, ArchivedTask)
+            )
+            advance_sequence(connection, highest // SHARD_SLOTS)
+    return moved
+
+
+def _layout(count: int) -> List[str]:
+    return shard_urls(settings.shard_url_template, count) if count else [settings.database_url]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--from-count", type=int, required=True, help="Current SHARD_COUNT (0 = DATABASE_URL)")
+    parser.add_argument("--to-count", type=int, required=True, help="New SHARD_COUNT")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    if not 0 < args.to_count <= SHARD_SLOTS:
+        parser.error(f"--to-count must be between 1 and {SHARD_SLOTS}")
+
+    sources = [make_engine(url) for url in _layout(args.from_count)]
+    targets = [make_engine(url) for url in _layout(args.to_count)]
+    try:
+        moved = rebalance(sources, targets, args.batch_size)
+    except ValueError as e:
+        parser.error(str(e))
+    print(f"Moved {moved} rows from {len(sources)} to {len(targets)} database(s)")
+    for shard, engine in enumerate(targets):
+        with engine.connect() as connection:
+            count = connection.execute(select(func.count(Task.id))).scalar()
+        print(f"shard {shard}: {count} tasks")
+
+
+if __name__ == "__main__":
+    main()
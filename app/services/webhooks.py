@@ -0,0 +1,282 @@
+import asyncio
+import math
+import random
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import bindparam, delete, func, select, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config import settings
+from app.crud.outbox import utcnow
+from app.crud.task import task as crud_task
+from app.database import all_engines
+from app.exceptions import DatabaseError
+from app.logging_config import get_logger
+from app.metrics import metrics
+from app.models.outbox import OutboxEvent
+
+logger = get_logger("services.webhooks")
+
+outbox = OutboxEvent.__table__
+
+# A claimed row is left alone by other dispatchers (other workers) for this
+# many delivery timeouts per round of deliveries its claim queues behind the
+# concurrency limit; if its dispatcher dies it is picked up again after.
+LEASE_TIMEOUTS = 2
+
+
+class WebhookDispatcher:
+    """
+    Background job delivering `outbox` rows to their subscribers.
+
+    Due rows are claimed in batches per database, grouped per subscriber into
+    POSTs of up to `batch_size` events (`{"events": [...]}`) and sent with at
+    most `concurrency` requests in flight over one pooled HTTP client, so
+    connections are reused. Commits wake the dispatcher, which lingers for
+    `linger` seconds to batch a burst of changes. A 2xx response deletes the rows; anything else is
+    retried with exponential backoff (with jitter) until `max_attempts`, after
+    which the rows are dead-lettered. Delivery is at least once.
+    """
+
+    def __init__(
+            self,
+            *,
+            batch_size: int = 100,
+            concurrency: int = 4,
+            timeout: float = 5.0,
+            max_attempts: int = 10,
+            backoff: float = 1.0,
+            max_backoff: float = 600.0,
+            poll_interval: float = 1.0,
+            linger: float = 0.1,
+            engines: Callable[[], List[Engine]] = all_engines,
+    ):
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.poll_interval = poll_interval
+        self.linger = linger
+        self.engines = engines
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_settings(cls) -> "WebhookDispatcher":
+        return cls(
+            batch_size=settings.webhook_batch_size,
+            concurrency=settings.webhook_concurrency,
+            timeout=settings.webhook_timeout_seconds,
+            max_attempts=settings.webhook_max_attempts,
+            backoff=settings.webhook_backoff_seconds,
+            max_backoff=settings.webhook_max_backoff_seconds,
+            poll_interval=settings.webhook_poll_interval_seconds,
+            linger=settings.webhook_linger_seconds,
+        )
+
+    def retry_delay(self, attempts: int) -> float:
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempts - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    def notify(self, event: str, obj: Any) -> None:
+        """Write listener: wake the dispatcher as soon as a change is committed."""
+        if self._loop is not None and self._wake is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    def _claim(self, connection: Connection) -> List[Dict[str, Any]]:
+        now = utcnow()
+        rows = [dict(row) for row in connection.execute(
+            select(outbox.c.id, outbox.c.subscriber, outbox.c.payload, outbox.c.attempts)
+            .where(outbox.c.dead == False, outbox.c.next_attempt_at <= now)
+            .order_by(outbox.c.id)
+            .limit(self.batch_size * self.concurrency)
+            .with_for_update(skip_locked=True)
+        ).mappings()]
+        if not rows:
+            return []
+        # Batches beyond `concurrency` wait for a free slot, each POST for at most
+        # `timeout`: the lease covers every round of deliveries, not just the first.
+        rounds = math.ceil(len(self._batches(rows)) / self.concurrency)
+        lease = timedelta(seconds=self.timeout * LEASE_TIMEOUTS * rounds)
+        # Guarded again, for databases without row locks: a row leased by another
+        # dispatcher since the select is no longer due, and is not returned here.
+        leased = set(connection.execute(
+            update(outbox)
+            .where(
+                outbox.c.id.in_([row["id"] for row in rows]),
+                outbox.c.dead == False,
+                outbox.c.next_attempt_at <= now,
+            )
+            .values(next_attempt_at=now + lease)
+            .returning(outbox.c.id)
+        ).scalars())
+        return [row for row in rows if row["id"] in leased]
+
+    def _batches(self, rows: List[Dict[str, Any]]) -> List[Tuple[str, List[Dict[str, Any]]]]:
+        """Group claimed rows per subscriber into POSTs of at most `batch_size` events."""
+        by_subscriber: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            by_subscriber.setdefault(row["subscriber"], []).append(row)
+        return [
+            (subscriber, subscriber_rows[start:start + self.batch_size])
+            for subscriber, subscriber_rows in by_subscriber.items()
+            for start in range(0, len(subscriber_rows), self.batch_size)
+        ]
+
+    def _record(self, connection: Connection, delivered: List[int], failed: List[Tuple[Dict[str, Any], str]]) -> None:
+        if delivered:
+            connection.execute(delete(outbox).where(outbox.c.id.in_(delivered)))
+        if failed:
+            now = utcnow()
+            connection.execute(
+                update(outbox).where(outbox.c.id == bindparam("row_id")),
+                [
+                    {
+                        "row_id": row["id"],
+                        "attempts": row["attempts"] + 1,
+                        "next_attempt_at": now + timedelta(seconds=self.retry_delay(row["attempts"] + 1)),
+                        "dead": row["attempts"] + 1 >= self.max_attempts,
+                        "last_error": error[:500],
+                    }
+                    for row, error in failed
+                ],
+            )
+
+    def _run_in_transaction(self, engine: Engine, fn: Callable[[Connection], Any]) -> Any:
+        try:
+            with engine.begin() as connection:
+                return fn(connection)
+        except SQLAlchemyError as e:
+            logger.error(f"Outbox access on {engine.url.database} failed: {e}")
+            raise DatabaseError("Outbox access failed")
+
+    async def _post(self, subscriber: str, rows: List[Dict[str, Any]]) -> Optional[str]:
+        """Deliver one batch. Returns None on success, else the error."""
+        body = '{"events":[' + ",".join(row["payload"] for row in rows) + "]}"
+        client, semaphore = self._ensure_client()
+        async with semaphore:
+            try:
+                # httpx's timeout applies to each connect, write and read; the lease needs one for the POST.
+                response = await asyncio.wait_for(
+                    client.post(subscriber, content=body.encode(), headers={"Content-Type": "application/json"}),
+                    self.timeout,
+                )
+            except (httpx.HTTPError, asyncio.TimeoutError) as e:
+                return f"{type(e).__name__}: {e}"
+        if response.is_success:
+            return None
+        return f"HTTP {response.status_code}"
+
+    def _ensure_client(self) -> Tuple[httpx.AsyncClient, asyncio.Semaphore]:
+        if self._client is None or self._semaphore is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+            )
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._client, self._semaphore
+
+    async def dispatch_once(self) -> int:
+        """Deliver the rows due now on every database. Returns how many were delivered."""
+        delivered_total = 0
+        for engine in self.engines():
+            rows = await asyncio.to_thread(self._run_in_transaction, engine, self._claim)
+            if not rows:
+                continue
+            batches = self._batches(rows)
+            errors = await asyncio.gather(*(self._post(subscriber, batch) for subscriber, batch in batches))
+            delivered: List[int] = []
+            failed: List[Tuple[Dict[str, Any], str]] = []
+            for (subscriber, batch), error in zip(batches, errors):
+                if error is None:
+                    delivered.extend(row["id"] for row in batch)
+                else:
+                    logger.warning(f"Webhook delivery of {len(batch)} events to {subscriber} failed: {error}")
+                    failed.extend((row, error) for row in batch)
+            await asyncio.to_thread(
+                self._run_in_transaction, engine, lambda connection: self._record(connection, delivered, failed)
+            )
+
+            dead = sum(1 for row, _ in failed if row["attempts"] + 1 >= self.max_attempts)
+            metrics.inc("webhook.delivered", len(delivered))
+            metrics.inc("webhook.failures", len(failed))
+            metrics.inc("webhook.dead_lettered", dead)
+            delivered_total += len(delivered)
+        return delivered_total
+
+    def stats(self) -> Dict[str, int]:
+        """Pending and dead-lettered events over every database."""
+        counts = {"pending": 0, "dead_lettered": 0}
+        for engine in self.engines():
+            rows = self._run_in_transaction(
+                engine, lambda connection: connection.execute(
+                    select(outbox.c.dead, func.count()).group_by(outbox.c.dead)
+                ).all()
+            )
+            for dead, count in rows:
+                counts["dead_lettered" if dead else "pending"] += count
+        return counts
+
+    def redeliver_dead(self) -> int:
+        """Put every dead-lettered event back in the queue with fresh attempts. Returns how many."""
+        statement = (
+            update(outbox)
+            .where(outbox.c.dead == True)
+            .values(dead=False, attempts=0, next_attempt_at=utcnow())
+        )
+        return sum(
+            self._run_in_transaction(engine, lambda connection: connection.execute(statement).rowcount)
+            for engine in self.engines()
+        )
+
+    async def _run_forever(self, wake: asyncio.Event) -> None:
+        while True:
+            try:
+                delivered = await self.dispatch_once()
+            except DatabaseError:
+                delivered = 0
+            if delivered < self.batch_size * self.concurrency:
+                # Caught up: sleep until the next commit or poll, then linger so that a
+                # burst of commits is claimed and delivered as one batch.
+                try:
+                    await asyncio.wait_for(wake.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                await asyncio.sleep(self.linger)
+                wake.clear()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._loop = asyncio.get_running_loop()
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run_forever(self._wake))
+            logger.info(f"Webhook dispatcher started: {self.concurrency} concurrent deliveries")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._loop = None
+        await self.close()
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+webhooks = WebhookDispatcher.from_settings()
+if settings.webhook_urls:
+    crud_task.add_listener(webhooks.notify)
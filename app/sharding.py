@@ -0,0 +1,150 @@
+import contextvars
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, TypeVar
+
+from sqlalchemy import Column, Integer, MetaData, Table, delete, insert
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.horizontal_shard import ShardedSession
+from sqlalchemy.orm import Session, sessionmaker
+
+# Every task id carries its slot in `id % SHARD_SLOTS`; slot `s` lives on shard
+# `s % shard_count`. Ids never change when the shard count does: rebalancing
+# moves whole slots between databases.
+SHARD_SLOTS = 256
+
+# Per-shard id sequence. Rows are deleted right after they are inserted;
+# AUTOINCREMENT still never hands out the same value twice.
+sequence_metadata = MetaData()
+shard_sequence = Table(
+    "shard_sequence",
+    sequence_metadata,
+    Column("seq", Integer, primary_key=True),
+    sqlite_autoincrement=True,
+)
+
+T = TypeVar("T")
+
+
+def shard_urls(template: str, count: int) -> List[str]:
+    return [template.format(shard=shard) for shard in range(count)]
+
+
+def shard_of(id: int, shard_count: int) -> int:
+    return id % SHARD_SLOTS % shard_count
+
+
+def id_for(shard: int, seq: int, shard_count: int) -> int:
+    """The task id for sequence value `seq` of `shard`, spread over the slots that shard owns."""
+    owned = range(shard, SHARD_SLOTS, shard_count)
+    return seq * SHARD_SLOTS + owned[seq % len(owned)]
+
+
+def next_sequence(connection: Connection) -> int:
+    seq = connection.execute(insert(shard_sequence).returning(shard_sequence.c.seq)).scalar_one()
+    connection.execute(delete(shard_sequence).where(shard_sequence.c.seq == seq))
+    return seq
+
+
+def advance_sequence(connection: Connection, floor: int) -> None:
+    """Make sure the shard's sequence continues above `floor` (never moves it back)."""
+    connection.execute(insert(shard_sequence).values(seq=floor))
+    connection.execute(delete(shard_sequence).where(shard_sequence.c.seq == floor))
+
+
+class ShardRouter:
+    """
+    Routes task rows to one of several databases by the shard encoded in their id.
+
+    `sessionmaker` builds request sessions that send primary-key lookups and
+    writes of loaded objects to the owning shard and run any other statement
+    on every shard. `scatter` runs a function on every shard in parallel, each
+    with its own plain session, for reads that are merged in Python.
+    """
+
+    def __init__(self, engines: List[Engine]):
+        if not 0 < len(engines) <= SHARD_SLOTS:
+            raise ValueError(f"Between 1 and {SHARD_SLOTS} shards are supported")
+        self.engines = engines
+        self.shard_ids = [str(shard) for shard in range(len(engines))]
+        self._sessionmakers = [
+            sessionmaker(autocommit=False, autoflush=False, bind=engine) for engine in engines
+        ]
+        self._next_shard = itertools.count()
+        self._executor = ThreadPoolExecutor(max_workers=len(engines), thread_name_prefix="shard")
+        self.sessionmaker = sessionmaker(
+            class_=ShardedSession,
+            autocommit=False,
+            autoflush=False,
+            shards=dict(zip(self.shard_ids, engines)),
+            shard_chooser=self._choose_shard,
+            identity_chooser=self._identity_shards,
+            execute_chooser=self._execute_shards,
+        )
+
+    @property
+    def shard_count(self) -> int:
+        return len(self.engines)
+
+    def shard_for_id(self, id: int) -> str:
+        return self.shard_ids[shard_of(id, self.shard_count)]
+
+    def _choose_shard(self, mapper, instance, **kw) -> str:
+        # Every sharded table is keyed by the task id: its primary key (`tasks.id`,
+        # `task_descriptions.task_id`, ...) or the column named by the model's `shard_key`.
+        shard_key = getattr(mapper.class_, "shard_key", None)
+        if instance is None:
+            key = None
+        elif shard_key is not None:
+            key = getattr(instance, shard_key)
+        else:
+            key = mapper.primary_key_from_instance(instance)[0]
+        if key is None:
+            raise RuntimeError(f"{mapper.class_.__name__} needs a task id to pick its shard")
+        return self.shard_for_id(key)
+
+    def _identity_shards(self, mapper, primary_key, *, lazy_loaded_from=None, **kw) -> List[str]:
+        if lazy_loaded_from is not None:
+            return [lazy_loaded_from.identity_token]
+        return [self.shard_for_id(primary_key[0])]
+
+    def _execute_shards(self, orm_context) -> List[str]:
+        if orm_context.is_select and orm_context.lazy_loaded_from is not None:
+            return [orm_context.lazy_loaded_from.identity_token]
+        return self.shard_ids
+
+    def allocate_id(self, db: Session) -> int:
+        """Reserve a new task id on the next shard (round robin), inside `db`'s transaction."""
+        shard = next(self._next_shard) % self.shard_count
+        connection = db.connection(bind_arguments={"shard_id": self.shard_ids[shard]})
+        return id_for(shard, next_sequence(connection), self.shard_count)
+
+    def sessions(self) -> List[Session]:
+        return [maker() for maker in self._sessionmakers]
+
+    def scatter(self, fn: Callable[[Session], T]) -> List[T]:
+        """
+        Run `fn` against every shard in parallel and return the results in shard order.
+
+        `fn` gets a session bound to one shard, whose `info["shard_id"]` names it.
+        """
+
+        def run(shard_id: str, maker: sessionmaker) -> T:
+            with maker(info={"shard_id": shard_id}) as db:
+                return fn(db)
+
+        # Each call gets a copy of the caller's context so request deadlines and tracing follow it.
+        futures = [
+            self._executor.submit(contextvars.copy_context().run, run, shard_id, maker)
+            for shard_id, maker in zip(self.shard_ids, self._sessionmakers)
+        ]
+        return [future.result() for future in futures]
+
+    def create_all(self, metadata: MetaData) -> None:
+        for engine in self.engines:
+            metadata.create_all(bind=engine)
+            sequence_metadata.create_all(bind=engine)
+
+    def dispose(self, close: bool = True) -> None:
+        for engine in self.engines:
+            engine.dispose(close=close)
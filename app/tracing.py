@@ -0,0 +1,428 @@
+import functools
+import inspect
+import json
+import os
+import random
+import re
+import threading
+import time
+import urllib.request
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.middleware import Middleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import settings
+from app.logging_config import get_logger
+
+logger = get_logger("tracing")
+
+# OTLP span kinds.
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+# OTLP status codes.
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], kind: int = SPAN_KIND_INTERNAL):
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes: Dict[str, Any] = {}
+        self.error: Optional[str] = None
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_otlp_attribute(key, value) for key, value in self.attributes.items()],
+            "status": {"code": STATUS_ERROR, "message": self.error} if self.error else {"code": STATUS_OK},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class BatchSpanExporter:
+    """
+    Buffers finished spans and writes them in batches from a background thread.
+
+    Each batch is one OTLP/JSON `ExportTraceServiceRequest`: appended as a line
+    to a local file (the format of the OpenTelemetry collector file exporter),
+    or POSTed to an OTLP/HTTP endpoint when the target is an http(s) URL. When
+    the buffer is full the oldest spans are dropped rather than blocking requests.
+    """
+
+    def __init__(
+            self,
+            target: str,
+            *,
+            batch_size: int = 512,
+            interval: float = 5.0,
+            max_queue_size: int = 2048,
+            service_name: str = "saber-task-api",
+    ):
+        self.target = target
+        self.batch_size = batch_size
+        self.interval = interval
+        self.service_name = service_name
+        self.dropped = 0
+        self._queue: Deque[Span] = deque(maxlen=max_queue_size)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+            self._thread.start()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            if len(self._queue) == self._queue.maxlen:
+                self.dropped += 1
+            self._queue.append(span)
+            full = len(self._queue) >= self.batch_size
+        if full:
+            self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> int:
+        exported = 0
+        while True:
+            with self._lock:
+                batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+            if not batch:
+                return exported
+            try:
+                self._write(self.encode(batch))
+                exported += len(batch)
+            except Exception as e:
+                logger.warning(f"Dropping {len(batch)} spans, export to {self.target} failed: {e}")
+
+    def shutdown(self) -> None:
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
+        self.flush()
+
+    def encode(self, batch: List[Span]) -> bytes:
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", self.service_name)]},
+                "scopeSpans": [{"scope": {"name": "app.tracing"}, "spans": [span.to_otlp() for span in batch]}],
+            }]
+        }
+        return json.dumps(payload, separators=(",", ":")).encode()
+
+    def _write(self, body: bytes) -> None:
+        if self.target.startswith(("http://", "https://")):
+            request = urllib.request.Request(
+                self.target, data=body, headers={"Content-Type": "application/json"}, method="POST"
+            )
+            urllib.request.urlopen(request, timeout=self.interval).close()
+            return
+        directory = os.path.dirname(self.target)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.target, "ab") as f:
+            f.write(body + b"\n")
+
+
+class Tracer:
+    """
+    Minimal tracer: spans nest through `current_span`, and only requests that
+    were sampled at the root create child spans at all.
+    """
+
+    def __init__(self, exporter: BatchSpanExporter, sample_rate: float = 1.0):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+
+    def start_trace(self, name: str, traceparent: Optional[str] = None) -> Optional[Span]:
+        """
+        Start a root (server) span, continuing the caller's trace when a valid
+        W3C `traceparent` is given. The caller's sampling decision wins; new
+        traces are sampled at `sample_rate`. Returns None when not sampled.
+        """
+        match = TRACEPARENT.match(traceparent.strip().lower()) if traceparent else None
+        if match and match.group(1) != "0" * 32:
+            trace_id, parent_id, flags = match.groups()
+            if not int(flags, 16) & 1:
+                return None
+        else:
+            if random.random() >= self.sample_rate:
+                return None
+            trace_id, parent_id = f"{random.getrandbits(128):032x}", None
+        return Span(name, trace_id, parent_id, SPAN_KIND_SERVER)
+
+    def start_span(self, name: str, kind: int = SPAN_KIND_INTERNAL) -> Optional[Span]:
+        parent = current_span.get()
+        if parent is None:
+            return None
+        return Span(name, parent.trace_id, parent.span_id, kind)
+
+    def end_span(self, span: Span, error: Optional[BaseException] = None) -> None:
+        span.end_ns = time.time_ns()
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"
+        self.exporter.export(span)
+
+    @contextmanager
+    def span(self, name: str, kind: int = SPAN_KIND_INTERNAL) -> Iterator[Optional[Span]]:
+        span = self.start_span(name, kind)
+        if span is None:
+            yield None
+            return
+        token = current_span.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            self.end_span(span, exc)
+            raise
+        else:
+            self.end_span(span)
+        finally:
+            current_span.reset(token)
+
+
+def _route_template(scope) -> Optional[str]:
+    """
+    Full path template of the matched route, e.g. `/api/v1/tasks/{task_id}/`.
+
+    Routes of included routers only know their path below the router prefix,
+    so the prefix is recovered as the part of the request path in front of
+    the segment the route matched.
+    """
+    route = scope.get("route")
+    path_regex = getattr(route, "path_regex", None)
+    if path_regex is None:
+        return None
+    path = scope["path"]
+    for index, char in enumerate(path):
+        if char == "/" and path_regex.match(path[index:]):
+            return path[:index] + route.path
+    return route.path
+
+
+class TracingMiddleware:
+    """Outermost ASGI middleware: opens the server span of each sampled request."""
+
+    def __init__(self, app, tracer: "Tracer"):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = None
+        for key, value in scope.get("headers", ()):
+            if key == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+        span = self.tracer.start_trace(f"{scope['method']} {scope['path']}", traceparent)
+        if span is None:
+            await self.app(scope, receive, send)
+            return
+
+        span.attributes.update({"http.method": scope["method"], "http.target": scope["path"]})
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                span.attributes["http.status_code"] = message["status"]
+            await send(message)
+
+        token = current_span.set(span)
+        error = None
+        try:
+            await self.app(scope, receive, send_with_status)
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            template = _route_template(scope)
+            if template:
+                span.attributes["http.route"] = template
+                span.name = f"{scope['method']} {template}"
+            current_span.reset(token)
+            self.tracer.end_span(span, error)
+
+
+class _MiddlewareStage:
+    """Wraps one middleware of the stack in a span named after it."""
+
+    def __init__(self, app: ASGIApp, /, *args: Any, tracer: "Tracer", stage_cls: Any, stage_name: str, **kwargs: Any):
+        self.inner = stage_cls(app, *args, **kwargs)
+        self.tracer = tracer
+        self.name = f"middleware {stage_name}"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.inner(scope, receive, send)
+            return
+        with self.tracer.span(self.name):
+            await self.inner(scope, receive, send)
+
+
+def traced_dependency(tracer: Tracer, dependency: Callable) -> Callable:
+    """
+    Wrap a FastAPI dependency in a span, keeping its signature for injection.
+
+    For generator dependencies only the setup (up to `yield`) is timed.
+    """
+    name = f"dependency {dependency.__name__}"
+
+    if inspect.isgeneratorfunction(dependency):
+        @functools.wraps(dependency)
+        def generator_wrapper(*args, **kwargs):
+            generator = dependency(*args, **kwargs)
+            with tracer.span(name):
+                value = next(generator)
+            try:
+                yield value
+            except BaseException as exc:
+                generator.throw(exc)
+                raise
+            else:
+                next(generator, None)
+
+        return generator_wrapper
+
+    @functools.wraps(dependency)
+    def wrapper(*args, **kwargs):
+        with tracer.span(name):
+            return dependency(*args, **kwargs)
+
+    return wrapper
+
+
+def traced_route(tracer: Tracer) -> Callable:
+    """
+    Route-level dependency timing FastAPI's handling of a route: from the start
+    of dependency resolution (route-level dependencies are solved first) to the
+    end of the response, when FastAPI closes dependencies with `yield`. The
+    dependency and SQL spans break down the time spent inside it.
+    """
+
+    async def trace_route() -> AsyncIterator[None]:
+        span = tracer.start_span("fastapi.route")
+        if span is None:
+            yield
+            return
+        try:
+            yield
+        except BaseException as exc:
+            tracer.end_span(span, exc)
+            raise
+        else:
+            tracer.end_span(span)
+
+    return trace_route
+
+
+def instrument_engine(tracer: Tracer, engine: Engine) -> None:
+    """Record one client span per SQL statement."""
+    system = engine.dialect.name
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_statement(conn, cursor, statement, parameters, context, executemany):
+        span = tracer.start_span(statement.split(None, 1)[0].upper() if statement else "SQL", SPAN_KIND_CLIENT)
+        if span is not None:
+            span.attributes.update({"db.system": system, "db.statement": statement[:1000]})
+            conn.info.setdefault("trace_spans", []).append(span)
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _end_statement(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get("trace_spans")
+        if spans:
+            span = spans.pop()
+            if cursor.rowcount >= 0:
+                span.attributes["db.rowcount"] = cursor.rowcount
+            tracer.end_span(span)
+
+    @event.listens_for(engine, "handle_error")
+    def _fail_statement(context):
+        spans = context.connection.info.get("trace_spans") if context.connection is not None else None
+        if spans:
+            tracer.end_span(spans.pop(), context.original_exception)
+
+
+tracer = Tracer(
+    BatchSpanExporter(
+        settings.tracing_export_target,
+        batch_size=settings.tracing_batch_size,
+        interval=settings.tracing_export_interval_seconds,
+        max_queue_size=settings.tracing_max_queue_size,
+        service_name=settings.title,
+    ),
+    sample_rate=settings.tracing_sample_rate,
+)
+
+
+def install_tracing(app, engine: Engine, dependencies: List[Callable]) -> None:
+    """
+    Instrument the application. Only called when `tracing_enabled` is set, so a
+    process with tracing off runs none of this code on its request path.
+
+    Must run after every middleware has been added: each one is wrapped in a
+    stage span and the server span middleware goes outermost. Routes are timed
+    by a `traced_route` dependency, declared where their router is included.
+    """
+    app.user_middleware = [
+        Middleware(
+            _MiddlewareStage, *middleware.args, tracer=tracer, stage_cls=middleware.cls,
+            stage_name=getattr(middleware.kwargs.get("dispatch"), "__name__", None) or middleware.cls.__name__,
+            **middleware.kwargs
+        )
+        for middleware in app.user_middleware
+    ]
+    app.add_middleware(TracingMiddleware, tracer=tracer)
+    for dependency in dependencies:
+        app.dependency_overrides[dependency] = traced_dependency(tracer, dependency)
+    instrument_engine(tracer, engine)
+    logger.info(f"Tracing enabled: sample rate {tracer.sample_rate}, exporting to {tracer.exporter.target}")
\ No newline at end of file
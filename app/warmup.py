@@ -0,0 +1,81 @@
+from datetime import datetime
+from typing import Any, Dict
+
+from app.config import settings
+from app.crud.statements import FILTER_SHAPES
+from app.crud.task import task as crud_task
+from app.database import SessionLocal, engine
+from app.logging_config import get_logger
+from app.schemas.base import PaginatedResponse
+from app.schemas.task import TaskOut, TaskSummary
+
+logger = get_logger("warmup")
+
+
+def prewarm_pool(connections: int) -> int:
+    """Open up to `connections` pooled connections at once so first requests skip connect()."""
+    pool_size = engine.pool.size() if hasattr(engine.pool, "size") else connections
+    opened = []
+    try:
+        for _ in range(max(1, min(connections, pool_size))):
+            connection = engine.connect()
+            opened.append(connection)
+            connection.exec_driver_sql("SELECT 1")
+    finally:
+        for connection in opened:
+            connection.close()
+    return len(opened)
+
+
+def precompile_statements() -> None:
+    """
+    Run every statement variant once so it lands in the compiled cache.
+
+    List variants run with a zero limit, which returns before touching rows.
+    Search (`q`) counts are left out: they scan the table and would make
+    start-up time grow with the data.
+    """
+    db = SessionLocal()
+    try:
+        crud_task.get(db, id=0)
+        for has_completed, has_priority, has_q, tag_match in FILTER_SHAPES:
+            filters: Dict[str, Any] = dict(
+                completed=True if has_completed else None,
+                priority=1 if has_priority else None,
+                q="warmup" if has_q else None,
+                tags=["warmup"] if tag_match else None,
+                tag_match=tag_match or "any",
+            )
+            crud_task.get_by_filters(db, **filters, limit=0)
+            if not has_q:
+                crud_task.count_by_filters(db, **filters)
+        crud_task.get_summary(db)
+    finally:
+        db.close()
+
+
+def prewarm_serializers() -> None:
+    now = datetime.now()
+    sample = TaskOut(
+        id=0, title="warmup", description=None, priority=1, due_date=now,
+        completed=False, created_at=now, updated_at=now
+    )
+    TaskOut.model_validate(sample.model_dump()).model_dump_json()
+    PaginatedResponse.create(items=[sample], total=1, page=1, size=1).model_dump_json()
+    TaskSummary(
+        total_tasks=0, completed_tasks=0, pending_tasks=0, high_priority_tasks=0, overdue_tasks=0
+    ).model_dump_json()
+
+
+def warm_up() -> None:
+    """
+    Best-effort warm-up run from the lifespan before the app starts serving,
+    so a worker only becomes reachable (and ready) once it is warm.
+    """
+    try:
+        connections = prewarm_pool(settings.warmup_connections)
+        precompile_statements()
+        prewarm_serializers()
+        logger.info(f"Warm-up complete ({connections} pooled connections)")
+    except Exception as e:
+        logger.warning(f"Warm-up failed, continuing cold: {e}")
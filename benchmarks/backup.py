@@ -0,0 +1,111 @@
+"""
+Online backup latency benchmark.
+
+Seeds a SQLite database, then runs indexed task reads and small writes
+from several client threads, once with no backup and once while
+`BackupManager.create` copies the database again and again, and compares
+the p50/p99 request latency.
+
+Usage: PYTHONPATH=. python benchmarks/backup.py [--rows 200000] [--threads 4] [--seconds 5] [--pages-per-step 64]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+from sqlalchemy import text
+
+from app.database import Base, make_engine
+from app.metrics import metrics
+from app.services.backup import BackupManager
+
+
+def seed(engine, rows: int) -> None:
+    rng = random.Random(7)
+    with engine.begin() as connection:
+        connection.exec_driver_sql("PRAGMA journal_mode = WAL")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(
+            text("INSERT INTO tasks (title, priority, completed) VALUES (:title, :priority, 0)"),
+            [{"title": f"Task {i} " + "x" * rng.randint(50, 400), "priority": rng.randint(1, 3)} for i in range(rows)],
+        )
+
+
+def latencies(engine, rows: int, threads: int, seconds: float) -> list:
+    samples = [[] for _ in range(threads)]
+    stop = time.perf_counter() + seconds
+
+    def worker(index: int) -> None:
+        rng = random.Random(index)
+        while time.perf_counter() < stop:
+            started = time.perf_counter()
+            with engine.begin() as connection:
+                if rng.random() < 0.1:
+                    connection.execute(
+                        text("UPDATE tasks SET completed = 1 WHERE id = :id"), {"id": rng.randint(1, rows)}
+                    )
+                else:
+                    connection.execute(
+                        text("SELECT * FROM tasks WHERE id > :id ORDER BY id LIMIT 20"), {"id": rng.randint(1, rows)}
+                    ).all()
+            samples[index].append(time.perf_counter() - started)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return [sample for thread_samples in samples for sample in thread_samples]
+
+
+def report(label: str, samples: list) -> float:
+    p99 = statistics.quantiles(samples, n=100)[98]
+    print(f"{label:>14} {len(samples):>8} {statistics.median(samples) * 1000:>8.2f} {p99 * 1000:>8.2f}")
+    return p99
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--pages-per-step", type=int, default=64)
+    parser.add_argument("--step-pause", type=float, default=0.01)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        seed(engine, args.rows)
+        manager = BackupManager(
+            directory=os.path.join(tmp, "backups"), retention=1, interval=0,
+            pages_per_step=args.pages_per_step, step_pause=args.step_pause, engines=lambda: [engine],
+        )
+        size = os.path.getsize(os.path.join(tmp, "bench.db")) / 2 ** 20
+        print(f"database={size:.0f} MiB threads={args.threads} pages_per_step={args.pages_per_step}")
+        print(f"{'':>14} {'requests':>8} {'p50 ms':>8} {'p99 ms':>8}")
+        baseline = report("no backup", latencies(engine, args.rows, args.threads, args.seconds))
+
+        stop = threading.Event()
+        runs = []
+
+        def back_up() -> None:
+            while not stop.is_set():
+                manager.create()
+                runs.append(manager.last_duration)
+
+        backup_thread = threading.Thread(target=back_up)
+        backup_thread.start()
+        during = report("during backup", latencies(engine, args.rows, args.threads, args.seconds))
+        stop.set()
+        backup_thread.join()
+        print(f"p99 overhead {during / baseline - 1:+.1%}; {len(runs)} backup(s), {metrics.value('backup.restarts')} restart(s), "
+              f"{statistics.mean(runs):.2f}s each")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
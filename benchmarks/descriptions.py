@@ -0,0 +1,139 @@
+"""
+Task description storage benchmark.
+
+Builds two SQLite databases with the same tasks: one with every description
+inline in `tasks` (`DESCRIPTION_STORAGE=inline`) and one with long
+descriptions moved, compressed, to the `task_descriptions` side table
+(`DESCRIPTION_STORAGE=split`), then reports:
+
+- database file size and the size of the `tasks` table itself
+- full scans over the task columns (title search, unindexed status filter)
+- fetching one list page including descriptions
+
+Usage: PYTHONPATH=. python benchmarks/descriptions.py [--rows 50000] [--runs 5]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+
+from app.compression import ZLIB, encode_text
+
+WORDS = (
+    "meeting review budget roadmap customer release migration schedule draft report team design "
+    "deadline feedback invoice deploy incident follow-up notes agenda quarterly estimate backlog"
+).split()
+
+INLINE_SCHEMA = """
+CREATE TABLE tasks (
+    id INTEGER PRIMARY KEY, title VARCHAR(255) NOT NULL, description TEXT, priority INTEGER NOT NULL,
+    due_date DATETIME, completed BOOLEAN NOT NULL,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP, updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+SPLIT_SCHEMA = INLINE_SCHEMA + """
+CREATE TABLE task_descriptions (
+    task_id INTEGER PRIMARY KEY REFERENCES tasks (id) ON DELETE CASCADE,
+    codec VARCHAR(8) NOT NULL, body BLOB NOT NULL
+);
+"""
+
+INDEXES = """
+CREATE INDEX ix_tasks_title ON tasks (title);
+CREATE INDEX ix_tasks_priority ON tasks (priority);
+CREATE INDEX ix_tasks_completed ON tasks (completed);
+"""
+
+SCANS = {
+    "title search": "SELECT id, priority FROM tasks WHERE title LIKE '%report%'",
+    "status filter": "SELECT count(*) FROM tasks NOT INDEXED WHERE completed = 0 AND priority = 1",
+}
+
+PAGE = {
+    "inline": "SELECT * FROM tasks WHERE priority = 1 ORDER BY id DESC LIMIT 50",
+    "split": (
+        "SELECT t.*, d.codec, d.body FROM tasks t LEFT JOIN task_descriptions d ON d.task_id = t.id "
+        "WHERE t.priority = 1 ORDER BY t.id DESC LIMIT 50"
+    ),
+}
+
+
+def make_rows(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    for i in range(count):
+        description = " ".join(rng.choice(WORDS) for _ in range(rng.randint(30, 280)))[:2000]
+        title = f"{rng.choice(WORDS).title()} {rng.choice(WORDS)} #{i}"
+        yield i + 1, title, description if rng.random() < 0.9 else None, rng.randint(1, 3), rng.random() < 0.3
+
+
+def build(path: str, layout: str, rows: int) -> None:
+    connection = sqlite3.connect(path)
+    connection.executescript((INLINE_SCHEMA if layout == "inline" else SPLIT_SCHEMA) + INDEXES)
+    for task_id, title, description, priority, completed in make_rows(rows):
+        codec, body = encode_text(description) if layout == "split" and description is not None else (None, None)
+        connection.execute(
+            "INSERT INTO tasks (id, title, description, priority, completed) VALUES (?, ?, ?, ?, ?)",
+            (task_id, title, None if codec == ZLIB else description, priority, completed)
+        )
+        if codec == ZLIB:
+            connection.execute(
+                "INSERT INTO task_descriptions (task_id, codec, body) VALUES (?, ?, ?)", (task_id, codec, body)
+            )
+    connection.commit()
+    connection.execute("VACUUM")
+    connection.close()
+
+
+def table_bytes(connection: sqlite3.Connection, table: str) -> int:
+    """Size of a table's b-tree, or -1 when SQLite was built without the dbstat table."""
+    try:
+        return connection.execute("SELECT sum(pgsize) FROM dbstat WHERE name = ?", (table,)).fetchone()[0]
+    except sqlite3.OperationalError:
+        return -1
+
+
+def median_ms(path: str, sql: str, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        connection = sqlite3.connect(path)
+        start = time.perf_counter()
+        connection.execute(sql).fetchall()
+        timings.append(time.perf_counter() - start)
+        connection.close()
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {layout: os.path.join(tmp, f"{layout}.db") for layout in ("inline", "split")}
+        for layout, path in paths.items():
+            build(path, layout, args.rows)
+
+        print(f"rows={args.rows} runs={args.runs} (medians)")
+        print(f"{'':<22}{'inline':>12}{'split+zlib':>12}")
+        sizes = {layout: os.path.getsize(path) for layout, path in paths.items()}
+        print(f"{'database file (MiB)':<22}{sizes['inline'] / 2**20:>12.1f}{sizes['split'] / 2**20:>12.1f}")
+        tasks_sizes = {layout: table_bytes(sqlite3.connect(path), "tasks") for layout, path in paths.items()}
+        if tasks_sizes["inline"] >= 0:
+            print(
+                f"{'tasks table (MiB)':<22}{tasks_sizes['inline'] / 2**20:>12.1f}"
+                f"{tasks_sizes['split'] / 2**20:>12.1f}"
+            )
+        for label, sql in SCANS.items():
+            inline_ms, split_ms = (median_ms(paths[layout], sql, args.runs) for layout in ("inline", "split"))
+            print(f"{label + ' (ms)':<22}{inline_ms:>12.2f}{split_ms:>12.2f}  ({inline_ms / split_ms:.1f}x)")
+        inline_ms, split_ms = (median_ms(paths[layout], PAGE[layout], args.runs) for layout in ("inline", "split"))
+        print(f"{'list page (ms)':<22}{inline_ms:>12.2f}{split_ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
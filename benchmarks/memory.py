@@ -0,0 +1,82 @@
+"""
+List-path memory benchmark.
+
+Seeds a SQLite database, enables memory profiling and requests
+`GET /api/v1/tasks/` pages of several sizes one at a time, reporting the
+per-request peak allocation that `log_requests` records (median and max),
+the traced memory left behind after the requests, and the `Task`/`TaskOut`/
+session instances still alive, which should all be zero once the requests
+are done.
+
+Usage: PYTHONPATH=. python benchmarks/memory.py [--rows 5000] [--requests 50] [--sizes 10,50,100]
+"""
+import argparse
+import gc
+import logging
+import os
+import statistics
+import tempfile
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--sizes", default="10,50,100")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    directory = tempfile.mkdtemp()
+    os.environ.update(
+        DATABASE_URL=f"sqlite:///{directory}/memory.db",
+        MEMORY_PROFILING_ENABLED="true",
+        MAX_PAGE_SIZE=str(max(sizes)),
+        COALESCING_ENABLED="false",
+        LOG_LEVEL="WARNING",
+        DEBUG="false",
+    )
+    from fastapi.testclient import TestClient
+    from sqlalchemy import text
+
+    from app.database import engine
+    from app.main import app
+    from app.memory import memory_profiler, object_counts
+
+    peaks = []
+
+    class PeakHandler(logging.Handler):
+        def emit(self, record: logging.LogRecord) -> None:
+            if hasattr(record, "peak_memory_bytes"):
+                peaks.append(record.peak_memory_bytes)
+
+    main_logger = logging.getLogger("app.main")
+    main_logger.addHandler(PeakHandler())
+    main_logger.setLevel(logging.INFO)
+    main_logger.propagate = False
+
+    with TestClient(app) as client:
+        with engine.begin() as connection:
+            connection.execute(
+                text("INSERT INTO tasks (title, priority, completed) VALUES (:title, :priority, 0)"),
+                [{"title": f"Task {i}", "priority": i % 3 + 1} for i in range(args.rows)],
+            )
+        for size in sizes:
+            client.get("/api/v1/tasks/", params={"size": size})
+            gc.collect()
+            traced_before = memory_profiler.traced_memory()[0]
+            peaks.clear()
+            for page in range(1, args.requests + 1):
+                client.get("/api/v1/tasks/", params={"size": size, "page": page})
+            gc.collect()
+            retained = memory_profiler.traced_memory()[0] - traced_before
+            print(
+                f"size {size:4d}: peak per request median {statistics.median(peaks) / 1024:8.1f} KiB, "
+                f"max {max(peaks) / 1024:8.1f} KiB, {statistics.median(peaks) / size / 1024:6.2f} KiB/task; "
+                f"retained after {args.requests} requests {retained / 1024:8.1f} KiB"
+            )
+        gc.collect()
+        print(f"live objects: {object_counts()}")
+
+
+if __name__ == "__main__":
+    main()
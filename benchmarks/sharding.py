@@ -0,0 +1,122 @@
+"""
+Shard count throughput benchmark.
+
+Spreads the same tasks over 1, 2, 4, ... SQLite shard files (ids assigned
+the way `ShardRouter` assigns them) and measures, with several client
+threads, the throughput of:
+
+- get: `crud.task.get` by id, routed to a single shard
+- list: a `GET /tasks/?priority=1&page=3` page, scatter-gathered and k-way merged
+- count q: a search count, which scans every shard in parallel
+- summary: the task summary over both tiers of every shard
+
+Usage: PYTHONPATH=. python benchmarks/sharding.py [--rows 100000] [--shards 1,2,4,8] [--threads 8] [--seconds 3]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+
+from app.compression import encode_text
+from app.crud.sharded import ShardedCRUDTask
+from app.database import Base, make_engine
+from app.models.task import Task
+from app.sharding import ShardRouter, id_for
+
+WORDS = (
+    "meeting review budget roadmap customer release migration schedule draft report team design "
+    "deadline feedback invoice deploy incident follow-up notes agenda quarterly estimate backlog"
+).split()
+
+
+def seed(paths: list, rows: int, seed: int = 7) -> list:
+    """Insert `rows` tasks round robin over the shard files; returns every id."""
+    rng = random.Random(seed)
+    connections = [sqlite3.connect(path) for path in paths]
+    ids = []
+    for i in range(rows):
+        shard = i % len(paths)
+        task_id = id_for(shard, i // len(paths) + 1, len(paths))
+        ids.append(task_id)
+        codec, body = encode_text(" ".join(rng.choice(WORDS) for _ in range(rng.randint(10, 80))))
+        connection = connections[shard]
+        connection.execute(
+            "INSERT INTO tasks (id, title, priority, completed, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, datetime('now', ?), datetime('now'))",
+            (task_id, f"{rng.choice(WORDS).title()} #{i}", rng.randint(1, 3), rng.random() < 0.3, f"-{i} seconds"),
+        )
+        connection.execute("INSERT INTO task_descriptions (task_id, codec, body) VALUES (?, ?, ?)", (task_id, codec, body))
+    for connection in connections:
+        connection.commit()
+        connection.execute("ANALYZE")
+        connection.close()
+    return ids
+
+
+def throughput(fn, threads: int, seconds: float) -> float:
+    done = [0] * threads
+    stop = time.perf_counter() + seconds
+
+    def worker(index: int) -> None:
+        while time.perf_counter() < stop:
+            fn()
+            done[index] += 1
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return sum(done) / seconds
+
+
+def measure(shard_count: int, rows: int, threads: int, seconds: float) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [os.path.join(tmp, f"shard_{shard}.db") for shard in range(shard_count)]
+        router = ShardRouter([make_engine(f"sqlite:///{path}") for path in paths])
+        router.create_all(Base.metadata)
+        ids = seed(paths, rows)
+        crud = ShardedCRUDTask(Task, router=router)
+        rng = random.Random(1)
+
+        def get():
+            with router.sessionmaker() as db:
+                crud.get(db, rng.choice(ids))
+
+        def list_page():
+            crud.get_by_filters(None, priority=1, skip=100, limit=50)
+
+        results = {
+            "get": throughput(get, threads, seconds),
+            "list": throughput(list_page, threads, seconds),
+            "count q": throughput(lambda: crud.count_by_filters(None, q="quarterly report"), threads, seconds),
+            "summary": throughput(lambda: crud.get_summary(None), threads, seconds),
+        }
+        router.dispose()
+        return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--shards", default="1,2,4,8")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    baseline = None
+    print(f"rows={args.rows} threads={args.threads} (requests/s)")
+    print(f"{'shards':>6} {'get':>10} {'list':>10} {'count q':>10} {'summary':>10}")
+    for shard_count in (int(value) for value in args.shards.split(",")):
+        results = measure(shard_count, args.rows, args.threads, args.seconds)
+        baseline = baseline or results
+        print(f"{shard_count:>6} " + " ".join(
+            f"{results[name]:>7.0f} {results[name] / baseline[name]:>4.1f}x" for name in results
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Import-time and start-up benchmark.
+
+Runs each measurement in a fresh interpreter against a temporary SQLite
+database migrated to the Alembic head and seeded with tasks:
+
+- import: wall time of `import app.main`, which optional heavy modules it pulled in, and
+  what the modules it now defers (NumPy, msgpack, pyarrow) would add if imported eagerly
+- schema: `create_tables()` (SCHEMA_MODE=create) vs `schema_is_current()` (SCHEMA_MODE=verify)
+- first request: latency of the first `GET /api/v1/tasks/` in a cold process vs after `warm_up()`
+
+Usage: PYTHONPATH=. python benchmarks/startup.py [--rows 20000] [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "heavy": [m for m in ("numpy", "pyarrow", "msgpack", "alembic") if m in sys.modules]}))
+"""
+
+DEFERRED_PROBE = """
+import json, time
+import app.main
+start = time.perf_counter()
+import numpy, msgpack, pyarrow
+print(json.dumps({"seconds": time.perf_counter() - start}))
+"""
+
+SCHEMA_PROBE = """
+import json, time
+import app.database as database
+start = time.perf_counter()
+database.create_tables() if "{mode}" == "create" else database.schema_is_current()
+print(json.dumps({{"seconds": time.perf_counter() - start}}))
+"""
+
+REQUEST_PROBE = """
+import json, time
+from fastapi.testclient import TestClient
+import app.main
+from app.warmup import warm_up
+if {warm}:
+    warm_up()
+client = TestClient(app.main.app)
+client.get("/api/v1/health/liveness")  # exclude the test client's own start-up
+start = time.perf_counter()
+client.get("/api/v1/tasks/?priority=1")
+print(json.dumps({{"seconds": time.perf_counter() - start}}))
+"""
+
+
+def run_probe(code: str, env: dict) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def median_seconds(code: str, env: dict, runs: int) -> float:
+    return statistics.median(run_probe(code, env)["seconds"] for _ in range(runs))
+
+
+def prepare_database(path: str, rows: int, env: dict) -> None:
+    subprocess.run(["alembic", "upgrade", "head"], cwd=ROOT, env=env, check=True, capture_output=True)
+    seed = f"""
+import random
+from app.database import SessionLocal
+from app.models.task import Task
+db = SessionLocal()
+db.add_all(Task(title=f"Task {{i}}", priority=random.randint(1, 3), completed=random.random() < 0.3) for i in range({rows}))
+db.commit()
+"""
+    subprocess.run([sys.executable, "-c", seed], cwd=ROOT, env=env, check=True, capture_output=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(
+            os.environ,
+            PYTHONPATH=ROOT,
+            DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            DEBUG="false",
+            LOG_LEVEL="WARNING",
+            WARMUP_ENABLED="false",
+            ADMISSION_ENABLED="false",
+        )
+        prepare_database(os.path.join(tmp, "bench.db"), args.rows, env)
+
+        imported = run_probe(IMPORT_PROBE, env)
+        import_seconds = median_seconds(IMPORT_PROBE, env, args.runs)
+        deferred_seconds = median_seconds(DEFERRED_PROBE, env, args.runs)
+        create_seconds = median_seconds(SCHEMA_PROBE.format(mode="create"), env, args.runs)
+        verify_seconds = median_seconds(SCHEMA_PROBE.format(mode="verify"), env, args.runs)
+        cold_seconds = median_seconds(REQUEST_PROBE.format(warm=False), env, args.runs)
+        warm_seconds = median_seconds(REQUEST_PROBE.format(warm=True), env, args.runs)
+
+    print(f"rows={args.rows} runs={args.runs} (medians)")
+    print(f"import app.main          {import_seconds * 1000:8.1f} ms  heavy modules loaded: {imported['heavy'] or 'none'}")
+    print(f"deferred imports saved   {deferred_seconds * 1000:8.1f} ms")
+    print(f"schema: create_tables    {create_seconds * 1000:8.1f} ms")
+    print(f"schema: verify head      {verify_seconds * 1000:8.1f} ms")
+    print(f"first request, cold      {cold_seconds * 1000:8.1f} ms")
+    print(f"first request, warmed    {warm_seconds * 1000:8.1f} ms  ({cold_seconds / warm_seconds:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
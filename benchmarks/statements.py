@@ -0,0 +1,121 @@
+"""
+Statement-construction microbenchmark.
+
+Compares the CPU cost per request of the list + count pair (and of the
+summary) when statements are rebuilt on every call, as `get_by_filters`,
+`count_by_filters` and `get_summary` used to do, against the precompiled
+variant table in `app.crud.statements`. Runs against an in-memory SQLite
+database so the numbers are dominated by Python-side work.
+
+Usage: PYTHONPATH=. python benchmarks/statements.py [--rows 200] [--requests 5000]
+"""
+import argparse
+import itertools
+import time
+from datetime import datetime
+
+from sqlalchemy import and_, create_engine, event, func, or_, select
+from sqlalchemy.engine.default import CACHE_HIT
+from sqlalchemy.orm import Session
+
+from app.crud.statements import task_statements
+from app.database import Base
+from app.models.task import Task
+
+FILTERS = list(itertools.product((None, True, False), (None, 1, 2, 3), (None, "report")))
+
+
+def rebuilt_page(db: Session, completed, priority, q, skip: int, limit: int):
+    conditions = []
+    if completed is not None:
+        conditions.append(Task.completed == completed)
+    if priority is not None:
+        conditions.append(Task.priority == priority)
+    if q:
+        conditions.append(or_(Task.title.ilike(f"%{q}%"), Task.description.ilike(f"%{q}%")))
+    stmt = select(Task)
+    if conditions:
+        stmt = stmt.where(and_(*conditions))
+    stmt = stmt.offset(skip).limit(limit).order_by(Task.priority.asc(), Task.created_at.desc(), Task.id.desc())
+    items = db.execute(stmt).scalars().all()
+    count = select(func.count(Task.id))
+    if conditions:
+        count = count.where(and_(*conditions))
+    return items, db.execute(count).scalar()
+
+
+def variant_page(db: Session, completed, priority, q, skip: int, limit: int):
+    stmt, params = task_statements.list_tasks(completed=completed, priority=priority, q=q, skip=skip, limit=limit)
+    items = db.execute(stmt, params).scalars().all()
+    stmt, params = task_statements.count_tasks(completed=completed, priority=priority, q=q)
+    return items, db.execute(stmt, params).scalar()
+
+
+def rebuilt_summary(db: Session):
+    now = datetime.now()
+    return (
+        db.execute(select(func.count(Task.id))).scalar(),
+        db.execute(select(func.count(Task.id)).where(Task.completed == True)).scalar(),
+        db.execute(select(func.count(Task.id)).where(Task.priority == 1)).scalar(),
+        db.execute(select(func.count(Task.id)).where(and_(Task.due_date < now, Task.completed == False))).scalar(),
+    )
+
+
+def variant_summary(db: Session):
+    return tuple(db.execute(task_statements.summary, {"now": datetime.now()}).one())
+
+
+def cpu_per_call(fn, calls) -> float:
+    start = time.process_time()
+    for args in calls:
+        fn(*args)
+    return (time.process_time() - start) / len(calls)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    cache = {"hits": 0, "total": 0}
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def count_cache_hits(conn, cursor, statement, parameters, context, executemany):
+        cache["total"] += 1
+        cache["hits"] += context.cache_hit is CACHE_HIT
+
+    db = Session(engine)
+    db.add_all(
+        Task(title=f"Report {i}" if i % 7 == 0 else f"Task {i}", priority=i % 3 + 1, completed=i % 4 == 0)
+        for i in range(args.rows)
+    )
+    db.commit()
+
+    calls = [(db, *FILTERS[i % len(FILTERS)], (i % 5) * 10, 10) for i in range(args.requests)]
+    summaries = [(db,)] * (args.requests // 5)
+    assert rebuilt_page(*calls[7]) == variant_page(*calls[7])
+    assert rebuilt_summary(db) == variant_summary(db)
+
+    print(f"rows={args.rows} requests={args.requests} filter combinations={len(FILTERS)}")
+    for label, rebuilt, variant, workload in (
+        ("list + count", rebuilt_page, variant_page, calls),
+        ("summary", rebuilt_summary, variant_summary, summaries),
+    ):
+        # Interleave the two passes twice and keep the faster one to damp noise.
+        rebuilt_cpu = variant_cpu = float("inf")
+        for _ in range(2):
+            rebuilt_cpu = min(rebuilt_cpu, cpu_per_call(rebuilt, workload))
+            variant_cpu = min(variant_cpu, cpu_per_call(variant, workload))
+        print(
+            f"{label:<13} rebuilt {rebuilt_cpu * 1e6:7.1f} us  variant table {variant_cpu * 1e6:7.1f} us  "
+            f"saved {(rebuilt_cpu - variant_cpu) * 1e6:6.1f} us/request"
+        )
+
+    print(f"compiled cache hit rate {cache['hits'] / cache['total']:.1%} ({cache['total']} statements)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,4 @@
-from app.config import settings
+from app.server import run
 
 if __name__ == "__main__":
-    import uvicorn
-
-    uvicorn.run(
-        "app.main:app",
-        host=settings.host,
-        port=settings.port,
-        reload=settings.debug,
-        log_level=settings.log_level.lower()
-    )
\ No newline at end of file
+    run()
\ No newline at end of file
@@ -6,7 +6,7 @@ from sqlalchemy.pool import StaticPool
 
 from app.main import app
 from app.database import Base, get_db
-from app.config import Settings
+from app.config import Settings, settings
 
 
 # Test database setup
@@ -50,6 +50,13 @@ def client(test_db):
     app.dependency_overrides.clear()
 
 
+@pytest.fixture
+def admin_client(client, monkeypatch):
+    monkeypatch.setattr(settings, "admin_token", "test-admin-token")
+    client.headers["Authorization"] = "Bearer test-admin-token"
+    return client
+
+
 @pytest.fixture
 def test_settings():
     return Settings(
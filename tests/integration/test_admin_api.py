@@ -0,0 +1,25 @@
+from fastapi.testclient import TestClient
+
+from app.config import settings
+
+
+def test_admin_metrics(admin_client: TestClient):
+    response = admin_client.get("/api/v1/admin/metrics")
+    assert response.status_code == 200
+
+    data = response.json()
+    assert set(data["admission"]) == {"cheap", "expensive", "default"}
+    assert data["admission"]["cheap"]["in_flight"] == 0
+
+
+def test_admin_routes_are_off_without_a_token(client: TestClient):
+    assert settings.admin_token is None
+    assert client.get("/api/v1/admin/metrics").status_code == 404
+    assert client.post("/api/v1/admin/archive").status_code == 404
+
+
+def test_admin_routes_require_the_token(admin_client: TestClient):
+    admin_client.headers["Authorization"] = "Bearer wrong"
+    assert admin_client.post("/api/v1/admin/maintenance").status_code == 401
+    del admin_client.headers["Authorization"]
+    assert admin_client.get("/api/v1/admin/metrics").status_code == 401
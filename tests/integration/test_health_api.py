@@ -21,4 +21,4 @@ def test_readiness_check(client: TestClient):
 def test_liveness_check(client: TestClient):
     response = client.get("/api/v1/health/liveness")
     assert response.status_code == 200
-    assert response.json()["status"] == "alive"
\ No newline at end of file
+    assert response.json()["status"] == "alive"
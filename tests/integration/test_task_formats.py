@@ -0,0 +1,57 @@
+import io
+
+import pytest
+from fastapi.testclient import TestClient
+
+msgpack = pytest.importorskip("msgpack")
+pa = pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def tasks(client: TestClient):
+    for i, priority in enumerate((2, 1, 3)):
+        client.post("/api/v1/tasks/", json={"title": f"Task {i}", "priority": priority})
+
+
+class TestTaskFormats:
+    def test_list_tasks_msgpack(self, client: TestClient, tasks):
+        response = client.get("/api/v1/tasks/", headers={"Accept": "application/msgpack"})
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/msgpack"
+
+        payload = msgpack.unpackb(response.content)
+        assert payload["total"] == 3
+        rows = [dict(zip(payload["columns"], row)) for row in payload["rows"]]
+        assert [row["priority"] for row in rows] == [1, 2, 3]
+
+    def test_list_tasks_arrow(self, client: TestClient, tasks):
+        response = client.get("/api/v1/tasks/?size=2", headers={"Accept": "application/vnd.apache.arrow.stream"})
+        assert response.status_code == 200
+
+        table = pa.ipc.open_stream(io.BytesIO(response.content)).read_all()
+        assert table.num_rows == 2
+        assert table.column("priority").to_pylist() == [1, 2]
+        assert table.schema.metadata[b"total"] == b"3"
+
+    def test_json_remains_default(self, client: TestClient, tasks):
+        response = client.get("/api/v1/tasks/", headers={"Accept": "text/html, */*;q=0.8"})
+        assert response.headers["content-type"] == "application/json"
+        assert response.json()["total"] == 3
+
+    def test_unsupported_media_type(self, client: TestClient):
+        response = client.get("/api/v1/tasks/", headers={"Accept": "text/csv"})
+        assert response.status_code == 406
+
+    def test_export_formats(self, client: TestClient, tasks):
+        response = client.get("/api/v1/tasks/export?priority=1")
+        assert [task["title"] for task in response.json()] == ["Task 1"]
+
+        response = client.get("/api/v1/tasks/export", headers={"Accept": "application/msgpack"})
+        unpacker = msgpack.Unpacker(io.BytesIO(response.content))
+        columns, *rows = list(unpacker)
+        assert columns[0] == "id"
+        assert len(rows) == 3
+
+        response = client.get("/api/v1/tasks/export", headers={"Accept": "application/vnd.apache.arrow.stream"})
+        table = pa.ipc.open_stream(io.BytesIO(response.content)).read_all()
+        assert table.column("title").to_pylist() == ["Task 1", "Task 0", "Task 2"]
@@ -223,4 +223,139 @@ class TestTasksAPI:
         # Both tasks containing "meeting" should be returned
         titles = [item["title"] for item in data["items"]]
         assert "Important Meeting" in titles
-        assert "Meeting with Client" in titles
\ No newline at end of file
+        assert "Meeting with Client" in titles
+
+    def test_task_analytics(self, client: TestClient):
+        tasks = [
+            {"title": "Overdue", "priority": 1, "due_date": (datetime.now() - timedelta(days=3)).isoformat()},
+            {"title": "Due later", "priority": 1, "due_date": (datetime.now() + timedelta(days=3)).isoformat()},
+            {"title": "No due date", "priority": 2},
+        ]
+        ids = [client.post("/api/v1/tasks/", json=task).json()["id"] for task in tasks]
+        client.put(f"/api/v1/tasks/{ids[1]}/", json={"completed": True})
+
+        response = client.get("/api/v1/tasks/analytics?interval=week")
+        assert response.status_code == 200
+
+        data = response.json()
+        by_priority = {row["priority"]: row for row in data["completion_by_priority"]}
+        assert by_priority[1] == {"priority": 1, "total": 2, "completed": 1, "completion_rate": 0.5}
+        assert by_priority[3]["total"] == 0
+        assert {row["label"]: row["count"] for row in data["overdue_by_age"]}["1-7d"] == 1
+        assert sum(row["count"] for row in data["due_date_histogram"]) == 2
+        assert sum(row["created"] for row in data["throughput"]) == 3
+        assert sum(row["completed"] for row in data["throughput"]) == 1
+
+        # Cached results are dropped on the next write.
+        client.delete(f"/api/v1/tasks/{ids[2]}/")
+        data = client.get("/api/v1/tasks/analytics?interval=week").json()
+        assert sum(row["created"] for row in data["throughput"]) == 2
+
+    def test_list_tasks_with_facets(self, client: TestClient):
+        tasks = [
+            {"title": "Meeting A", "priority": 1},
+            {"title": "Meeting B", "priority": 2},
+            {"title": "Meeting C", "priority": 2},
+            {"title": "Groceries", "priority": 3},
+        ]
+        ids = [client.post("/api/v1/tasks/", json=task).json()["id"] for task in tasks]
+        client.put(f"/api/v1/tasks/{ids[1]}/", json={"completed": True})
+
+        response = client.get("/api/v1/tasks/?q=meeting&priority=2&facets=priority,completed")
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["total"] == 2
+        assert len(data["items"]) == 2
+        # Each facet ignores its own filter but honours the others.
+        assert data["facets"]["priority"] == {"1": 1, "2": 2, "3": 0}
+        assert data["facets"]["completed"] == {"true": 1, "false": 1}
+
+    def test_list_tasks_unknown_facet(self, client: TestClient):
+        response = client.get("/api/v1/tasks/?facets=title")
+        assert response.status_code == 400
+
+    def test_query_tasks(self, client: TestClient):
+        now = datetime.now()
+        tasks = [
+            {"title": "Due tomorrow", "priority": 1, "due_date": (now + timedelta(days=1)).isoformat()},
+            {"title": "Due in 3 days", "priority": 2, "due_date": (now + timedelta(days=3)).isoformat()},
+            {"title": "Due next month", "priority": 1, "due_date": (now + timedelta(days=30)).isoformat()},
+            {"title": "No due date", "priority": 3},
+        ]
+        ids = [client.post("/api/v1/tasks/", json=task).json()["id"] for task in tasks]
+
+        response = client.post("/api/v1/tasks/query", json={
+            "due_date": {"gte": now.isoformat(), "lt": (now + timedelta(days=7)).isoformat()},
+            "priority_in": [1, 2],
+            "sort": "-due_date",
+        })
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 2
+        assert [item["title"] for item in data["items"]] == ["Due in 3 days", "Due tomorrow"]
+
+        response = client.post("/api/v1/tasks/query", json={"due_date_is_null": True})
+        assert [item["title"] for item in response.json()["items"]] == ["No due date"]
+
+        response = client.post("/api/v1/tasks/query", json={"ids": [ids[0], ids[3], 999], "sort": "created_at"})
+        assert [item["id"] for item in response.json()["items"]] == [ids[0], ids[3]]
+
+    def test_query_tasks_rejects_invalid_filters(self, client: TestClient):
+        assert client.post("/api/v1/tasks/query", json={"due_date": {}}).status_code == 422
+        assert client.post("/api/v1/tasks/query", json={"priority_in": [4]}).status_code == 422
+        assert client.post("/api/v1/tasks/query", json={"ids": list(range(1000))}).status_code == 422
+        assert client.post("/api/v1/tasks/query", json={"sort": "title"}).status_code == 422
+
+    def test_query_tasks_accepts_mixed_timezone_bounds(self, client: TestClient):
+        client.post("/api/v1/tasks/", json={"title": "Mid January", "priority": 1, "due_date": "2026-01-15T00:00:00"})
+        response = client.post("/api/v1/tasks/query", json={
+            "due_date": {"gte": "2026-01-01T00:00:00", "lt": "2026-02-01T02:00:00+02:00"},
+        })
+        assert response.status_code == 200
+        assert [item["title"] for item in response.json()["items"]] == ["Mid January"]
+
+        response = client.post("/api/v1/tasks/query", json={
+            "due_date": {"gte": "2026-02-01T00:00:00", "lt": "2026-02-01T00:00:00Z"},
+        })
+        assert response.status_code == 422
+
+    def test_get_tasks_batch(self, client: TestClient):
+        ids = [client.post("/api/v1/tasks/", json={"title": f"Task {i}", "priority": 1}).json()["id"] for i in range(3)]
+
+        response = client.get(f"/api/v1/tasks/batch?ids={ids[2]},999,{ids[0]}")
+        assert response.status_code == 200
+        data = response.json()
+        assert [item["id"] for item in data["items"]] == [ids[2], ids[0]]
+        assert data["missing"] == [999]
+
+        response = client.post("/api/v1/tasks/batch", json={"ids": [ids[1], ids[1], ids[0]]})
+        assert response.status_code == 200
+        assert [item["id"] for item in response.json()["items"]] == [ids[1], ids[0]]
+
+        assert client.get("/api/v1/tasks/batch?ids=1,abc").status_code == 400
+
+    def test_archived_tasks(self, client: TestClient, admin_client: TestClient, test_db):
+        from sqlalchemy import update
+        from app.models.task import Task
+
+        ids = [client.post("/api/v1/tasks/", json={"title": f"Task {i}", "priority": 2}).json()["id"] for i in range(3)]
+        test_db.execute(
+            update(Task).where(Task.id == ids[0]).values(completed=True, updated_at=datetime(2020, 1, 1))
+        )
+        test_db.commit()
+
+        response = admin_client.post("/api/v1/admin/archive")
+        assert response.status_code == 200
+        assert response.json()["moved"] == 1
+
+        assert client.get("/api/v1/tasks/").json()["total"] == 2
+        data = client.get("/api/v1/tasks/?include_archived=true").json()
+        assert data["total"] == 3
+        assert sorted(item["id"] for item in data["items"]) == sorted(ids)
+
+        assert client.get(f"/api/v1/tasks/{ids[0]}/").status_code == 404
+        response = client.get(f"/api/v1/tasks/{ids[0]}/?include_archived=true")
+        assert response.status_code == 200
+        assert response.json()["completed"] is True
+        assert client.get("/api/v1/tasks/summary").json()["total_tasks"] == 3
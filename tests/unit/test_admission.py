@@ -0,0 +1,66 @@
+import asyncio
+import pytest
+
+from app.exceptions import ServiceOverloadedError
+from app.middleware.admission import AdaptiveLimiter, classify_request, CHEAP, EXPENSIVE, DEFAULT
+
+
+def make_limiter(**overrides) -> AdaptiveLimiter:
+    options = dict(limit=1, max_limit=4, queue_size=1, target_latency=0.05, queue_timeout=0.05)
+    options.update(overrides)
+    return AdaptiveLimiter("test", **options)
+
+
+class TestClassifyRequest:
+    def test_health_and_admin_bypass(self):
+        assert classify_request("GET", "/api/v1/health/", b"") is None
+        assert classify_request("GET", "/api/v1/health/liveness", b"") is None
+        assert classify_request("GET", "/api/v1/admin/metrics", b"") is None
+
+    def test_task_routes(self):
+        assert classify_request("GET", "/api/v1/tasks/1/", b"") == CHEAP
+        assert classify_request("GET", "/api/v1/tasks/", b"page=2") == CHEAP
+        assert classify_request("GET", "/api/v1/tasks/", b"q=meeting") == EXPENSIVE
+        assert classify_request("GET", "/api/v1/tasks/summary", b"") == EXPENSIVE
+        assert classify_request("POST", "/api/v1/tasks/", b"") == DEFAULT
+        assert classify_request("POST", "/api/v1/tasks/query", b"") == EXPENSIVE
+
+
+class TestAdaptiveLimiter:
+    def test_rejects_when_queue_full(self):
+        async def scenario():
+            limiter = make_limiter()
+            await limiter.acquire()
+            queued = asyncio.ensure_future(limiter.acquire())
+            await asyncio.sleep(0)
+            with pytest.raises(ServiceOverloadedError) as exc_info:
+                await limiter.acquire()
+            assert exc_info.value.retry_after >= 1
+
+            limiter.release(0.001)
+            await queued
+            assert limiter.in_flight == 1
+
+        asyncio.run(scenario())
+
+    def test_rejects_after_queue_timeout(self):
+        async def scenario():
+            limiter = make_limiter(queue_size=4)
+            await limiter.acquire()
+            with pytest.raises(ServiceOverloadedError):
+                await limiter.acquire()
+            assert limiter.queued == 0
+
+        asyncio.run(scenario())
+
+    def test_limit_adapts_to_latency(self):
+        limiter = make_limiter(limit=4, max_limit=8)
+        limiter.in_flight = 1
+        limiter.release(1.0)
+        assert limiter.current_limit < 4
+
+        limiter = make_limiter(limit=2, max_limit=8)
+        for _ in range(10):
+            limiter.in_flight = 1
+            limiter.release(0.001)
+        assert limiter.current_limit > 2
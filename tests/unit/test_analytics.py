@@ -0,0 +1,57 @@
+from datetime import date, datetime
+
+import numpy as np
+from sqlalchemy import update
+
+from app.crud.analytics import TaskColumns, compute_task_analytics, datetime_column
+from app.crud.task import CRUDTask
+from app.models.task import Task
+from app.schemas.task import TaskCreate
+
+
+def make_columns() -> TaskColumns:
+    return TaskColumns(
+        priority=np.array([1, 1, 2, 3], dtype=np.int8),
+        completed=np.array([True, False, False, False]),
+        due_date=datetime_column([None, datetime(2024, 5, 1), datetime(2024, 5, 29), datetime(2024, 6, 30)]),
+        created_at=datetime_column([datetime(2024, 5, 6, 9)] * 3 + [datetime(2024, 5, 12, 23)]),
+        updated_at=datetime_column([datetime(2024, 5, 14)] * 4),
+    )
+
+
+class TestComputeTaskAnalytics:
+    def test_week_buckets_start_on_monday(self):
+        result = compute_task_analytics(make_columns(), datetime(2024, 6, 1), interval="week")
+
+        # 2024-05-06 (Mon) and 2024-05-12 (Sun) fall in the same ISO week.
+        assert [(b.start, b.created, b.completed) for b in result.throughput] == [
+            (date(2024, 5, 6), 4, 0),
+            (date(2024, 5, 13), 0, 1),
+        ]
+        assert [b.start for b in result.due_date_histogram] == [
+            date(2024, 4, 29), date(2024, 5, 27), date(2024, 6, 24)
+        ]
+
+    def test_overdue_age_buckets(self):
+        result = compute_task_analytics(make_columns(), datetime(2024, 6, 1))
+
+        counts = {b.label: b.count for b in result.overdue_by_age}
+        assert counts == {"<1d": 0, "1-7d": 1, "7-30d": 0, ">=30d": 1}
+        assert result.completion_by_priority[0].completion_rate == 0.5
+
+
+class TestAnalyticsCache:
+    def test_writes_by_other_workers_invalidate_it(self, test_db):
+        # Two CRUD objects stand in for two worker processes, each with its own cache.
+        this_worker, other_worker = CRUDTask(Task), CRUDTask(Task)
+        ids = [this_worker.create(test_db, obj_in=TaskCreate(title=f"Task {i}", priority=1)).id for i in range(2)]
+        test_db.execute(update(Task).values(updated_at=datetime(2024, 5, 14)))
+        test_db.commit()
+
+        first = this_worker.get_analytics(test_db)
+        assert this_worker.get_analytics(test_db) is first
+
+        other_worker.update(test_db, db_obj=other_worker.get(test_db, ids[0]), obj_in={"completed": True})
+        assert this_worker.get_analytics(test_db).completion_by_priority[0].completed == 1
+        other_worker.remove(test_db, id=ids[1])
+        assert this_worker.get_analytics(test_db).completion_by_priority[0].total == 1
@@ -0,0 +1,136 @@
+import asyncio
+import sys
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, update
+
+from app.crud.task import CRUDTask
+from app.models.task import ArchivedTask, Task
+from app.schemas.task import TaskCreate, TaskOut
+from app.services.archiver import TaskArchiver
+
+NOW = datetime(2026, 6, 1)
+
+
+def seed(db, crud: CRUDTask) -> list:
+    """Six tasks; the 1st, 3rd and 5th are completed, the 1st and 3rd long ago. Returns their ids."""
+    ids = [
+        crud.create(db, obj_in=TaskCreate(title=f"Task {i}", priority=(i % 3) + 1, description=f"notes {i}")).id
+        for i in range(1, 7)
+    ]
+    db.execute(update(Task).where(Task.id.in_(ids[0:5:2])).values(completed=True))
+    db.execute(update(Task).where(Task.id.in_(ids[0:3:2])).values(updated_at=NOW - timedelta(days=90)))
+    db.execute(update(Task).where(Task.id == ids[4]).values(updated_at=NOW - timedelta(days=1)))
+    db.commit()
+    return ids
+
+
+def make_archiver(crud: CRUDTask, batch_size: int = 1) -> TaskArchiver:
+    return TaskArchiver(after_days=30, batch_size=batch_size, interval=60, crud=crud)
+
+
+class TestTaskArchiver:
+    def test_moves_old_completed_tasks_in_batches(self, test_db):
+        crud = CRUDTask(Task)
+        ids = seed(test_db, crud)
+
+        assert make_archiver(crud).run_once(test_db, now=NOW) == 2
+        assert make_archiver(crud).run_once(test_db, now=NOW) == 0
+
+        assert crud.count_by_filters(test_db) == 4
+        assert crud.get(test_db, ids[0]) is None
+        archived = crud.get_archived(test_db, ids[0])
+        assert archived.completed and archived.description == "notes 1"
+        assert TaskOut.model_validate(archived).title == "Task 1"
+
+    def test_lists_and_summary_span_both_tiers(self, test_db):
+        crud = CRUDTask(Task)
+        ids = seed(test_db, crud)
+        before = crud.get_summary(test_db)
+        expected = [t.id for t in crud.get_by_filters(test_db, limit=10)]
+
+        make_archiver(crud, batch_size=10).run_once(test_db, now=NOW)
+
+        assert crud.get_summary(test_db) == before
+        assert [t.id for t in crud.get_by_filters(test_db, limit=10, include_archived=True)] == expected
+        page = crud.get_by_filters(test_db, completed=True, limit=10, include_archived=True)
+        assert {(type(t), t.id) for t in page} == {(ArchivedTask, ids[0]), (ArchivedTask, ids[2]), (Task, ids[4])}
+        assert crud.count_by_filters(test_db, completed=True, include_archived=True) == 3
+        assert crud.count_by_filters(test_db, q="notes 3", include_archived=True) == 1
+
+        counts, total = crud.count_facets(test_db, facets=["completed"], include_archived=True)
+        assert counts["completed"] == {"true": 3, "false": 3}
+        assert total == 6
+
+    def test_archived_ids_are_not_reused(self, test_db):
+        crud = CRUDTask(Task)
+        ids = seed(test_db, crud)
+        test_db.execute(update(Task).where(Task.id == ids[5]).values(completed=True, updated_at=NOW - timedelta(days=90)))
+        test_db.commit()
+        make_archiver(crud, batch_size=10).run_once(test_db, now=NOW)
+
+        created = crud.create(test_db, obj_in=TaskCreate(title="New", priority=1))
+        assert crud.get_archived(test_db, created.id) is None
+        assert created.id > ids[5]
+
+    def test_batches_larger_than_a_chunk_keep_going(self, test_db, monkeypatch):
+        crud = CRUDTask(Task)
+        seed(test_db, crud)
+        monkeypatch.setattr(sys.modules["app.crud.task"], "IN_CHUNK_SIZE", 1)
+        monkeypatch.setattr(sys.modules["app.services.archiver"], "IN_CHUNK_SIZE", 1)
+
+        # Each call moves one task; a full chunk is not the end of the run.
+        assert make_archiver(crud, batch_size=10).run_once(test_db, now=NOW) == 2
+
+    def test_rows_gone_since_the_page_keys_are_skipped(self, test_db, monkeypatch):
+        crud = CRUDTask(Task)
+        ids = seed(test_db, crud)
+        load = crud.get_multi_by_ids
+
+        def load_after_delete(db, ids_):
+            crud.remove(db, id=ids[0])
+            return load(db, ids_)
+
+        monkeypatch.setattr(crud, "get_multi_by_ids", load_after_delete)
+        page = crud.get_by_filters(test_db, limit=10, include_archived=True)
+        assert ids[0] not in [t.id for t in page] and len(page) == 5
+
+    def test_reports_only_rows_this_run_deleted(self, test_db):
+        crud = CRUDTask(Task)
+        ids = seed(test_db, crud)
+        deleted = []
+        crud.add_listener(lambda event_name, obj: deleted.append(obj.id))
+        engine = test_db.get_bind()
+
+        def concurrent_delete(conn, cursor, statement, parameters, context, executemany):
+            # Another worker deletes a selected row before it is copied.
+            if statement.startswith("INSERT INTO tasks_archive"):
+                cursor.execute("DELETE FROM tasks WHERE id = ?", (ids[0],))
+
+        event.listen(engine, "before_cursor_execute", concurrent_delete)
+        try:
+            assert crud.archive_completed(test_db, completed_before=NOW - timedelta(days=30)) == 1
+        finally:
+            event.remove(engine, "before_cursor_execute", concurrent_delete)
+        assert deleted == [ids[2]]
+        assert crud.get_archived(test_db, ids[0]) is None
+
+
+def test_one_worker_runs_scheduled_archives(tmp_path):
+    archivers = [
+        TaskArchiver(after_days=30, batch_size=1, interval=0.05, lock_path=str(tmp_path / "archive.lock"))
+        for _ in range(2)
+    ]
+    runs = []
+    for archiver in archivers:
+        archiver.run_once = lambda archiver=archiver: runs.append(archiver)
+
+    async def scenario():
+        for archiver in archivers:
+            archiver.start()
+        await asyncio.sleep(0.3)
+        for archiver in archivers:
+            await archiver.stop()
+
+    asyncio.run(scenario())
+    assert len(runs) > 1 and len(set(runs)) == 1
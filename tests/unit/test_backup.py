@@ -0,0 +1,167 @@
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+from sqlalchemy import text
+
+from app.database import Base, make_engine
+from app.exceptions import DatabaseError
+from app.services.backup import BackupManager, copy_sqlite
+
+
+@pytest.fixture
+def live_engine(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path}/live.db")
+    with engine.begin() as connection:
+        connection.exec_driver_sql("PRAGMA journal_mode = WAL")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(
+            text("INSERT INTO tasks (title, priority, completed) VALUES (:title, 2, 0)"),
+            [{"title": f"Task {i} " + "x" * 100} for i in range(3000)],
+        )
+    yield engine
+    engine.dispose()
+
+
+def count_tasks(path) -> int:
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute("SELECT count(*) FROM tasks").fetchone()[0]
+    finally:
+        connection.close()
+
+
+def make_manager(tmp_path, engine, retention=2) -> BackupManager:
+    return BackupManager(
+        directory=str(tmp_path / "backups"), retention=retention, interval=60,
+        pages_per_step=8, step_pause=0, engines=lambda: [engine],
+    )
+
+
+def test_copy_is_consistent_while_writes_continue(live_engine, tmp_path):
+    stop = threading.Event()
+
+    def writer():
+        while not stop.is_set():
+            with live_engine.begin() as connection:
+                connection.exec_driver_sql("INSERT INTO tasks (title, priority, completed) VALUES ('w', 1, 0)")
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        copy_sqlite(live_engine.url.database, str(tmp_path / "copy.db"), pages_per_step=16)
+    finally:
+        stop.set()
+        thread.join()
+
+    copy = sqlite3.connect(tmp_path / "copy.db")
+    assert copy.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+    assert copy.execute("SELECT count(*) FROM tasks").fetchone()[0] >= 3000
+    copy.close()
+
+
+def test_snapshots_are_pruned_to_retention(live_engine, tmp_path):
+    manager = make_manager(tmp_path, live_engine)
+    names = [manager.create() for _ in range(3)]
+
+    assert manager.snapshots() == names[1:]
+    assert count_tasks(tmp_path / "backups" / names[-1] / "live.db") == 3000
+    assert manager.size(names[-1]) > 0
+
+
+def test_restore_replaces_the_database(live_engine, tmp_path):
+    manager = make_manager(tmp_path, live_engine)
+    name = manager.create()
+    with live_engine.begin() as connection:
+        connection.exec_driver_sql("DELETE FROM tasks")
+
+    assert manager.restore(name) == ["live.db"]
+    with live_engine.connect() as connection:
+        assert connection.exec_driver_sql("SELECT count(*) FROM tasks").scalar() == 3000
+    with pytest.raises(FileNotFoundError):
+        manager.restore("19700101T000000.000000Z")
+
+
+def test_failed_backup_leaves_no_snapshot(tmp_path):
+    memory = make_engine("sqlite:///:memory:")
+    manager = make_manager(tmp_path, memory)
+    with pytest.raises(DatabaseError):
+        manager.create()
+    assert manager.snapshots() == []
+    assert list((tmp_path / "backups").iterdir()) == []
+
+
+def test_admin_endpoints(admin_client, live_engine, tmp_path, monkeypatch):
+    from app.services.backup import backups
+
+    monkeypatch.setattr(backups, "engines", lambda: [live_engine])
+    monkeypatch.setattr(backups, "directory", str(tmp_path / "admin-backups"))
+    created = admin_client.post("/api/v1/admin/backups").json()
+    assert created["size_bytes"] > 0
+    assert admin_client.get("/api/v1/admin/backups").json() == {"backups": [created["name"]]}
+
+
+def test_copy_finishes_in_one_step_after_too_many_restarts(live_engine, tmp_path, monkeypatch):
+    writes = 0
+
+    def write_instead_of_sleeping(seconds):
+        nonlocal writes
+        writes += 1
+        with live_engine.begin() as connection:
+            connection.exec_driver_sql("INSERT INTO tasks (title, priority, completed) VALUES ('w', 1, 0)")
+
+    # Every pause between steps writes to the source, so every step restarts the copy.
+    monkeypatch.setattr("app.services.backup.time.sleep", write_instead_of_sleeping)
+    restarts = copy_sqlite(live_engine.url.database, str(tmp_path / "copy.db"), 4, 0.001, max_restarts=3)
+
+    assert restarts == 4
+    assert count_tasks(tmp_path / "copy.db") == 3000 + writes
+
+
+def test_restore_checks_every_file_first(live_engine, tmp_path):
+    shard = make_engine(f"sqlite:///{tmp_path}/shard.db")
+    Base.metadata.create_all(bind=shard)
+    manager = make_manager(tmp_path, live_engine)
+    name = manager.create()
+    with live_engine.begin() as connection:
+        connection.exec_driver_sql("DELETE FROM tasks WHERE id > 10")
+
+    manager.engines = lambda: [live_engine, shard]
+    with pytest.raises(FileNotFoundError, match="shard.db"):
+        manager.restore(name)
+    # Nothing was restored, nor the shard created empty.
+    assert count_tasks(live_engine.url.database) == 10
+    assert not (tmp_path / "backups" / name / "shard.db").exists()
+    shard.dispose()
+
+
+def test_failed_prune_keeps_the_snapshot(live_engine, tmp_path, monkeypatch):
+    manager = make_manager(tmp_path, live_engine, retention=1)
+    manager.create()
+
+    def refuse(path):
+        raise PermissionError(path)
+
+    monkeypatch.setattr("app.services.backup.shutil.rmtree", refuse)
+    name = manager.create()
+    assert name in manager.snapshots()
+
+
+def test_one_process_takes_scheduled_backups(live_engine, tmp_path):
+    first, second = (
+        BackupManager(directory=str(tmp_path / "backups"), retention=0, interval=0.05, engines=lambda: [live_engine])
+        for _ in range(2)
+    )
+
+    async def scenario():
+        first.start()
+        second.start()
+        await asyncio.sleep(0.5)
+        await first.stop()
+        await second.stop()
+
+    asyncio.run(scenario())
+    assert first.snapshots()
+    assert [manager.last_duration > 0 for manager in (first, second)].count(True) == 1
@@ -0,0 +1,68 @@
+import asyncio
+
+from app.middleware.coalescing import SingleFlightMiddleware
+
+
+def make_scope(path: str, query: bytes = b"", method: str = "GET") -> dict:
+    return {"type": "http", "method": method, "path": path, "query_string": query, "headers": []}
+
+
+class CountingApp:
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self, scope, receive, send):
+        self.calls += 1
+        await self.release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": f"call-{self.calls}".encode()})
+
+
+async def run_request(middleware, scope):
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    await middleware(scope, None, send)
+    return messages
+
+
+class TestSingleFlight:
+    def test_identical_concurrent_reads_share_one_execution(self):
+        async def scenario():
+            downstream = CountingApp()
+            middleware = SingleFlightMiddleware(downstream, paths=frozenset({"/tasks/"}))
+            requests = [
+                asyncio.ensure_future(run_request(middleware, make_scope("/tasks/", b"page=1&size=10")))
+                for _ in range(5)
+            ]
+            # Same parameters in a different order must share the flight too.
+            requests.append(asyncio.ensure_future(run_request(middleware, make_scope("/tasks/", b"size=10&page=1"))))
+            await asyncio.sleep(0)
+            downstream.release.set()
+            responses = await asyncio.gather(*requests)
+
+            assert downstream.calls == 1
+            assert all(r[1]["body"] == b"call-1" for r in responses)
+            assert middleware._flights == {}
+
+        asyncio.run(scenario())
+
+    def test_distinct_and_sequential_reads_are_not_shared(self):
+        async def scenario():
+            downstream = CountingApp()
+            downstream.release.set()
+            middleware = SingleFlightMiddleware(downstream, paths=frozenset({"/tasks/"}))
+
+            await asyncio.gather(
+                run_request(middleware, make_scope("/tasks/", b"page=1")),
+                run_request(middleware, make_scope("/tasks/", b"page=2")),
+            )
+            await run_request(middleware, make_scope("/tasks/", b"page=1"))
+            await run_request(middleware, make_scope("/tasks/", method="POST"))
+
+            assert downstream.calls == 4
+
+        asyncio.run(scenario())
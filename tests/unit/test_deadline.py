@@ -0,0 +1,125 @@
+import asyncio
+import http.client
+import socket
+import threading
+import time
+
+import pytest
+import uvicorn
+from sqlalchemy import create_engine, text
+
+from app.deadline import Deadline, current_deadline, install_deadline_hooks
+from app.exceptions import DeadlineExceededError, RequestCancelledError
+from app.middleware.deadline import CANCELLED_SCOPE_KEY, DeadlineMiddleware, deadline_for
+
+# Counts to a billion: runs far longer than any deadline used here.
+SLOW_QUERY = text(
+    "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 1000000000) "
+    "SELECT count(*) FROM n"
+)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    install_deadline_hooks(engine)
+    yield engine
+    engine.dispose()
+
+
+def run_with_deadline(engine, deadline: Deadline):
+    token = current_deadline.set(deadline)
+    try:
+        with engine.connect() as connection:
+            return connection.execute(SLOW_QUERY).scalar()
+    finally:
+        current_deadline.reset(token)
+
+
+class TestDeadlineHooks:
+    def test_slow_query_is_aborted_at_deadline(self, engine):
+        start = time.monotonic()
+        with pytest.raises(DeadlineExceededError) as exc_info:
+            run_with_deadline(engine, Deadline(0.05, "GET /tasks/"))
+        assert time.monotonic() - start < 2
+        assert exc_info.value.status_code == 504
+
+    def test_cancel_interrupts_running_query(self, engine):
+        deadline = Deadline(30)
+        threading.Timer(0.05, deadline.cancel).start()
+        with pytest.raises(RequestCancelledError):
+            run_with_deadline(engine, deadline)
+
+    def test_handler_released_after_request(self, engine):
+        with pytest.raises(DeadlineExceededError):
+            run_with_deadline(engine, Deadline(0.01))
+        with engine.connect() as connection:
+            assert connection.execute(text("SELECT 1")).scalar() == 1
+
+
+class TestDeadlineFor:
+    def test_route_classes_and_overrides(self):
+        assert deadline_for("GET", "/api/v1/tasks/", b"") == 2.0
+        assert deadline_for("GET", "/api/v1/tasks/", b"q=report") == 10.0
+        assert deadline_for("GET", "/api/v1/tasks/export", b"") is None
+        assert deadline_for("GET", "/api/v1/health/", b"") is None
+
+
+class TestDeadlineMiddleware:
+    def test_disconnect_cancels_request(self):
+        async def scenario():
+            seen = {}
+
+            async def app(scope, receive, send):
+                seen["deadline"] = current_deadline.get()
+                await asyncio.sleep(0.05)
+
+            async def receive():
+                return {"type": "http.disconnect"}
+
+            scope = {"type": "http", "method": "GET", "path": "/api/v1/tasks/", "query_string": b"q=x"}
+            await DeadlineMiddleware(app)(scope, receive, None)
+            return scope, seen["deadline"]
+
+        scope, deadline = asyncio.run(scenario())
+        assert deadline.cancelled
+        assert scope[CANCELLED_SCOPE_KEY] is True
+        assert current_deadline.get() is None
+
+    def test_disconnect_after_the_response_is_not_an_abort(self):
+        cancelled = {}
+
+        async def app(scope, receive, send):
+            deadline = current_deadline.get()
+            if scope["query_string"] == b"q=done":
+                await send({"type": "http.response.start", "status": 200, "headers": [(b"content-length", b"2")]})
+                await send({"type": "http.response.body", "body": b"ok"})
+            # Still running, like a background task, after the response (or while the client waits).
+            await asyncio.sleep(0.3)
+            cancelled[scope["query_string"]] = deadline.cancelled
+
+        listener = socket.socket()
+        listener.bind(("127.0.0.1", 0))
+        port = listener.getsockname()[1]
+        server = uvicorn.Server(uvicorn.Config(DeadlineMiddleware(app), lifespan="off", log_level="warning"))
+        thread = threading.Thread(target=server.run, kwargs={"sockets": [listener]}, daemon=True)
+        thread.start()
+        try:
+            while not server.started:
+                time.sleep(0.01)
+            connection = http.client.HTTPConnection("127.0.0.1", port)
+            connection.request("GET", "/api/v1/tasks/?q=done")
+            assert connection.getresponse().read() == b"ok"
+            connection.close()
+
+            aborted = socket.create_connection(("127.0.0.1", port))
+            aborted.sendall(b"GET /api/v1/tasks/?q=abort HTTP/1.1\r\nHost: test\r\n\r\n")
+            time.sleep(0.1)
+            aborted.close()
+
+            while len(cancelled) < 2:
+                time.sleep(0.01)
+        finally:
+            server.should_exit = True
+            thread.join()
+        assert cancelled == {b"q=done": False, b"q=abort": True}
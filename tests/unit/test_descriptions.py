@@ -0,0 +1,123 @@
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import create_engine, inspect, select, text
+
+import app.database as database
+from app.compression import PLAIN, ZLIB, decode_text, encode_text
+from app.config import Settings, settings
+from app.crud.statements import text_search
+from app.crud.task import CRUDTask
+from app.models.task import Task, TaskDescription
+from app.schemas.task import TaskCreate, TaskOut, TaskUpdate
+
+LONG_DESCRIPTION = "Quarterly planning notes: budget, hiring and roadmap. " * 20
+
+
+@pytest.fixture
+def split_storage(monkeypatch):
+    monkeypatch.setattr(settings, "description_storage", "split")
+    monkeypatch.setattr(settings, "description_search", False)
+
+
+class TestEncoding:
+    def test_short_values_stay_plain(self):
+        assert encode_text("short") == (PLAIN, b"short")
+        assert encode_text(LONG_DESCRIPTION, compression="none")[0] == PLAIN
+
+    def test_round_trip(self):
+        codec, body = encode_text(LONG_DESCRIPTION)
+        assert codec == ZLIB
+        assert len(body) < len(LONG_DESCRIPTION)
+        assert decode_text(codec, body) == LONG_DESCRIPTION
+        assert decode_text(None, None) is None
+
+
+class TestDescriptionStorage:
+    def test_inline_by_default(self, test_db):
+        crud = CRUDTask(Task)
+        task = crud.create(test_db, obj_in=TaskCreate(title="Plan", priority=1, description=LONG_DESCRIPTION))
+
+        assert task.description_text == LONG_DESCRIPTION
+        assert test_db.execute(select(TaskDescription)).first() is None
+        assert crud.count_by_filters(test_db, q="roadmap") == 1
+
+    def test_split_compresses_long_values_only(self, test_db, split_storage):
+        crud = CRUDTask(Task)
+        long = crud.create(test_db, obj_in=TaskCreate(title="Plan", priority=1, description=LONG_DESCRIPTION))
+        short = crud.create(test_db, obj_in=TaskCreate(title="Note", priority=1, description="short"))
+
+        record = test_db.execute(select(TaskDescription)).scalar_one()
+        assert (record.task_id, record.codec) == (long.id, ZLIB)
+        assert long.description_text is None and short.description_text == "short"
+        assert TaskOut.model_validate(long).description == LONG_DESCRIPTION
+
+    def test_update_moves_between_tables_and_clears(self, test_db, split_storage):
+        crud = CRUDTask(Task)
+        task = crud.create(test_db, obj_in=TaskCreate(title="Plan", priority=1, description=LONG_DESCRIPTION))
+        crud.update(test_db, db_obj=task, obj_in=TaskUpdate(description="final"))
+        assert crud.get(test_db, task.id).description == "final"
+        assert test_db.execute(select(TaskDescription)).first() is None
+
+        crud.update(test_db, db_obj=task, obj_in=TaskUpdate(description=LONG_DESCRIPTION))
+        assert task.description_text is None and task.description == LONG_DESCRIPTION
+        crud.update(test_db, db_obj=task, obj_in={"description": None})
+        assert task.description is None
+        assert test_db.execute(select(TaskDescription)).first() is None
+
+    def test_split_storage_requires_description_search_off(self, split_storage):
+        with pytest.raises(ValidationError, match="description_search=false"):
+            Settings(description_storage="split")
+        assert Settings(description_storage="split", description_search=False).description_search is False
+        assert "description" not in str(text_search(Task, "%plan%"))
+
+    def test_export_decodes(self, test_db, split_storage):
+        crud = CRUDTask(Task)
+        crud.create(test_db, obj_in=TaskCreate(title="Plan", priority=1, description=LONG_DESCRIPTION))
+        crud.create(test_db, obj_in=TaskCreate(title="Other", priority=2, description="roadmap draft"))
+
+        rows = [row for chunk in crud.iter_rows_by_filters(test_db) for row in chunk]
+        assert [row[2] for row in rows] == [LONG_DESCRIPTION, "roadmap draft"]
+
+
+class TestUnversionedDatabase:
+    def test_create_mode_migrates_a_database_from_before_migrations(self, tmp_path, monkeypatch):
+        url = f"sqlite:///{tmp_path / 'legacy.db'}"
+        engine = create_engine(url)
+        # The schema `create_all` built before the project had migrations (revision 0001).
+        with engine.begin() as connection:
+            connection.execute(text(
+                "CREATE TABLE tasks (id INTEGER NOT NULL PRIMARY KEY, title VARCHAR(255) NOT NULL, description TEXT, "
+                "priority INTEGER NOT NULL, due_date DATETIME, completed BOOLEAN NOT NULL, "
+                "created_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL, "
+                "updated_at DATETIME DEFAULT (CURRENT_TIMESTAMP) NOT NULL)"
+            ))
+            for column in ("id", "title", "priority", "due_date", "completed"):
+                connection.execute(text(f"CREATE INDEX ix_tasks_{column} ON tasks ({column})"))
+            connection.execute(text(
+                "INSERT INTO tasks (title, description, priority, completed) VALUES ('Plan', :description, 1, 0)"
+            ), {"description": LONG_DESCRIPTION})
+        monkeypatch.setattr(database, "engine", engine)
+        monkeypatch.setattr(settings, "database_url", url)
+        monkeypatch.setattr(settings, "description_storage", "split")
+        monkeypatch.setattr(settings, "description_search", False)
+
+        assert database.is_unversioned(engine)
+        database.create_tables()
+
+        assert database.schema_is_current()
+        assert not database.is_unversioned(engine)
+        assert {"task_descriptions", "tasks_archive", "tags"} <= set(inspect(engine).get_table_names())
+        # Migrations do not depend on the storage setting: the description stays inline until rewritten.
+        with engine.connect() as connection:
+            assert connection.execute(text("SELECT description FROM tasks")).scalar() == LONG_DESCRIPTION
+            assert connection.execute(text("SELECT count(*) FROM task_descriptions")).scalar() == 0
+        engine.dispose()
+
+    def test_create_mode_stamps_new_databases(self, tmp_path, monkeypatch):
+        engine = create_engine(f"sqlite:///{tmp_path / 'new.db'}")
+        monkeypatch.setattr(database, "engine", engine)
+
+        database.create_tables()
+        assert database.schema_is_current()
+        database.create_tables()
+        engine.dispose()
@@ -69,4 +69,13 @@ class TestTaskCRUD:
                 q="test",
                 skip=0,
                 limit=10
-            )
\ No newline at end of file
+            )
+
+    def test_get_multi_by_ids_chunks_large_sets(self, test_db):
+        """Test edge case: id lists larger than one IN chunk keep input order"""
+        created = [crud_task.create(test_db, obj_in=TaskCreate(title=f"Task {i}", priority=1)) for i in range(3)]
+        ids = [created[2].id, 10_000] + list(range(20_000, 21_000)) + [created[0].id]
+
+        result = crud_task.get_multi_by_ids(test_db, ids)
+
+        assert [t.id for t in result] == [created[2].id, created[0].id]
@@ -0,0 +1,98 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.database import make_engine
+from app.metrics import metrics
+from app.services.health import HealthMonitor, health_monitor
+
+
+@pytest.fixture
+def file_engine(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path}/health.db")
+    yield engine
+    engine.dispose()
+
+
+def make_monitor(*engines, **kwargs) -> HealthMonitor:
+    return HealthMonitor(engines=lambda: list(engines), **kwargs)
+
+
+def test_sample_reports_every_database(file_engine):
+    report = make_monitor(file_engine).sample()
+
+    assert report["status"] == "healthy" and report["problems"] == []
+    [check] = report["databases"].values()
+    assert check["latency_ms"] > 0
+    assert check["disk_free_bytes"] > 0
+    assert check["pool_in_use"] == 0 and check["pool_saturation"] == 0
+
+
+def test_breached_thresholds_degrade(file_engine):
+    held = [file_engine.connect() for _ in range(2)]
+    try:
+        report = make_monitor(
+            file_engine, max_db_latency_ms=0, max_pool_saturation=0.1, min_disk_free_bytes=2 ** 60
+        ).sample()
+    finally:
+        for connection in held:
+            connection.close()
+
+    assert report["status"] == "degraded"
+    round_trip, pool, disk = report["problems"]
+    assert "round trip" in round_trip and "pool 13% in use" in pool and "MiB disk free" in disk
+
+
+def test_unreachable_database_is_unhealthy(file_engine, tmp_path):
+    missing = make_engine(f"sqlite:///{tmp_path}/missing/dir/health.db")
+    report = make_monitor(file_engine, missing).sample()
+    assert report["status"] == "unhealthy"
+    assert report["problems"] == [f"{tmp_path}/missing/dir/health.db: unreachable"]
+    missing.dispose()
+
+
+def test_event_loop_lag_and_stale_reports(file_engine):
+    monitor = make_monitor(file_engine, interval=0.2, max_loop_lag_ms=100)
+
+    async def scenario():
+        monitor.start()
+        await asyncio.sleep(0.1)
+        time.sleep(0.3)  # blocks the event loop while the monitor sleeps
+        await asyncio.sleep(0.1)
+        lagged = monitor.report()
+        monitor.latest["checked_at"] = datetime.now(timezone.utc) - timedelta(seconds=1)
+        stale = monitor.report()
+        await monitor.stop()
+        return lagged, stale
+
+    lagged, stale = asyncio.run(scenario())
+    assert lagged["status"] == "degraded"
+    assert any(problem.startswith("event loop lag") for problem in lagged["problems"])
+    assert stale["problems"][-1] == "health report 1s old"
+
+
+def test_report_never_samples(file_engine):
+    monitor = make_monitor(file_engine)
+    assert monitor.report()["problems"] == ["no health sample taken yet"]
+    assert monitor.latest is None
+
+    sampled = monitor.sample()
+    assert monitor.report() is sampled
+
+
+def test_probes_serve_the_cached_report(client, monkeypatch):
+    assert client.get("/api/v1/health/readiness").json() == {"status": "ready", "problems": []}
+    samples = metrics.value("health.samples")
+    for _ in range(5):
+        assert client.get("/api/v1/health").json()["status"] == "healthy"
+    assert metrics.value("health.samples") == samples
+
+    monkeypatch.setattr(health_monitor, "latest", {
+        **health_monitor.latest, "status": "degraded", "problems": ["app.db: pool 95% in use"]
+    })
+    response = client.get("/api/v1/health/readiness")
+    assert response.status_code == 503
+    assert response.json() == {"status": "degraded", "problems": ["app.db: pool 95% in use"]}
+    assert client.get("/api/v1/health").json()["status"] == "degraded"
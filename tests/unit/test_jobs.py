@@ -0,0 +1,157 @@
+import asyncio
+import time
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.orm import sessionmaker
+
+from app.crud.outbox import utcnow
+from app.crud.task import CRUDTask
+from app.models.job import Job
+from app.models.task import Task, TaskDescription, task_tags
+from app.schemas.job import JobCreate
+from app.schemas.task import TaskCreate
+from app.services import jobs as jobs_module
+from app.services.jobs import JobRunner
+
+
+@pytest.fixture
+def crud():
+    crud = CRUDTask(Task)
+    crud.events = []
+    crud.add_listener(lambda event, obj: crud.events.append((event, obj.id)))
+    return crud
+
+
+@pytest.fixture
+def runner(test_engine, crud):
+    return JobRunner(
+        workers=1, chunk_size=3, max_rows_per_second=0, poll_interval=0.05,
+        engine=test_engine, session_factory=sessionmaker(bind=test_engine), crud=crud,
+    )
+
+
+def seed(db, crud, count: int, **fields) -> list:
+    return [
+        crud.create(db, obj_in=TaskCreate(title=f"Task {i}", priority=fields.get("priority", 3), **{
+            key: value for key, value in fields.items() if key != "priority"
+        })).id
+        for i in range(count)
+    ]
+
+
+def run(runner: JobRunner) -> None:
+    asyncio.run(runner.run_next())
+
+
+def tasks_by_id(db) -> dict:
+    db.expire_all()
+    return {task.id: task for task in db.execute(select(Task)).scalars()}
+
+
+def test_job_updates_matching_tasks_in_chunks(test_db, crud, runner):
+    low = seed(test_db, crud, 7)
+    high = seed(test_db, crud, 2, priority=1)
+    crud.events.clear()
+
+    job = runner.submit(JobCreate(operation="complete", filters={"priority": 3}))
+    assert job["status"] == "queued" and job["chunk_size"] == 3
+    run(runner)
+
+    job = runner.get(job["id"])
+    assert (job["status"], job["total"], job["processed"]) == ("succeeded", 7, 7)
+    assert job["started_at"] is not None and job["finished_at"] is not None
+    tasks = tasks_by_id(test_db)
+    assert all(tasks[id].completed for id in low)
+    assert not any(tasks[id].completed for id in high)
+    # Write listeners see every change, as for single updates.
+    assert crud.events == [("update", id) for id in low]
+
+
+def test_delete_job_removes_tasks_with_their_rows(test_db, crud, runner):
+    doomed = seed(test_db, crud, 4, tags=["stale"], description="x" * 300)
+    kept = seed(test_db, crud, 2, tags=["fresh"])
+
+    job = runner.submit(JobCreate(operation="delete", filters={"tags": ["Stale"]}))
+    run(runner)
+
+    assert runner.get(job["id"])["processed"] == 4
+    assert sorted(tasks_by_id(test_db)) == sorted(kept)
+    assert not test_db.execute(select(task_tags).where(task_tags.c.task_id.in_(doomed))).all()
+    assert not test_db.execute(select(TaskDescription).where(TaskDescription.task_id.in_(doomed))).all()
+
+
+def test_set_priority_requires_a_priority(client):
+    response = client.post("/api/v1/jobs/", json={"operation": "set_priority"})
+    assert response.status_code == 422
+    response = client.post("/api/v1/jobs/", json={"operation": "complete", "priority": 1})
+    assert response.status_code == 422
+
+
+def test_jobs_are_throttled(test_db, crud, runner):
+    seed(test_db, crud, 6)
+    job = runner.submit(JobCreate(operation="set_priority", priority=2, chunk_size=2, max_rows_per_second=20))
+
+    started = time.monotonic()
+    run(runner)
+
+    # Three chunks of two rows at 20 rows per second.
+    assert time.monotonic() - started >= 0.3
+    assert runner.get(job["id"])["processed"] == 6
+    assert {task.priority for task in tasks_by_id(test_db).values()} == {2}
+
+
+def test_cancellation(test_db, crud, runner):
+    seed(test_db, crud, 6)
+    queued = runner.submit(JobCreate(operation="complete"))
+    assert runner.cancel(queued["id"])["status"] == "cancelled"
+
+    running = runner.submit(JobCreate(operation="complete", chunk_size=2, max_rows_per_second=4))
+
+    async def scenario():
+        worker = asyncio.create_task(runner.run_next())
+        await asyncio.sleep(0.2)
+        assert (await asyncio.to_thread(runner.cancel, running["id"]))["cancel_requested"]
+        return await worker
+
+    # The cancelled queued job is skipped.
+    assert asyncio.run(scenario()) == running["id"]
+    job = runner.get(running["id"])
+    assert (job["status"], job["processed"]) == ("cancelled", 2)
+    assert sum(task.completed for task in tasks_by_id(test_db).values()) == 2
+
+
+def test_interrupted_job_resumes_from_its_cursor(test_db, crud, runner):
+    ids = seed(test_db, crud, 5)
+    job = runner.submit(JobCreate(operation="complete"))
+    # As left by a process that died after its first chunk.
+    test_db.execute(update(Job).where(Job.id == job["id"]).values(
+        status="running", cursor=ids[2], processed=3, total=5, heartbeat_at=utcnow() - timedelta(minutes=5)
+    ))
+    test_db.commit()
+
+    run(runner)
+
+    job = runner.get(job["id"])
+    assert (job["status"], job["processed"]) == ("succeeded", 5)
+    tasks = tasks_by_id(test_db)
+    assert [tasks[id].completed for id in ids] == [False, False, False, True, True]
+
+
+def test_jobs_api(client, test_db, crud, runner, monkeypatch):
+    monkeypatch.setattr(jobs_module, "jobs", runner)
+    monkeypatch.setattr("app.api.v1.endpoints.jobs.jobs", runner)
+    seed(test_db, crud, 3)
+
+    response = client.post("/api/v1/jobs/", json={"operation": "reopen", "filters": {"completed": True}})
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == "queued" and job["filters"]["completed"] is True
+    assert client.get(f"/api/v1/jobs/{job['id']}").json()["status"] == "queued"
+
+    run(runner)
+    body = client.get(f"/api/v1/jobs/{job['id']}").json()
+    assert (body["status"], body["total"], body["processed"]) == ("succeeded", 0, 0)
+    assert client.post(f"/api/v1/jobs/{job['id']}/cancel").json()["status"] == "succeeded"
+    assert client.get("/api/v1/jobs/999999").status_code == 404
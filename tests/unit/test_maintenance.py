@@ -0,0 +1,156 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+from app.database import Base, make_engine
+from app.metrics import metrics
+from app.services.maintenance import MaintenanceScheduler, parse_window
+
+
+@pytest.fixture
+def bloated_engine(tmp_path):
+    """A WAL-mode database file with incremental auto-vacuum whose rows were mostly deleted."""
+    engine = make_engine(f"sqlite:///{tmp_path}/maintenance.db")
+    with engine.begin() as connection:
+        connection.exec_driver_sql("PRAGMA journal_mode = WAL")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(
+            text("INSERT INTO tasks (title, priority, completed) VALUES (:title, 1, 0)"),
+            [{"title": f"Task {i} " + "x" * 200} for i in range(2000)],
+        )
+    with engine.begin() as connection:
+        connection.exec_driver_sql("DELETE FROM tasks WHERE id > 100")
+    yield engine
+    engine.dispose()
+
+
+def make_scheduler(engine, **kwargs) -> MaintenanceScheduler:
+    return MaintenanceScheduler(interval=60, engines=lambda: [engine], **kwargs)
+
+
+def test_parse_window():
+    assert parse_window("") is None
+    assert parse_window("02:00-05:30") == (120, 330)
+    with pytest.raises(ValueError):
+        parse_window("2am-5am")
+
+
+def test_window_may_wrap_midnight():
+    scheduler = MaintenanceScheduler(interval=60, window=parse_window("23:00-02:00"))
+    assert scheduler.in_window(datetime(2026, 6, 1, 23, 30))
+    assert scheduler.in_window(datetime(2026, 6, 1, 1, 59))
+    assert not scheduler.in_window(datetime(2026, 6, 1, 2, 0))
+    assert not scheduler.in_window(datetime(2026, 6, 1, 12, 0))
+
+
+def test_run_analyzes_vacuums_and_checkpoints(bloated_engine):
+    with bloated_engine.connect() as connection:
+        assert connection.exec_driver_sql("PRAGMA auto_vacuum").scalar() == 2
+        free_before = connection.exec_driver_sql("PRAGMA freelist_count").scalar()
+    assert free_before > 0
+    freed_before = metrics.value("maintenance.pages_freed")
+
+    scheduler = make_scheduler(bloated_engine, vacuum_pages=0)
+    operations = scheduler.run_once()
+
+    done = [operation.split(": ")[1] for operation in operations]
+    assert done[0] == "analyze" and done[2] == "wal checkpoint"
+    assert done[1].startswith("incremental vacuum")
+    # ANALYZE itself may reuse a free page for sqlite_stat1.
+    assert free_before - 1 <= metrics.value("maintenance.pages_freed") - freed_before <= free_before
+    assert scheduler.free_pages == {bloated_engine.url.database: 0}
+    with bloated_engine.connect() as connection:
+        assert connection.exec_driver_sql("SELECT count(*) FROM sqlite_stat1").scalar() > 0
+
+    assert scheduler.run_once()[0].endswith(": optimize")
+
+
+def test_incremental_vacuum_is_bounded(bloated_engine):
+    scheduler = make_scheduler(bloated_engine, vacuum_pages=5)
+    assert "incremental vacuum (5 pages)" in scheduler.run_once()[1]
+
+
+def test_defers_while_busy_or_outside_window():
+    scheduler = MaintenanceScheduler(interval=60, max_requests_per_second=1, retry_interval=0)
+    deferred = metrics.value("maintenance.deferred")
+    rates = iter([50.0, 0.5])
+
+    async def fake_rate(seconds):
+        return next(rates)
+
+    scheduler.request_rate = fake_rate
+    asyncio.run(scheduler.wait_for_quiet())
+    assert metrics.value("maintenance.deferred") - deferred == 1
+
+
+def test_admin_trigger(admin_client, bloated_engine, monkeypatch):
+    from app.services.maintenance import maintenance
+
+    monkeypatch.setattr(maintenance, "engines", lambda: [bloated_engine])
+    response = admin_client.post("/api/v1/admin/maintenance")
+    assert response.status_code == 200
+    assert response.json()["operations"][0].endswith(": analyze")
+
+
+def test_request_rate_spans_every_worker(tmp_path):
+    scheduler = MaintenanceScheduler(interval=60, state_directory=str(tmp_path))
+    other_worker = tmp_path / "requests-999999"
+    other_worker.write_text("100")
+
+    async def scenario():
+        sample = asyncio.create_task(scheduler.request_rate(0.2))
+        await asyncio.sleep(0.1)
+        metrics.inc("http.requests", 3)
+        other_worker.write_text("105")
+        return await sample
+
+    assert asyncio.run(scenario()) == pytest.approx(8 / 0.2)
+
+
+def test_one_worker_runs_scheduled_maintenance(tmp_path):
+    schedulers = [MaintenanceScheduler(interval=0.05, state_directory=str(tmp_path)) for _ in range(2)]
+    runs = []
+
+    async def quiet():
+        pass
+
+    for scheduler in schedulers:
+        scheduler.wait_for_quiet = quiet
+        scheduler.run_once = lambda scheduler=scheduler: runs.append(scheduler)
+
+    async def scenario():
+        for scheduler in schedulers:
+            scheduler.start()
+        await asyncio.sleep(0.5)
+        for scheduler in schedulers:
+            await scheduler.stop()
+
+    asyncio.run(scenario())
+    assert len(runs) > 1 and len(set(runs)) == 1
+    assert not list(tmp_path.glob("requests-*"))
+
+
+def test_scheduler_survives_failures_outside_the_database(tmp_path):
+    scheduler = MaintenanceScheduler(interval=0.05, state_directory=str(tmp_path))
+    failures = metrics.value("maintenance.failures")
+    attempts = []
+
+    async def unwritable():
+        attempts.append(1)
+        raise PermissionError("state directory is read-only")
+
+    scheduler.wait_for_quiet = unwritable
+
+    async def scenario():
+        scheduler.start()
+        await asyncio.sleep(0.3)
+        alive = not scheduler._task.done()
+        await scheduler.stop()
+        return alive
+
+    assert asyncio.run(scenario())
+    assert len(attempts) > 1
+    assert metrics.value("maintenance.failures") - failures == len(attempts)
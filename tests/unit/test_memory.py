@@ -0,0 +1,82 @@
+import logging
+
+import pytest
+
+from app.memory import MemoryProfiler, memory_profiler, object_counts
+from app.models.task import Task
+
+
+@pytest.fixture
+def profiling():
+    """Trace allocations for one test."""
+    memory_profiler.start()
+    yield memory_profiler
+    memory_profiler.stop()
+
+
+def test_object_counts_include_identity_maps(test_db):
+    before = object_counts()
+    tasks = [Task(title=f"Task {i}", priority=1) for i in range(3)]
+    test_db.add_all(tasks)
+    test_db.flush()
+
+    counts = object_counts()
+    assert counts["Task"] - before["Task"] == 3
+    assert counts["identity_map_objects"] - before["identity_map_objects"] == 3
+    assert counts["Session"] >= 1
+
+
+def test_top_sites_diff_against_the_snapshot(profiling):
+    profiler = MemoryProfiler()
+    profiler.mark()
+    retained = [bytearray(1024) for _ in range(200)]
+
+    sites = profiler.top_sites(limit=5)
+    assert sites[0]["site"].startswith(__file__)
+    assert sites[0]["size_diff_bytes"] >= 200 * 1024
+    assert sites[0]["count_diff"] >= 200
+    del retained
+
+
+def test_request_peak_is_measured_above_the_start(profiling):
+    traced_at_start = profiling.begin_request()
+    garbage = bytearray(512 * 1024)
+    del garbage
+    assert profiling.end_request(traced_at_start) >= 512 * 1024
+
+    assert MemoryProfiler().end_request(None) is None
+
+
+def test_overlapping_requests_report_no_peak(profiling):
+    first = profiling.begin_request()
+    second = profiling.begin_request()
+    assert profiling.end_request(second) is None
+    assert profiling.end_request(first) is None
+
+    alone = profiling.begin_request()
+    assert profiling.end_request(alone) is not None
+
+
+def test_memory_endpoints(admin_client, caplog):
+    response = admin_client.get("/api/v1/admin/memory")
+    assert response.status_code == 200
+    assert response.json()["tracing"] is False
+    assert response.json()["top_sites"] == []
+    assert set(response.json()["objects"]) >= {"Task", "TaskOut", "Session", "identity_map_objects"}
+    assert admin_client.post("/api/v1/admin/memory/snapshot").status_code == 409
+
+    memory_profiler.start()
+    try:
+        assert admin_client.post("/api/v1/admin/memory/snapshot").json()["traced_bytes"] > 0
+        with caplog.at_level(logging.INFO, logger="app.main"):
+            caplog.clear()
+            admin_client.get("/api/v1/tasks/")
+            [record] = [record for record in caplog.records if record.getMessage().startswith("Response: 200")]
+        body = admin_client.get("/api/v1/admin/memory", params={"limit": 3}).json()
+    finally:
+        memory_profiler.stop()
+
+    assert body["tracing"] is True and body["since_snapshot"] is True
+    assert body["peak_bytes"] >= body["traced_bytes"] > 0
+    assert len(body["top_sites"]) == 3
+    assert record.peak_memory_bytes > 0
@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+
+from app.crud.read_model import TaskReadModel
+from app.crud.task import CRUDTask
+from app.models.task import Task
+from app.schemas.task import TaskCreate, TaskUpdate
+
+
+def seed(db, crud: CRUDTask, count: int = 12):
+    base = datetime(2024, 1, 1)
+    tasks = []
+    for i in range(count):
+        db_obj = Task(
+            title=f"Task {i}",
+            priority=(i % 3) + 1,
+            completed=i % 4 == 0,
+            created_at=base + timedelta(minutes=i // 2),
+            updated_at=base,
+        )
+        db.add(db_obj)
+        tasks.append(db_obj)
+    db.commit()
+    return tasks
+
+
+class TestTaskReadModel:
+    def test_matches_database_queries(self, test_db):
+        db_crud = CRUDTask(Task)
+        model_crud = CRUDTask(Task, read_model=TaskReadModel())
+        seed(test_db, db_crud)
+
+        for completed in (None, True, False):
+            for priority in (None, 1, 2, 3):
+                for skip in (0, 3):
+                    expected = db_crud.get_by_filters(test_db, completed=completed, priority=priority, skip=skip, limit=4)
+                    actual = model_crud.get_by_filters(test_db, completed=completed, priority=priority, skip=skip, limit=4)
+                    assert [t.id for t in actual] == [t.id for t in expected]
+                assert model_crud.count_by_filters(test_db, completed=completed, priority=priority) == \
+                    db_crud.count_by_filters(test_db, completed=completed, priority=priority)
+
+    def test_kept_current_by_crud_writes(self, test_db):
+        read_model = TaskReadModel()
+        crud = CRUDTask(Task, read_model=read_model)
+        assert crud.count_by_filters(test_db) == 0
+        assert read_model.loaded
+
+        created = crud.create(test_db, obj_in=TaskCreate(title="New", priority=2))
+        assert crud.count_by_filters(test_db, priority=2) == 1
+
+        crud.update(test_db, db_obj=created, obj_in=TaskUpdate(priority=1, completed=True))
+        assert crud.count_by_filters(test_db, priority=2) == 0
+        assert [t.id for t in crud.get_by_filters(test_db, completed=True, priority=1)] == [created.id]
+
+        crud.remove(test_db, id=created.id)
+        assert crud.count_by_filters(test_db) == 0
+        assert crud.get_by_filters(test_db) == []
+
+    def test_search_bypasses_read_model(self, test_db):
+        read_model = TaskReadModel()
+        crud = CRUDTask(Task, read_model=read_model)
+        crud.create(test_db, obj_in=TaskCreate(title="Find me", priority=1))
+
+        assert [t.title for t in crud.get_by_filters(test_db, q="find")] == ["Find me"]
+        assert not read_model.loaded
@@ -0,0 +1,48 @@
+import os
+
+from app.config import settings
+from app.server import build_uvicorn_options, available_cpus
+
+
+class TestBuildUvicornOptions:
+    def test_workers_default_to_available_cpus(self, monkeypatch):
+        monkeypatch.setattr(settings, "workers", 0)
+        monkeypatch.setattr(settings, "reload", False)
+
+        options = build_uvicorn_options()
+
+        assert options["workers"] == available_cpus()
+        assert options["reload"] is False
+        assert options["timeout_graceful_shutdown"] == settings.graceful_timeout_seconds
+
+    def test_read_model_is_off_with_multiple_workers(self, monkeypatch):
+        monkeypatch.delenv("READ_MODEL_ENABLED", raising=False)
+        monkeypatch.setattr(settings, "workers", 4)
+        monkeypatch.setattr(settings, "reload", False)
+        monkeypatch.setattr(settings, "read_model_enabled", True)
+
+        build_uvicorn_options()
+
+        assert settings.read_model_enabled is False
+        assert os.environ["READ_MODEL_ENABLED"] == "false"
+
+    def test_reload_forces_single_worker(self, monkeypatch):
+        monkeypatch.setattr(settings, "workers", 8)
+        monkeypatch.setattr(settings, "reload", True)
+
+        assert build_uvicorn_options()["workers"] == 1
+
+    def test_worker_recycling(self, monkeypatch):
+        monkeypatch.setattr(settings, "max_requests", 0)
+        assert "limit_max_requests" not in build_uvicorn_options()
+
+        monkeypatch.setattr(settings, "max_requests", 5000)
+        assert build_uvicorn_options()["limit_max_requests"] == 5000
+
+    def test_explicit_loop_and_parser(self, monkeypatch):
+        monkeypatch.setattr(settings, "loop", "asyncio")
+        monkeypatch.setattr(settings, "http", "h11")
+
+        options = build_uvicorn_options()
+
+        assert (options["loop"], options["http"]) == ("asyncio", "h11")
@@ -0,0 +1,190 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_mock_engine, select, update
+
+from app.crud.sharded import ShardedCRUDTask
+from app.database import Base, make_engine
+from app.models.task import ArchivedTask, Task
+from app.schemas.query import TaskQuery
+from app.schemas.task import TaskCreate, TaskUpdate
+from app.services.rebalance import rebalance
+from app.sharding import ShardRouter, id_for, shard_of
+
+NOW = datetime(2026, 6, 1)
+
+
+def make_router(tmp_path, count: int) -> ShardRouter:
+    router = ShardRouter([make_engine(f"sqlite:///{tmp_path}/shard_{shard}.db") for shard in range(count)])
+    router.create_all(Base.metadata)
+    return router
+
+
+def shard_task_ids(router: ShardRouter) -> list:
+    ids = []
+    for engine in router.engines:
+        with engine.connect() as connection:
+            ids.append(set(connection.execute(select(Task.id)).scalars()))
+    return ids
+
+
+@pytest.fixture
+def sharded(tmp_path):
+    router = make_router(tmp_path, 3)
+    crud = ShardedCRUDTask(Task, router=router)
+    db = router.sessionmaker()
+    for i in range(12):
+        crud.create(db, obj_in=TaskCreate(
+            title=f"Task {i}", priority=(i % 3) + 1, description=f"notes {i}", tags=["odd" if i % 2 else "even"],
+            due_date=NOW + timedelta(days=i % 4) if i % 5 else None,
+        ))
+    yield router, crud, db
+    db.close()
+    router.dispose()
+
+
+def test_ids_encode_their_shard():
+    for shard_count in (1, 3, 8):
+        for shard in range(shard_count):
+            ids = {id_for(shard, seq, shard_count) for seq in range(1, 50)}
+            assert len(ids) == 49
+            assert {shard_of(id, shard_count) for id in ids} == {shard}
+
+
+class TestShardedCRUDTask:
+    def test_creates_spread_over_shards_and_gets_route_by_id(self, sharded):
+        router, crud, db = sharded
+        placement = shard_task_ids(router)
+        assert [len(ids) for ids in placement] == [4, 4, 4]
+        for shard, ids in enumerate(placement):
+            for id in ids:
+                assert router.shard_for_id(id) == str(shard)
+                assert crud.get(db, id).description.startswith("notes")
+
+    def test_update_and_delete_stay_on_the_owning_shard(self, sharded):
+        router, crud, db = sharded
+        id = next(iter(shard_task_ids(router)[1]))
+        task = crud.update(db, db_obj=crud.get(db, id), obj_in=TaskUpdate(description="rewritten", completed=True))
+        assert task.description == "rewritten"
+        db.expunge_all()
+        assert crud.get(db, id).description == "rewritten"
+
+        crud.remove(db, id=id)
+        assert crud.get(db, id) is None
+        assert id not in shard_task_ids(router)[1]
+
+    def test_list_pages_match_a_global_ordering(self, sharded):
+        router, crud, db = sharded
+        everything = crud.get_by_filters(db, limit=100)
+        expected = sorted(everything, key=lambda t: (t.priority, -t.created_at.timestamp(), -t.id))
+        assert [t.id for t in everything] == [t.id for t in expected]
+        assert len(everything) == 12
+
+        pages = [crud.get_by_filters(db, skip=skip, limit=5) for skip in (0, 5, 10)]
+        assert [t.id for page in pages for t in page] == [t.id for t in everything]
+        assert crud.count_by_filters(db) == 12
+        assert crud.count_by_filters(db, priority=1) == 4
+        assert [t.id for t in crud.get_by_filters(db, priority=1, limit=100)] == [
+            t.id for t in everything if t.priority == 1
+        ]
+
+    def test_counts_facets_and_summary_add_up(self, sharded):
+        router, crud, db = sharded
+        counts, total = crud.count_facets(db, facets=["priority", "completed"])
+        assert total == 12
+        assert counts == {"priority": {"1": 4, "2": 4, "3": 4}, "completed": {"true": 0, "false": 12}}
+
+        summary = crud.get_summary(db)
+        assert (summary.total_tasks, summary.pending_tasks, summary.high_priority_tasks) == (12, 12, 4)
+
+    def test_query_merges_any_sort(self, sharded):
+        router, crud, db = sharded
+        items, total = crud.query(db, spec=TaskQuery(sort="-due_date", size=50))
+        assert total == 12
+        dated = [t.due_date for t in items if t.due_date is not None]
+        assert dated == sorted(dated, reverse=True)
+        assert all(t.due_date is None for t in items[len(dated):])
+
+        second, _ = crud.query(db, spec=TaskQuery(sort="-due_date", page=2, size=5))
+        assert [t.id for t in second] == [t.id for t in items[5:10]]
+
+    def test_export_streams_in_list_order(self, sharded):
+        router, crud, db = sharded
+        rows = [row for chunk in crud.iter_rows_by_filters(db, chunk_size=5) for row in chunk]
+        assert [row[0] for row in rows] == [t.id for t in crud.get_by_filters(db, limit=100)]
+        assert rows[0][2].startswith("notes")
+
+    def test_archives_every_shard(self, sharded):
+        router, crud, db = sharded
+        for shard_db in router.sessions():
+            with shard_db:
+                shard_db.execute(update(Task).values(completed=True, updated_at=NOW - timedelta(days=90)))
+                shard_db.commit()
+
+        assert crud.archive_completed(db, completed_before=NOW) == 12
+        assert crud.count_by_filters(db) == 0
+        assert crud.count_by_filters(db, include_archived=True) == 12
+        id = crud.get_by_filters(db, limit=1, include_archived=True)[0].id
+        assert isinstance(crud.get_archived(db, id), ArchivedTask)
+
+    def test_bulk_changes_walk_ids_across_shards(self, sharded):
+        router, crud, db = sharded
+        after_id, seen = 0, []
+        while ids := crud.next_ids_by_filters(db, after_id=after_id, limit=5, tags=["even"]):
+            seen.extend(ids)
+            after_id = ids[-1]
+        assert seen == sorted(seen) and len(seen) == 6
+
+        assert crud.update_many(db, ids=seen[:4], values={"completed": True}) == 4
+        assert crud.count_by_filters(db, completed=True) == 4
+        assert crud.remove_many(db, ids=seen) == 6
+        assert crud.count_by_filters(db) == 6
+        assert crud.get_summary(db).tag_counts == {"odd": 6}
+
+
+def test_tags_live_on_each_task_shard(sharded):
+    router, crud, db = sharded
+    odd = crud.get_by_filters(db, tags=["odd", "missing"], limit=100)
+    assert len(odd) == 6 and all(task.tags == ["odd"] for task in odd)
+    assert crud.count_by_filters(db, tags=["odd", "even"], tag_match="all") == 0
+    assert crud.get_summary(db).tag_counts == {"even": 6, "odd": 6}
+
+    task = odd[0]
+    crud.update(db, db_obj=crud.get(db, task.id), obj_in=TaskUpdate(tags=["odd", "new"]))
+    db.expire_all()
+    assert crud.get(db, task.id).tags == ["new", "odd"]
+    assert [t.id for t in crud.get_by_filters(db, tags=["new"])] == [task.id]
+
+
+def test_rebalance_rejects_targets_without_on_conflict(tmp_path):
+    source = make_engine(f"sqlite:///{tmp_path}/source.db")
+    target = create_mock_engine("mysql://", lambda *args, **kwargs: None)
+    with pytest.raises(ValueError, match="mysql"):
+        rebalance([source], [target])
+    source.dispose()
+
+
+def test_rebalance_keeps_ids_and_continues_sequences(sharded, tmp_path):
+    router, crud, db = sharded
+    before = {t.id: t.title for t in crud.get_by_filters(db, limit=100)}
+    odd = {t.id for t in crud.get_by_filters(db, tags=["odd"], limit=100)}
+    db.close()
+
+    grown = ShardRouter(router.engines + [make_engine(f"sqlite:///{tmp_path}/shard_{shard}.db") for shard in (3, 4)])
+    moved = rebalance(router.engines, grown.engines, batch_size=2)
+    assert moved["tasks"] > 0
+
+    for shard, ids in enumerate(shard_task_ids(grown)):
+        assert all(shard_of(id, 5) == shard for id in ids)
+    grown_crud = ShardedCRUDTask(Task, router=grown)
+    grown_db = grown.sessionmaker()
+    assert {t.id: t.title for t in grown_crud.get_by_filters(grown_db, limit=100)} == before
+    assert all(grown_crud.get(grown_db, id).description.startswith("notes") for id in before)
+    assert {t.id for t in grown_crud.get_by_filters(grown_db, tags=["odd"], limit=100)} == odd
+    assert grown_crud.get_summary(grown_db).tag_counts == {"even": 6, "odd": 6}
+
+    new_ids = {grown_crud.create(grown_db, obj_in=TaskCreate(title=f"New {i}", priority=2)).id for i in range(10)}
+    assert not new_ids & set(before)
+    assert {grown.shard_for_id(id) for id in new_ids} == set(grown.shard_ids)
+    grown_db.close()
+    grown.dispose()
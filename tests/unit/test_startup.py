@@ -0,0 +1,41 @@
+import os
+import subprocess
+import sys
+
+from sqlalchemy import create_engine, text
+
+import app.database as database
+from app.warmup import prewarm_pool, prewarm_serializers
+
+
+class TestSchemaCheck:
+    def test_schema_is_current_tracks_alembic_head(self, tmp_path, monkeypatch):
+        engine = create_engine(f"sqlite:///{tmp_path / 'schema.db'}")
+        monkeypatch.setattr(database, "engine", engine)
+        assert not database.schema_is_current()
+
+        from alembic.config import Config
+        from alembic.script import ScriptDirectory
+        head = ScriptDirectory.from_config(Config(database.ALEMBIC_INI)).get_current_head()
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL)"))
+            connection.execute(text("INSERT INTO alembic_version VALUES (:rev)"), {"rev": head})
+
+        assert database.schema_is_current()
+
+
+class TestColdStart:
+    def test_optional_features_are_not_imported(self):
+        # A fresh interpreter: this one has already imported everything the tests use.
+        env = {k: v for k, v in os.environ.items() if k not in ("WEBHOOK_URLS", "SHARD_COUNT")}
+        optional = ["httpx", "sqlalchemy.ext.horizontal_shard", "sqlalchemy.dialects.postgresql",
+                    "numpy", "msgpack", "pyarrow", "alembic"]
+        script = f"import sys, app.main; print([m for m in {optional!r} if m in sys.modules])"
+        result = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == "[]"
+
+
+class TestWarmup:
+    def test_prewarm_pool_and_serializers(self):
+        assert prewarm_pool(2) >= 1
+        prewarm_serializers()
@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+from sqlalchemy.engine.default import CACHE_HIT
+
+from app.crud.statements import FILTER_SHAPES, task_statements
+from app.crud.task import CRUDTask
+from app.models.task import Task
+
+
+def seed(db, count: int = 12):
+    now = datetime.now()
+    for i in range(count):
+        db.add(Task(
+            title=f"Report {i}" if i % 2 else f"Task {i}",
+            priority=(i % 3) + 1,
+            completed=i % 4 == 0,
+            due_date=now - timedelta(days=1) if i % 5 == 0 else None,
+        ))
+    db.commit()
+
+
+class TestTaskStatements:
+    def test_one_statement_per_filter_shape(self):
+        assert len(task_statements.list) == len(FILTER_SHAPES) == 24
+        first, _ = task_statements.list_tasks(priority=1, skip=0, limit=10)
+        second, params = task_statements.list_tasks(priority=3, skip=20, limit=5)
+        assert first is second
+        assert params == {"priority": 3, "offset": 20, "limit": 5}
+
+    def test_variants_filter_like_python(self, test_db):
+        seed(test_db)
+        crud = CRUDTask(Task)
+        tasks = test_db.query(Task).all()
+        for completed in (None, True):
+            for priority in (None, 2):
+                for q in (None, "report"):
+                    expected = {
+                        t.id for t in tasks
+                        if (completed is None or t.completed == completed)
+                        and (priority is None or t.priority == priority)
+                        and (q is None or q in t.title.lower())
+                    }
+                    found = crud.get_by_filters(test_db, completed=completed, priority=priority, q=q)
+                    assert {t.id for t in found} == expected
+                    assert crud.count_by_filters(test_db, completed=completed, priority=priority, q=q) == len(expected)
+
+    def test_summary_is_two_cached_statements(self, test_db, test_engine):
+        seed(test_db)
+        statements = []
+        cache_hits = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+            cache_hits.append(context.cache_hit)
+
+        event.listen(test_engine, "after_cursor_execute", record)
+        try:
+            summary = CRUDTask(Task).get_summary(test_db)
+            CRUDTask(Task).get_summary(test_db)
+        finally:
+            event.remove(test_engine, "after_cursor_execute", record)
+
+        # Totals over both tiers, then the per-tag counts.
+        assert len(statements) == 4
+        assert cache_hits[-2:] == [CACHE_HIT, CACHE_HIT]
+        assert summary.total_tasks == 12
+        assert summary.completed_tasks == 3
+        assert summary.pending_tasks == 9
+        assert summary.high_priority_tasks == 4
+        assert summary.overdue_tasks == 2
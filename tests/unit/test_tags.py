@@ -0,0 +1,119 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event, select, update
+
+from app.crud.task import CRUDTask
+from app.models.task import Tag, Task, task_tags
+from app.schemas.task import TaskCreate, TaskOut, TaskUpdate
+
+NOW = datetime(2026, 6, 1)
+
+
+def seed(db, crud: CRUDTask) -> dict:
+    """Five tasks tagged by title; returns their ids by title."""
+    tagged = {
+        "Plan": ["Work", " planning "],
+        "Ship": ["work", "release"],
+        "Shop": ["home"],
+        "Fix": ["work", "planning", "release"],
+        "Rest": [],
+    }
+    return {
+        title: crud.create(db, obj_in=TaskCreate(title=title, priority=2, tags=tags)).id
+        for title, tags in tagged.items()
+    }
+
+
+def titles(tasks) -> set:
+    return {task.title for task in tasks}
+
+
+class TestTags:
+    def test_tags_are_normalised_shared_and_sorted(self, test_db):
+        crud = CRUDTask(Task)
+        ids = seed(test_db, crud)
+
+        assert TaskOut.model_validate(crud.get(test_db, ids["Plan"])).tags == ["planning", "work"]
+        assert sorted(test_db.execute(select(Tag.name)).scalars()) == ["home", "planning", "release", "work"]
+
+    def test_update_replaces_tags_and_touches_the_task(self, test_db):
+        crud = CRUDTask(Task)
+        task = crud.create(test_db, obj_in=TaskCreate(title="Plan", priority=1, tags=["a", "b"]))
+        test_db.execute(update(Task).where(Task.id == task.id).values(updated_at=NOW))
+        test_db.commit()
+
+        crud.update(test_db, db_obj=task, obj_in=TaskUpdate(title="Plan v2"))
+        assert task.tags == ["a", "b"]
+        crud.update(test_db, db_obj=task, obj_in=TaskUpdate(tags=["c", "A"]))
+        assert task.tags == ["a", "c"]
+        assert task.updated_at > NOW
+
+        crud.remove(test_db, id=task.id)
+        assert test_db.execute(select(task_tags)).all() == []
+
+    def test_any_and_all_filters(self, test_db):
+        crud = CRUDTask(Task)
+        seed(test_db, crud)
+
+        any_of = crud.get_by_filters(test_db, tags=["release", "home"])
+        assert titles(any_of) == {"Ship", "Shop", "Fix"}
+        all_of = crud.get_by_filters(test_db, tags=["work", "planning"], tag_match="all")
+        assert titles(all_of) == {"Plan", "Fix"}
+        assert crud.count_by_filters(test_db, tags=["work", "planning"], tag_match="all") == 2
+        assert crud.count_by_filters(test_db, tags=["unknown"]) == 0
+        assert titles(crud.get_by_filters(test_db, tags=["work"], q="sh")) == {"Ship"}
+
+        counts, total = crud.count_facets(test_db, facets=["completed"], tags=["work"])
+        assert total == 3 and counts["completed"] == {"true": 0, "false": 3}
+
+    def test_archived_tasks_keep_their_tags(self, test_db):
+        crud = CRUDTask(Task)
+        ids = seed(test_db, crud)
+        test_db.execute(update(Task).where(Task.id == ids["Fix"]).values(completed=True, updated_at=NOW))
+        test_db.commit()
+        crud.archive_completed(test_db, completed_before=datetime(2026, 7, 1))
+
+        assert titles(crud.get_by_filters(test_db, tags=["release"])) == {"Ship"}
+        page = crud.get_by_filters(test_db, tags=["release"], include_archived=True)
+        assert titles(page) == {"Ship", "Fix"}
+        assert crud.count_by_filters(test_db, tags=["release"], include_archived=True) == 2
+        assert TaskOut.model_validate(crud.get_archived(test_db, ids["Fix"])).tags == ["planning", "release", "work"]
+        assert crud.get_summary(test_db).tag_counts == {"home": 1, "planning": 2, "release": 2, "work": 3}
+
+    def test_list_pages_batch_tag_loading(self, test_db, test_engine):
+        crud = CRUDTask(Task)
+        for i in range(20):
+            crud.create(test_db, obj_in=TaskCreate(title=f"Task {i}", priority=2, tags=[f"t{i}", "all"]))
+        test_db.expire_all()
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(test_engine, "after_cursor_execute", record)
+        try:
+            page = crud.get_by_filters(test_db, tags=["all"], limit=20)
+            tags = [TaskOut.model_validate(task).tags for task in page]
+        finally:
+            event.remove(test_engine, "after_cursor_execute", record)
+
+        assert len(tags) == 20 and all(len(task_tags) == 2 for task_tags in tags)
+        # The page, then one batched load each for descriptions and tags.
+        assert len(statements) == 3
+
+    @pytest.mark.parametrize("tags", [[""], ["x" * 51]])
+    def test_rejects_invalid_tags(self, tags):
+        with pytest.raises(ValueError):
+            TaskCreate(title="Bad", priority=1, tags=tags)
+
+
+def test_api_filters_and_summary(client):
+    for title, tags in (("One", ["a"]), ("Two", ["a", "b"]), ("Three", ["b"])):
+        assert client.post("/api/v1/tasks/", json={"title": title, "priority": 2, "tags": tags}).status_code == 201
+
+    data = client.get("/api/v1/tasks/?tags=A,b&tag_match=all").json()
+    assert data["total"] == 1 and data["items"][0]["tags"] == ["a", "b"]
+    assert client.get("/api/v1/tasks/?tags=a,b").json()["total"] == 3
+    assert client.get("/api/v1/tasks/?tags=a&tag_match=some").status_code == 422
+    assert client.get("/api/v1/tasks/summary").json()["tag_counts"] == {"a": 2, "b": 2}
@@ -0,0 +1,85 @@
+import json
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.tracing import (
+    BatchSpanExporter,
+    Tracer,
+    TracingMiddleware,
+    instrument_engine,
+    traced_dependency,
+    traced_route,
+)
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+def make_tracer(tmp_path, sample_rate: float = 1.0) -> Tracer:
+    return Tracer(BatchSpanExporter(str(tmp_path / "traces.jsonl")), sample_rate=sample_rate)
+
+
+def exported_spans(tmp_path) -> list:
+    spans = []
+    with open(tmp_path / "traces.jsonl") as f:
+        for line in f:
+            for resource in json.loads(line)["resourceSpans"]:
+                for scope in resource["scopeSpans"]:
+                    spans.extend(scope["spans"])
+    return spans
+
+
+class TestTracer:
+    def test_traceparent_continues_trace(self, tmp_path):
+        tracer = make_tracer(tmp_path, sample_rate=0.0)
+        span = tracer.start_trace("GET /", f"00-{TRACE_ID}-{PARENT_ID}-01")
+        assert span.trace_id == TRACE_ID
+        assert span.parent_id == PARENT_ID
+
+    def test_sampling_decisions(self, tmp_path):
+        tracer = make_tracer(tmp_path, sample_rate=0.0)
+        assert tracer.start_trace("GET /", f"00-{TRACE_ID}-{PARENT_ID}-00") is None
+        assert tracer.start_trace("GET /", None) is None
+        assert tracer.start_trace("GET /", "garbage") is None
+        assert make_tracer(tmp_path).start_trace("GET /", "garbage").parent_id is None
+
+    def test_no_spans_outside_a_sampled_trace(self, tmp_path):
+        tracer = make_tracer(tmp_path)
+        with tracer.span("orphan") as span:
+            assert span is None
+        assert tracer.exporter.flush() == 0
+
+
+class TestInstrumentation:
+    def test_request_stages_and_sql_are_exported(self, tmp_path):
+        tracer = make_tracer(tmp_path)
+        engine = create_engine("sqlite://")
+        instrument_engine(tracer, engine)
+
+        def get_connection():
+            with engine.connect() as connection:
+                yield connection
+
+        app = FastAPI(dependencies=[Depends(traced_route(tracer))])
+
+        @app.get("/items/{item_id}")
+        def read_item(item_id: int, connection=Depends(get_connection)):
+            return {"value": connection.execute(text("SELECT :v"), {"v": item_id}).scalar()}
+
+        app.dependency_overrides[get_connection] = traced_dependency(tracer, get_connection)
+        app.add_middleware(TracingMiddleware, tracer=tracer)
+
+        with TestClient(app) as client:
+            response = client.get("/items/7", headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"})
+        assert response.json() == {"value": 7}
+        assert tracer.exporter.flush() >= 3
+
+        spans = {span["name"]: span for span in exported_spans(tmp_path)}
+        root = spans["GET /items/{item_id}"]
+        assert root["parentSpanId"] == PARENT_ID
+        assert {"key": "http.status_code", "value": {"intValue": "200"}} in root["attributes"]
+        assert spans["fastapi.route"]["parentSpanId"] == root["spanId"]
+        assert spans["dependency get_connection"]["traceId"] == TRACE_ID
+        assert spans["SELECT"]["traceId"] == TRACE_ID
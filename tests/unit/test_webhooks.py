@@ -0,0 +1,233 @@
+import asyncio
+import json
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from sqlalchemy import event, select, update
+
+from app.crud.outbox import OutboxWriter, utcnow
+from app.crud.task import CRUDTask
+from app.models.outbox import OutboxEvent
+from app.models.task import Task
+from app.schemas.task import TaskCreate, TaskUpdate
+from app.services.webhooks import WebhookDispatcher
+
+
+class Subscriber:
+    """Local webhook receiver recording every delivery; answers with `status`."""
+
+    def __init__(self):
+        self.status = 200
+        self.deliveries = []
+        subscriber = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                subscriber.deliveries.append((self.client_address[1], body["events"]))
+                self.send_response(subscriber.status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/hook"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    @property
+    def events(self):
+        return [event for _, events in self.deliveries for event in events]
+
+
+@pytest.fixture
+def subscriber():
+    stub = Subscriber()
+    yield stub
+    stub.server.shutdown()
+    stub.server.server_close()
+
+
+def make_crud(*urls) -> CRUDTask:
+    crud = CRUDTask(Task)
+    crud.add_transactional_listener(OutboxWriter(list(urls)))
+    return crud
+
+
+def dispatch(dispatcher: WebhookDispatcher, rounds: int = 1) -> list:
+    async def scenario():
+        try:
+            return [await dispatcher.dispatch_once() for _ in range(rounds)]
+        finally:
+            await dispatcher.close()
+
+    return asyncio.run(scenario())
+
+
+def outbox_rows(db):
+    db.expire_all()
+    return list(db.execute(select(OutboxEvent).order_by(OutboxEvent.id)).scalars())
+
+
+def test_changes_are_written_to_the_outbox_in_their_transaction(test_db):
+    crud = make_crud("http://one.example/hook", "http://two.example/hook")
+    task = crud.create(test_db, obj_in=TaskCreate(title="Ship it", priority=1, description="notes"))
+    crud.update(test_db, db_obj=task, obj_in=TaskUpdate(completed=True))
+    crud.remove(test_db, id=task.id)
+
+    rows = outbox_rows(test_db)
+    assert [(row.event, row.subscriber) for row in rows] == [
+        (event, url) for event in ("create", "update", "delete")
+        for url in ("http://one.example/hook", "http://two.example/hook")
+    ]
+    created = json.loads(rows[0].payload)
+    assert created["task"]["description"] == "notes" and created["task"]["id"] == task.id
+    assert rows[0].event_id == rows[1].event_id != rows[2].event_id
+    assert json.loads(rows[2].payload)["task"]["completed"] is True
+    assert json.loads(rows[4].payload)["task"] == {"id": task.id}
+
+
+def test_bulk_updates_stage_events_without_reloading_each_task(test_db, test_engine):
+    crud = make_crud("http://one.example/hook")
+    ids = [crud.create(test_db, obj_in=TaskCreate(title=f"Task {i}", priority=2)).id for i in range(3)]
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(test_engine, "before_cursor_execute", record)
+    try:
+        assert crud.update_many(test_db, ids=ids, values={"completed": True}) == 3
+    finally:
+        event.remove(test_engine, "before_cursor_execute", record)
+    # Tasks, tags and descriptions are loaded once before the commit and once after it, for
+    # the in-process listeners; the UPDATEs return the new timestamps the payloads carry.
+    assert sum(statement.startswith("SELECT") for statement in statements) == 6
+    payloads = [json.loads(row.payload)["task"] for row in outbox_rows(test_db) if row.event == "update"]
+    assert [(task["id"], task["completed"]) for task in payloads] == [(id, True) for id in ids]
+    assert all(task["updated_at"] for task in payloads)
+
+
+def test_rolled_back_changes_leave_no_events(test_db):
+    crud = make_crud("http://one.example/hook")
+
+    def fail(db, event, obj):
+        raise RuntimeError("boom")
+
+    crud.add_transactional_listener(fail)
+    with pytest.raises(RuntimeError):
+        crud.create(test_db, obj_in=TaskCreate(title="Never", priority=2))
+    test_db.rollback()
+
+    assert outbox_rows(test_db) == []
+    assert crud.count_by_filters(test_db) == 0
+
+
+def test_delivers_batches_over_one_connection(test_db, test_engine, subscriber):
+    crud = make_crud(subscriber.url)
+    ids = [crud.create(test_db, obj_in=TaskCreate(title=f"Task {i}", priority=2)).id for i in range(5)]
+    dispatcher = WebhookDispatcher(batch_size=2, concurrency=1, engines=lambda: [test_engine])
+
+    assert dispatch(dispatcher, rounds=4) == [2, 2, 1, 0]
+    assert [len(events) for _, events in subscriber.deliveries] == [2, 2, 1]
+    assert [event["task"]["id"] for event in subscriber.events] == ids
+    assert len({port for port, _ in subscriber.deliveries}) == 1
+    assert outbox_rows(test_db) == []
+
+
+def test_rows_leased_meanwhile_are_not_claimed(test_db, test_engine):
+    crud = make_crud("http://127.0.0.1:9/hook")
+    _, second = (crud.create(test_db, obj_in=TaskCreate(title=f"Task {i}", priority=2)).id for i in range(2))
+    dispatcher = WebhookDispatcher(engines=lambda: [test_engine])
+
+    def lease_first(conn, cursor, statement, parameters, context, executemany):
+        # Another dispatcher leases the first row between this one's select and update.
+        if statement.startswith("UPDATE outbox"):
+            cursor.connection.execute(
+                "UPDATE outbox SET next_attempt_at = '9999-01-01 00:00:00.000000'"
+                " WHERE id = (SELECT min(id) FROM outbox)"
+            )
+
+    event.listen(test_engine, "before_cursor_execute", lease_first)
+    try:
+        rows = dispatcher._run_in_transaction(test_engine, dispatcher._claim)
+    finally:
+        event.remove(test_engine, "before_cursor_execute", lease_first)
+    assert [json.loads(row["payload"])["task"]["id"] for row in rows] == [second]
+
+
+def test_lease_covers_batches_queued_behind_the_concurrency_limit(test_db, test_engine):
+    crud = make_crud(*(f"http://127.0.0.1:9/hook{i}" for i in range(3)))
+    crud.create(test_db, obj_in=TaskCreate(title="Fan out", priority=2))
+    dispatcher = WebhookDispatcher(concurrency=1, timeout=5.0, engines=lambda: [test_engine])
+
+    claimed_at = utcnow()
+    assert len(dispatcher._run_in_transaction(test_engine, dispatcher._claim)) == 3
+    # Three single-event POSTs, one at a time: the last may start two timeouts after the claim.
+    for row in outbox_rows(test_db):
+        assert row.next_attempt_at - claimed_at >= timedelta(seconds=5.0 * 2 * 3)
+
+
+def test_failed_deliveries_back_off_then_dead_letter(test_db, test_engine, subscriber):
+    subscriber.status = 503
+    crud = make_crud(subscriber.url)
+    crud.create(test_db, obj_in=TaskCreate(title="Flaky", priority=2))
+    dispatcher = WebhookDispatcher(max_attempts=2, backoff=60, engines=lambda: [test_engine])
+
+    assert dispatch(dispatcher, rounds=2) == [0, 0]
+    [row] = outbox_rows(test_db)
+    assert (row.attempts, row.dead, row.last_error) == (1, False, "HTTP 503")
+    assert row.next_attempt_at > utcnow() + timedelta(seconds=25)
+    assert len(subscriber.deliveries) == 1
+
+    test_db.execute(update(OutboxEvent).values(next_attempt_at=utcnow()))
+    test_db.commit()
+    dispatch(dispatcher)
+    [row] = outbox_rows(test_db)
+    assert (row.attempts, row.dead) == (2, True)
+    assert dispatcher.stats() == {"pending": 0, "dead_lettered": 1}
+
+    subscriber.status = 204
+    assert dispatcher.redeliver_dead() == 1
+    assert dispatch(dispatcher) == [1]
+    assert dispatcher.stats() == {"pending": 0, "dead_lettered": 0}
+
+
+def test_unreachable_subscriber_is_retried(test_db, test_engine):
+    crud = make_crud("http://127.0.0.1:9/hook")
+    crud.create(test_db, obj_in=TaskCreate(title="Nobody home", priority=2))
+    dispatcher = WebhookDispatcher(timeout=1, engines=lambda: [test_engine])
+
+    assert dispatch(dispatcher) == [0]
+    [row] = outbox_rows(test_db)
+    assert row.attempts == 1 and row.last_error.startswith("ConnectError")
+
+
+def test_sharded_events_live_with_their_task(tmp_path, subscriber):
+    from app.crud.sharded import ShardedCRUDTask
+    from app.database import Base, make_engine
+    from app.sharding import ShardRouter
+
+    router = ShardRouter([make_engine(f"sqlite:///{tmp_path}/shard_{shard}.db") for shard in range(2)])
+    router.create_all(Base.metadata)
+    crud = ShardedCRUDTask(Task, router=router)
+    crud.add_transactional_listener(OutboxWriter([subscriber.url]))
+    with router.sessionmaker() as db:
+        ids = [crud.create(db, obj_in=TaskCreate(title=f"Task {i}", priority=2)).id for i in range(4)]
+        crud.update(db, db_obj=crud.get(db, ids[0]), obj_in=TaskUpdate(title="Renamed"))
+
+    events = ids + ids[:1]
+    for shard_id, engine in zip(router.shard_ids, router.engines):
+        with engine.connect() as connection:
+            assert sorted(connection.execute(select(OutboxEvent.task_id)).scalars()) == sorted(
+                id for id in events if router.shard_for_id(id) == shard_id
+            )
+
+    assert dispatch(WebhookDispatcher(engines=lambda: router.engines)) == [5]
+    assert sorted(event["task"]["id"] for event in subscriber.events) == sorted(events)
+    router.dispose()